@@ -1,10 +1,13 @@
 #!/usr/bin/env python
 from pathlib import Path
 from lawcite.cli.main import process_law_pdf
+from lawcite.core.log import configure_logging
 
 
 def main():
     """Process common Danish laws and save as Markdown files in the examples directory."""
+    configure_logging()
+
     # Get the directory of this script (examples/)
     examples_dir = Path(__file__).parent
 
@@ -1 +1,22 @@
+import importlib
+import logging
+
 __version__ = "0.1.3"
+
+# Public API, imported on first use so that importing a submodule stays cheap
+_EXPORTS = {
+    "Document": "lawcite.core.document",
+    "aconvert": "lawcite.api",
+    "convert": "lawcite.api",
+    "render": "lawcite.api",
+}
+
+__all__ = list(_EXPORTS)
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
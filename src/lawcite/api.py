@@ -0,0 +1,160 @@
+import asyncio
+import json
+from typing import Callable, Dict, Optional, Union
+import bibtexparser as bp
+import yaml
+from pypdf import PdfReader
+from .core.classify import classify_document
+from .core.document import Document
+from .core.extract_metadata import extract_metadata
+from .core.extract_text import CachedTextReader, with_extractor
+from .core.keys import build_key_table, make_law_id
+from .core.fetch_pdf import fetch_pdf_bytes, read_pdf_bytes
+from .core.furniture import strip_page_furniture
+from .core.parse_general import parse_general_paragraphs
+from .core.parse_law import parse_law_paragraphs
+from .core.references import build_reference_graph, graph_to_dot, graph_to_json, invert_graph
+from .core.save_bibtex import create_bibtex, create_hayagriva
+from .core.save_jsonl import iter_jsonl_records
+from .core.save_md import render_markdown
+
+PARSERS: Dict[str, Callable[[PdfReader], Dict]] = {
+    "law": parse_law_paragraphs,
+    "other": parse_general_paragraphs,
+}
+
+KINDS = (*PARSERS, "auto")
+
+FORMATS = ("bib", "biblatex", "yaml", "md", "jsonl", "graph", "dot")
+
+
+def convert_reader(pdf: PdfReader, url: str = "", kind: str = "law") -> Document:
+    """Convert a loaded PDF into a Document.
+
+    Args:
+        pdf: PdfReader object containing the PDF content.
+        url: URL of the document, used as fallback metadata.
+        kind: Document kind, "law", "other", or "auto" to classify the
+            document from its first pages.
+
+    Returns:
+        The converted Document.
+
+    Raises:
+        ValueError: If the kind is unknown or no paragraphs were extracted.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown document kind: {kind}")
+    pdf = CachedTextReader(pdf)
+    if kind == "auto":
+        kind = classify_document(pdf)
+    document_url, document_date, document_author, document_title = extract_metadata(
+        pdf, url
+    )
+    sections = PARSERS[kind](strip_page_furniture(pdf, cache=False))
+    if not sections:
+        raise ValueError("No paragraphs extracted from the PDF")
+    references = build_reference_graph(sections) if kind == "law" else {}
+    keys = build_key_table(sections, make_law_id(document_title))
+    return Document(
+        kind=kind,
+        url=document_url,
+        date=document_date,
+        author=document_author,
+        title=document_title,
+        sections=sections,
+        references=references,
+        cited_by=invert_graph(references),
+        keys=keys,
+    )
+
+
+def convert(
+    source: Union[bytes, str],
+    kind: str = "law",
+    url: Optional[str] = None,
+    extractor: str = "pypdf",
+) -> Document:
+    """Convert a PDF, given as raw bytes or a URL, into a Document.
+
+    Nothing is written to disk or stdout and each call uses its own reader,
+    so conversions can run concurrently on a thread pool.
+
+    Args:
+        source: Raw PDF content, or the URL to fetch it from.
+        kind: Document kind, "law", "other", or "auto".
+        url: URL recorded in the Document (defaults to source if it is a URL).
+        extractor: Text extractor, "pypdf" or "fast".
+
+    Returns:
+        The converted Document.
+
+    Raises:
+        requests.RequestException: If fetching the URL fails.
+        ValueError: If the kind or extractor is unknown, the URL does not
+            return a PDF or no paragraphs were extracted.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown document kind: {kind}")
+    if isinstance(source, str):
+        url = url or source
+        source = fetch_pdf_bytes(source)
+    url = url or ""
+    pdf = with_extractor(read_pdf_bytes(source, url), extractor)
+    return convert_reader(pdf, url, kind)
+
+
+async def aconvert(
+    source: Union[bytes, str],
+    kind: str = "law",
+    url: Optional[str] = None,
+    extractor: str = "pypdf",
+) -> Document:
+    """Run convert in a worker thread, for use from asyncio code."""
+    return await asyncio.to_thread(convert, source, kind, url, extractor)
+
+
+def render(document: Document, format: str = "bib") -> bytes:
+    """Render a Document in an output format.
+
+    Args:
+        document: The Document to render.
+        format: "bib" (BibTeX), "biblatex" (compact BibLaTeX using
+            crossref), "yaml" (Hayagriva), "md" (Markdown),
+            "jsonl" (JSON Lines), or "graph" (JSON) or "dot" (Graphviz) for
+            the cross-reference graph.
+
+    Returns:
+        The rendered document, UTF-8 encoded.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    metadata = (document.title, document.author, document.url, document.date)
+    keys = document.keys or build_key_table(document.sections, document.law_id)
+    if format == "bib":
+        text = bp.dumps(create_bibtex(document.sections, *metadata, keys))
+    elif format == "biblatex":
+        text = bp.dumps(create_bibtex(document.sections, *metadata, keys, crossref=True))
+    elif format == "yaml":
+        text = yaml.dump(
+            create_hayagriva(document.sections, *metadata, keys),
+            default_flow_style=False,
+            allow_unicode=True,
+        )
+    elif format == "md":
+        text = render_markdown(document.sections, document.title)
+    elif format == "jsonl":
+        records = iter_jsonl_records(
+            document.sections.items(), *metadata, document.law_id, keys
+        )
+        text = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+    elif format == "graph":
+        text = graph_to_json(document.references, document.law_id, keys)
+    elif format == "dot":
+        text = graph_to_dot(document.references, document.law_id, keys)
+    else:
+        raise ValueError(
+            f"Unknown format: {format!r} (expected one of {', '.join(FORMATS)})"
+        )
+    return text.encode("utf-8")
@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+import os
+import sys
+from ..core.daemon import forward
+
+
+def main() -> None:
+    """Entry point of the lawcite command.
+
+    Forwards the job to a running lawcite daemon, which has all modules
+    already imported, and falls back to running it in this process when no
+    daemon is running (or LAWCITE_NO_DAEMON is set).
+    """
+    argv = sys.argv[1:]
+    if argv[:1] != ["daemon"] and not os.environ.get("LAWCITE_NO_DAEMON"):
+        try:
+            status = forward(argv)
+        except ConnectionError as e:
+            print(f"lawcite daemon failed: {e}", file=sys.stderr)
+            sys.exit(1)
+        if status is not None:
+            sys.exit(status)
+
+    from .main import main as run_main
+
+    run_main()
+
+
+if __name__ == "__main__":
+    main()
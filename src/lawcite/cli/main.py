@@ -1,34 +1,196 @@
 #!/usr/bin/env python
-from typing import Callable, Dict, Any
-from ..core.fetch_pdf import fetch_pdf_content
+import logging
+import os
+import sys
+from functools import partial
+from pypdf import PdfReader
+from typing import Callable, Dict, Any, List
+from ..core.fetch_pdf import fetch_pdf_content, read_pdf_bytes
+from ..core.extract_text import CachedTextReader, with_extractor
+from ..core.classify import classify_document
+from ..core.furniture import strip_page_furniture
 from ..core.extract_metadata import extract_metadata
 from ..core.save_bibtex import save_bibtex
-from ..core.parse_law import parse_law_paragraphs
-from ..core.parse_general import parse_general_paragraphs
+from ..core.parse_law import parse_law_paragraphs, iter_law_paragraphs
+from ..core.parse_general import parse_general_paragraphs, iter_general_paragraphs
+from ..core.save_jsonl import is_jsonl, save_jsonl
+from ..core.keys import build_key_table, make_law_id
+from ..core.references import build_reference_graph, save_graph
+from ..core.select_law import parse_law_selection, parse_chapters, parse_paragraph_range
+from ..core.watch import watch
+from ..core.probe import probe_metadata
+from ..core.bundle import BundleReader, create_bundle
+from ..core.subset import find_cited_keys, subset_bibliography
+from ..core.daemon import create_server, socket_path
+from ..core.metrics import DOCUMENTS, SECTIONS, timed, write_metrics, serve_metrics
+from ..core.log import configure_logging
+from ..api import KINDS, PARSERS
 from treeparse import cli, command, argument, option
 
+logger = logging.getLogger(__name__)
+
+# Parsers that can yield sections incrementally for streaming writers
+STREAMING_PARSERS = {
+    parse_law_paragraphs: iter_law_paragraphs,
+    parse_general_paragraphs: iter_general_paragraphs,
+}
+
 
 def process_pdf(
     input_url: str,
     debug: bool = False,
     output_filename: str = "__temp.bib",
     parser_func: Callable[[Any], Dict] = None,
+    merge_into: str = None,
+    chunk_size: int = None,
+    chunk_unit: str = "chars",
+    graph_file: str = None,
+    shard: str = None,
+    crossref: bool = False,
+    extractor: str = "pypdf",
+    partial: bool = False,
 ) -> None:
     """Shared PDF processing logic."""
-    pdf = fetch_pdf_content(input_url, debug)
+    pdf = with_extractor(fetch_pdf_content(input_url, debug), extractor)
+    process_reader(
+        pdf,
+        input_url,
+        output_filename,
+        parser_func,
+        merge_into,
+        chunk_size,
+        chunk_unit,
+        graph_file,
+        shard,
+        crossref,
+        partial,
+    )
+
+
+def process_reader(
+    pdf: PdfReader,
+    input_url: str,
+    output_filename: str = "__temp.bib",
+    parser_func: Callable[[Any], Dict] = None,
+    merge_into: str = None,
+    chunk_size: int = None,
+    chunk_unit: str = "chars",
+    graph_file: str = None,
+    shard: str = None,
+    crossref: bool = False,
+    partial: bool = False,
+) -> None:
+    """Convert an already loaded PDF and save it in the requested format.
+
+    If parser_func is None, the document is classified as a law or another
+    document from its first pages and parsed accordingly. Headers and
+    footers repeated across pages are removed before parsing.
+    If graph_file is given, the cross-reference graph between the sections
+    is also written to it, as DOT for .dot/.gv files and JSON otherwise.
+    Set partial if parser_func only parses a selection of the document, so
+    merging keeps the document's other entries.
+    """
+    try:
+        count = _convert_reader(
+            pdf,
+            input_url,
+            output_filename,
+            parser_func,
+            merge_into,
+            chunk_size,
+            chunk_unit,
+            graph_file,
+            shard,
+            crossref,
+            partial,
+        )
+    except Exception:
+        DOCUMENTS.inc(status="error")
+        raise
+    DOCUMENTS.inc(status="ok")
+    SECTIONS.inc(count)
+
+
+def _convert_reader(
+    pdf: PdfReader,
+    input_url: str,
+    output_filename: str,
+    parser_func: Callable[[Any], Dict],
+    merge_into: str,
+    chunk_size: int,
+    chunk_unit: str,
+    graph_file: str = None,
+    shard: str = None,
+    crossref: bool = False,
+    partial: bool = False,
+) -> int:
+    pdf = CachedTextReader(pdf)
     document_url, document_date, document_author, document_title = extract_metadata(
         pdf, input_url
     )
-    paragraph_content = parser_func(pdf)
+    if parser_func is None:
+        parser_func = PARSERS[classify_document(pdf)]
+    pdf = strip_page_furniture(pdf)
+    if is_jsonl(output_filename) and not (merge_into or graph_file or shard):
+        # Stream sections straight to the JSON Lines writer
+        stream_func = STREAMING_PARSERS.get(parser_func)
+        with timed("parse_write"):
+            sections = stream_func(pdf) if stream_func else parser_func(pdf).items()
+            count = save_jsonl(
+                sections,
+                document_title,
+                document_author,
+                document_url,
+                document_date,
+                make_law_id(document_title),
+                output_filename,
+            )
+        if not count:
+            os.remove(output_filename)
+            raise ValueError("No paragraphs extracted from the PDF")
+        return count
+    with timed("parse"):
+        paragraph_content = parser_func(pdf)
+        law_id = make_law_id(document_title)
+        keys = build_key_table(paragraph_content, law_id)
     if not paragraph_content:
         raise ValueError("No paragraphs extracted from the PDF")
-    save_bibtex(
-        paragraph_content,
-        document_title,
-        document_author,
-        document_url,
-        document_date,
-        output_filename,
+    with timed("write"):
+        save_bibtex(
+            paragraph_content,
+            document_title,
+            document_author,
+            document_url,
+            document_date,
+            output_filename,
+            merge_into,
+            chunk_size,
+            chunk_unit,
+            shard,
+            keys,
+            crossref,
+            partial,
+        )
+    if graph_file:
+        with timed("references"):
+            graph = build_reference_graph(paragraph_content)
+            save_graph(graph, law_id, keys, graph_file)
+        logger.info(
+            "Written %d cross-references to %s",
+            sum(len(targets) for targets in graph.values()),
+            graph_file,
+        )
+    return len(paragraph_content)
+
+
+def selection_parser(
+    chapters: str = None, paragraphs: str = None
+) -> Callable[[Any], Dict]:
+    """Return a law parser restricted to the given chapters and/or § range."""
+    return partial(
+        parse_law_selection,
+        chapters=parse_chapters(chapters) if chapters else None,
+        paragraphs=parse_paragraph_range(paragraphs) if paragraphs else None,
     )
 
 
@@ -36,35 +198,107 @@ def process_law_pdf(
     input_url: str,
     debug: bool = False,
     output_filename: str = "__temp.bib",
+    chapters: str = None,
+    paragraphs: str = None,
+    merge_into: str = None,
+    chunk_size: int = None,
+    chunk_unit: str = "chars",
+    graph_file: str = None,
+    shard: str = None,
+    crossref: bool = False,
+    extractor: str = "pypdf",
 ) -> None:
-    """Process a legal PDF and save as BibTeX or YAML."""
-    process_pdf(input_url, debug, output_filename, parse_law_paragraphs)
+    """Process a legal PDF and save as BibTeX or YAML.
+
+    If chapters or paragraphs is given, only the pages covering that
+    selection are extracted and parsed, and merging only replaces the
+    selected entries.
+    """
+    parser_func = parse_law_paragraphs
+    if chapters or paragraphs:
+        parser_func = selection_parser(chapters, paragraphs)
+    process_pdf(
+        input_url,
+        debug,
+        output_filename,
+        parser_func,
+        merge_into,
+        chunk_size,
+        chunk_unit,
+        graph_file,
+        shard,
+        crossref,
+        extractor,
+        partial=bool(chapters or paragraphs),
+    )
 
 
 def process_general_pdf(
     input_url: str,
     debug: bool = False,
     output_filename: str = "__temp.bib",
+    merge_into: str = None,
+    chunk_size: int = None,
+    chunk_unit: str = "chars",
+    shard: str = None,
+    crossref: bool = False,
+    extractor: str = "pypdf",
 ) -> None:
     """Process a general PDF and save as BibTeX or YAML."""
-    process_pdf(input_url, debug, output_filename, parse_general_paragraphs)
+    process_pdf(
+        input_url,
+        debug,
+        output_filename,
+        parse_general_paragraphs,
+        merge_into,
+        chunk_size,
+        chunk_unit,
+        shard=shard,
+        crossref=crossref,
+        extractor=extractor,
+    )
+
+
+def process_auto_pdf(
+    input_url: str,
+    debug: bool = False,
+    output_filename: str = "__temp.bib",
+    merge_into: str = None,
+    chunk_size: int = None,
+    chunk_unit: str = "chars",
+    graph_file: str = None,
+    shard: str = None,
+    crossref: bool = False,
+    extractor: str = "pypdf",
+) -> None:
+    """Process a PDF as a law or a general document, detected from its first pages."""
+    process_pdf(
+        input_url,
+        debug,
+        output_filename,
+        None,
+        merge_into,
+        chunk_size,
+        chunk_unit,
+        graph_file,
+        shard,
+        crossref,
+        extractor,
+    )
 
 
 def create_command(
     name: str,
     help_text: str,
-    parser_func: Callable[[Any], Dict],
+    callback: Callable[..., None],
     file_example: str,
+    extra_options: List[option] = None,
 ) -> command:
-    """Create a command with shared input structure."""
-
-    def callback(
-        input_url: str,
-        debug: bool = False,
-        output_filename: str = "__temp.bib",
-    ):
-        process_pdf(input_url, debug, output_filename, parser_func)
+    """Create a command with shared input structure.
 
+    The callback takes the shared options plus the dest of every option in
+    extra_options, as treeparse binds options to callback parameters by name.
+    """
     return command(
         name=name,
         help=help_text,
@@ -87,13 +321,57 @@ def create_command(
                 arg_type=str,
                 sort_key=1,
             ),
-        ],
+            option(
+                flags=["-m", "--merge-into"],
+                dest="merge_into",
+                help="Replace or append this document's entries in a shared BibTeX file",
+                arg_type=str,
+                sort_key=2,
+            ),
+            option(
+                flags=["--chunk-size"],
+                dest="chunk_size",
+                help="Split Markdown output into chunks of at most this size",
+                arg_type=int,
+                sort_key=3,
+            ),
+            option(
+                flags=["--chunk-unit"],
+                dest="chunk_unit",
+                help="Unit of --chunk-size: chars or tokens (approx. 4 chars each)",
+                arg_type=str,
+                sort_key=4,
+            ),
+            option(
+                flags=["--shard"],
+                dest="shard",
+                help="Split BibTeX or YAML output per chapter or every N entries (chapter or size=N)",
+                arg_type=str,
+                sort_key=5,
+            ),
+            option(
+                flags=["--crossref"],
+                dest="crossref",
+                is_flag=True,
+                arg_type=bool,
+                help="Write compact BibLaTeX entries that crossref one parent entry per document",
+                sort_key=6,
+            ),
+            option(
+                flags=["--extractor"],
+                dest="extractor",
+                help="Text extractor: pypdf or fast (content-stream extractor with a shared font cache)",
+                arg_type=str,
+                sort_key=7,
+            ),
+        ]
+        + (extra_options or []),
     )
 
 
 app = cli(
     name="lawcite",
-    help="Tools for converting documents to BibTeX, YAML, or Markdown",
+    help="Tools for converting documents to BibTeX, YAML, Markdown, or JSON Lines",
     max_width=120,
     show_types=True,
     show_defaults=True,
@@ -103,23 +381,322 @@ app = cli(
 
 law_cmd = create_command(
     "law",
-    "Convert legal PDF documents from a URL to BibTeX, YAML, or Markdown format",
-    parse_law_paragraphs,
-    "e.g., konkurrenceloven.bib, konkurrenceloven.yaml, or konkurrenceloven.md",
+    "Convert legal PDF documents from a URL to BibTeX, YAML, Markdown, or JSON Lines format",
+    process_law_pdf,
+    "e.g., konkurrenceloven.bib, konkurrenceloven.yaml, konkurrenceloven.md, or konkurrenceloven.jsonl",
+    extra_options=[
+        option(
+            flags=["--chapters"],
+            dest="chapters",
+            help="Only extract the given chapters (e.g., 27, 3,5 or 3-5)",
+            arg_type=str,
+            sort_key=8,
+        ),
+        option(
+            flags=["--paragraphs"],
+            dest="paragraphs",
+            help="Only extract the given § range (e.g., 245-250)",
+            arg_type=str,
+            sort_key=9,
+        ),
+        option(
+            flags=["--graph"],
+            dest="graph_file",
+            help="Also write the cross-references between sections (.json or .dot)",
+            arg_type=str,
+            sort_key=10,
+        ),
+    ],
 )
 app.commands.append(law_cmd)
 
 other_cmd = create_command(
     "other",
-    "Convert general PDF documents from a URL to BibTeX, YAML, or Markdown format",
-    parse_general_paragraphs,
-    "e.g., document.bib, document.yaml, or document.md",
+    "Convert general PDF documents from a URL to BibTeX, YAML, Markdown, or JSON Lines format",
+    process_general_pdf,
+    "e.g., document.bib, document.yaml, document.md, or document.jsonl",
 )
 app.commands.append(other_cmd)
 
+auto_cmd = create_command(
+    "auto",
+    "Convert a PDF as a law or a general document, detected from its first pages",
+    process_auto_pdf,
+    "e.g., document.bib, document.yaml, document.md, or document.jsonl",
+    extra_options=[
+        option(
+            flags=["--graph"],
+            dest="graph_file",
+            help="Also write the cross-references between sections (.json or .dot)",
+            arg_type=str,
+            sort_key=8,
+        ),
+    ],
+)
+app.commands.append(auto_cmd)
+
+
+def regenerate(entry: Dict[str, str], content: bytes) -> None:
+    """Regenerate the output of a watched document from new PDF content."""
+    if entry["kind"] not in KINDS:
+        raise ValueError(f"Unknown document kind: {entry['kind']}")
+    logger.info(
+        "Regenerating %s from %s", entry["name"], entry["url"], extra={"url": entry["url"]}
+    )
+    pdf = read_pdf_bytes(content, entry["url"])
+    process_reader(pdf, entry["url"], entry["file"], PARSERS.get(entry["kind"]))
+
+
+def watch_callback(
+    manifest: str,
+    interval: float = 3600,
+    status_file: str = "lawcite-status.json",
+    once: bool = False,
+    metrics_port: int = None,
+):
+    if metrics_port:
+        serve_metrics(metrics_port)
+        logger.info("Serving metrics on http://127.0.0.1:%d/metrics", metrics_port)
+    watch(
+        manifest,
+        status_file,
+        regenerate,
+        interval=interval,
+        iterations=1 if once else None,
+        on_poll=dump_metrics,
+    )
+
+
+watch_cmd = command(
+    name="watch",
+    help="Poll the URLs in a manifest and regenerate documents whose content changed",
+    callback=watch_callback,
+    arguments=[
+        argument(name="manifest", arg_type=str, sort_key=0),
+    ],
+    options=[
+        option(
+            flags=["-i", "--interval"],
+            dest="interval",
+            help="Seconds between polls (default: 3600)",
+            arg_type=float,
+            sort_key=0,
+        ),
+        option(
+            flags=["-s", "--status"],
+            dest="status_file",
+            help="JSON file recording last-checked and last-changed times",
+            arg_type=str,
+            sort_key=1,
+        ),
+        option(
+            flags=["--once"],
+            dest="once",
+            is_flag=True,
+            arg_type=bool,
+            help="Poll once and exit",
+            sort_key=2,
+        ),
+        option(
+            flags=["--metrics-port"],
+            dest="metrics_port",
+            help="Serve Prometheus metrics on this local port",
+            arg_type=int,
+            sort_key=3,
+        ),
+    ],
+)
+app.commands.append(watch_cmd)
+
+
+def info_callback(input_url: str):
+    document_url, document_date, document_author, document_title = probe_metadata(
+        input_url
+    )
+    print(f"Title: {document_title}")
+    print(f"Author: {document_author}")
+    print(f"Date: {document_date}")
+    print(f"URL: {document_url}")
+
+
+info_cmd = command(
+    name="info",
+    help="Show the metadata of a PDF, fetching only the needed parts with range requests",
+    callback=info_callback,
+    arguments=[
+        argument(name="input_url", arg_type=str, sort_key=0),
+    ],
+)
+app.commands.append(info_cmd)
+
+
+def bundle_callback(input_dir: str, output: str):
+    index = create_bundle(input_dir, output)
+    logger.info(
+        "Bundled %d files with %d entries into %s",
+        len(index["members"]),
+        len(index["entries"]),
+        output,
+    )
+
+
+bundle_cmd = command(
+    name="bundle",
+    help="Pack all converted documents in a directory into one indexed ZIP archive",
+    callback=bundle_callback,
+    arguments=[
+        argument(name="input_dir", arg_type=str, sort_key=0),
+        argument(name="output", arg_type=str, sort_key=1),
+    ],
+)
+app.commands.append(bundle_cmd)
+
+
+def extract_callback(bundle: str, key: str, fmt: str = "bib", law: bool = False):
+    with BundleReader(bundle) as reader:
+        # An entry wins over a law with the same ID, such as the --crossref
+        # parent entry, unless --law is given
+        if not law and key in reader.index["entries"]:
+            text = reader.read_entry(key, fmt)
+        elif key in reader.index["laws"]:
+            text = reader.read_law(key, fmt)
+        else:
+            text = reader.read_entry(key, fmt)
+    print(text, end="")
+
+
+extract_cmd = command(
+    name="extract",
+    help="Print one entry, or all entries of a law, from a bundle",
+    callback=extract_callback,
+    arguments=[
+        argument(name="bundle", arg_type=str, sort_key=0),
+        argument(name="key", arg_type=str, sort_key=1),
+    ],
+    options=[
+        option(
+            flags=["--format"],
+            dest="fmt",
+            help="Format to read: bib, yaml, md or jsonl (default: bib)",
+            arg_type=str,
+            sort_key=0,
+        ),
+        option(
+            flags=["--law"],
+            dest="law",
+            is_flag=True,
+            arg_type=bool,
+            help="Print the whole law even if an entry has the same key",
+            sort_key=1,
+        ),
+    ],
+)
+app.commands.append(extract_cmd)
+
+
+def subset_callback(
+    document: str, bib: str = ".", output_filename: str = "lawcite-subset.bib"
+):
+    keys = find_cited_keys([document])
+    written, missing = subset_bibliography(keys, bib.split(","), output_filename)
+    logger.info("Written %d cited entries to %s", len(written), output_filename)
+    if missing:
+        logger.warning(
+            "%d cited keys not found: %s",
+            len(missing),
+            ", ".join(missing),
+            extra={"missing": missing},
+        )
+
+
+subset_cmd = command(
+    name="subset",
+    help="Write a bibliography with only the entries cited in .aux, .bcf, .tex or .typ files",
+    callback=subset_callback,
+    arguments=[
+        argument(name="document", arg_type=str, sort_key=0),
+    ],
+    options=[
+        option(
+            flags=["-b", "--bib"],
+            dest="bib",
+            help="Comma-separated BibTeX files or directories to take entries from (default: .)",
+            arg_type=str,
+            sort_key=0,
+        ),
+        option(
+            flags=["-f", "--file"],
+            dest="output_filename",
+            help="Output BibTeX file (default: lawcite-subset.bib)",
+            arg_type=str,
+            sort_key=1,
+        ),
+    ],
+)
+app.commands.append(subset_cmd)
+
+
+def dump_metrics() -> None:
+    """Write metrics to $LAWCITE_METRICS_FILE, if set."""
+    if os.environ.get("LAWCITE_METRICS_FILE"):
+        write_metrics(os.environ["LAWCITE_METRICS_FILE"])
+
+
+def daemon_callback(socket_file: str = None):
+    path = socket_file or socket_path()
+    server = create_server(path, run_cli)
+    logger.info("lawcite daemon listening on %s", path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(path)
+
+
+daemon_cmd = command(
+    name="daemon",
+    help="Keep a warm lawcite process that runs the jobs of other lawcite invocations",
+    callback=daemon_callback,
+    options=[
+        option(
+            flags=["--socket"],
+            dest="socket_file",
+            help="Unix socket to listen on (default: $LAWCITE_SOCKET, $XDG_RUNTIME_DIR/lawcite-<uid>.sock or /tmp/lawcite-<uid>/daemon.sock)",
+            arg_type=str,
+            sort_key=0,
+        ),
+    ],
+)
+app.commands.append(daemon_cmd)
+
+
+def run_cli(argv: List[str]) -> int:
+    """Run the CLI with the given arguments and return its exit status."""
+    sys.argv = ["lawcite"] + list(argv)
+    try:
+        main()
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except Exception:
+        logger.exception("lawcite %s failed", " ".join(argv))
+        return 1
+    return 0
+
 
 def main() -> None:
-    app.run()
+    configure_logging(
+        os.environ.get("LAWCITE_LOG_LEVEL", "INFO"),
+        os.environ.get("LAWCITE_LOG_FORMAT", "text"),
+    )
+    try:
+        app.run()
+    finally:
+        dump_metrics()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,214 @@
+import json
+import os
+import re
+import tempfile
+import zipfile
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+from .merge_bibtex import scan_bibtex_entries
+
+BUNDLE_VERSION = 1
+INDEX_MEMBER = "index.json"
+# Decompressed members kept by a BundleReader
+CACHED_MEMBERS = 8
+BUNDLE_FORMATS = {
+    ".bib": "bib",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".md": "md",
+    ".jsonl": "jsonl",
+}
+YAML_KEY_PATTERN = re.compile(rb"^([A-Za-z0-9_\-]+):", re.MULTILINE)
+
+
+def bundle_format(filename: str) -> str:
+    """Return the format of a file by extension, or "" if it is not bundled."""
+    return BUNDLE_FORMATS.get(os.path.splitext(filename)[1].lower(), "")
+
+
+def scan_entries(data: bytes, fmt: str) -> Dict[str, Tuple[int, int]]:
+    """Find the byte span of each entry in BibTeX, YAML or JSON Lines data.
+
+    Markdown has no entries and is only indexed per law.
+
+    Returns:
+        Dictionary mapping entry keys to (start, end) byte offsets.
+    """
+    if fmt == "bib":
+        return scan_bibtex_entries(data)
+    entries: Dict[str, Tuple[int, int]] = {}
+    if fmt == "yaml":
+        starts = [
+            (match.group(1).decode("utf-8"), match.start())
+            for match in YAML_KEY_PATTERN.finditer(data)
+        ]
+        for i, (key, start) in enumerate(starts):
+            end = starts[i + 1][1] if i + 1 < len(starts) else len(data)
+            entries[key] = (start, end)
+    elif fmt == "jsonl":
+        offset = 0
+        for line in data.splitlines(keepends=True):
+            if line.strip():
+                entries[json.loads(line)["key"]] = (offset, offset + len(line))
+            offset += len(line)
+    return entries
+
+
+def create_bundle(input_dir: str, output_path: str) -> Dict[str, Any]:
+    """Pack all converted documents under a directory into one archive.
+
+    Every BibTeX, YAML, Markdown and JSON Lines file becomes a separately
+    deflated member of a ZIP archive, so reading one member never
+    decompresses the others. The "index.json" member maps each entry key
+    to its (member, start, end) byte spans in the uncompressed members and
+    each law ID (the file name up to the first dot) to its members.
+
+    Args:
+        input_dir: Directory with converted documents, searched recursively.
+        output_path: Path of the ZIP archive to write.
+
+    Returns:
+        The bundle index.
+    """
+    index: Dict[str, Any] = {
+        "version": BUNDLE_VERSION,
+        "members": {},
+        "laws": {},
+        "entries": {},
+    }
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(output_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=output_dir, suffix=".tmp")
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(
+            temp_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9
+        ) as zf:
+            for root, dirs, files in os.walk(input_dir):
+                dirs.sort()
+                for filename in sorted(files):
+                    fmt = bundle_format(filename)
+                    if not fmt:
+                        continue
+                    path = os.path.join(root, filename)
+                    member = os.path.relpath(path, input_dir).replace(os.sep, "/")
+                    law_id = filename.split(".", 1)[0]
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    zf.writestr(member, data)
+                    index["members"][member] = {"law_id": law_id, "format": fmt}
+                    index["laws"].setdefault(law_id, []).append(member)
+                    for key, (start, end) in scan_entries(data, fmt).items():
+                        index["entries"].setdefault(key, []).append([member, start, end])
+            zf.writestr(INDEX_MEMBER, json.dumps(index, ensure_ascii=False))
+        os.replace(temp_path, output_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return index
+
+
+def load_bundle_index(zf: zipfile.ZipFile) -> Dict[str, Any]:
+    """Load the index of an open bundle.
+
+    Raises:
+        ValueError: If the archive has no index of a supported version.
+    """
+    try:
+        index = json.loads(zf.read(INDEX_MEMBER))
+    except KeyError as e:
+        raise ValueError("Archive is not a lawcite bundle") from e
+    if index.get("version") != BUNDLE_VERSION:
+        raise ValueError(f"Unsupported bundle version: {index.get('version')}")
+    return index
+
+
+def read_entry(
+    zf: zipfile.ZipFile, index: Dict[str, Any], key: str, fmt: str = "bib"
+) -> str:
+    """Read a single entry from a bundle.
+
+    Only the member holding the entry is decompressed, and only up to the
+    end of the entry. For several lookups in the same bundle, use
+    BundleReader, which keeps the index and decompressed members.
+
+    Raises:
+        KeyError: If the bundle has no entry with this key in this format.
+    """
+    for member, start, end in index["entries"].get(key, []):
+        if index["members"][member]["format"] == fmt:
+            with zf.open(member) as f:
+                return f.read(end)[start:].decode("utf-8")
+    raise KeyError(f"No {fmt} entry {key!r} in bundle")
+
+
+def read_law(
+    zf: zipfile.ZipFile, index: Dict[str, Any], law_id: str, fmt: str = "bib"
+) -> str:
+    """Read all members of one law in one format from a bundle.
+
+    Raises:
+        KeyError: If the bundle has no such law in this format.
+    """
+    members: List[str] = [
+        member
+        for member in index["laws"].get(law_id, [])
+        if index["members"][member]["format"] == fmt
+    ]
+    if not members:
+        raise KeyError(f"No {fmt} output for {law_id!r} in bundle")
+    return "".join(zf.read(member).decode("utf-8") for member in members)
+
+
+class BundleReader:
+    """Reads entries from a bundle, loading its index once.
+
+    Deflated members cannot be read from an offset without decompressing
+    everything before it, so each member is decompressed once and the most
+    recently used ones are kept for later lookups in the same member.
+    """
+
+    def __init__(self, path: str, cached_members: int = CACHED_MEMBERS):
+        self.zf = zipfile.ZipFile(path)
+        try:
+            self.index = load_bundle_index(self.zf)
+        except BaseException:
+            self.zf.close()
+            raise
+        self.cached_members = cached_members
+        self.members: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def member(self, name: str) -> bytes:
+        """Return the decompressed content of a member."""
+        if name in self.members:
+            self.members.move_to_end(name)
+        else:
+            self.members[name] = self.zf.read(name)
+            while len(self.members) > self.cached_members:
+                self.members.popitem(last=False)
+        return self.members[name]
+
+    def read_entry(self, key: str, fmt: str = "bib") -> str:
+        """Read a single entry, as read_entry().
+
+        Raises:
+            KeyError: If the bundle has no entry with this key in this format.
+        """
+        for member, start, end in self.index["entries"].get(key, []):
+            if self.index["members"][member]["format"] == fmt:
+                return self.member(member)[start:end].decode("utf-8")
+        raise KeyError(f"No {fmt} entry {key!r} in bundle")
+
+    def read_law(self, law_id: str, fmt: str = "bib") -> str:
+        """Read all members of one law in one format, as read_law()."""
+        return read_law(self.zf, self.index, law_id, fmt)
+
+    def close(self) -> None:
+        self.members.clear()
+        self.zf.close()
+
+    def __enter__(self) -> "BundleReader":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
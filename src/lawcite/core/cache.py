@@ -0,0 +1,63 @@
+import hashlib
+import json
+import os
+import tempfile
+from pypdf import PdfReader
+from typing import Any, Optional
+
+
+def cache_dir() -> str:
+    """Return the directory used for cached per-PDF data.
+
+    Uses LAWCITE_CACHE_DIR if set, otherwise $XDG_CACHE_HOME/lawcite
+    (defaulting to ~/.cache/lawcite).
+    """
+    if os.environ.get("LAWCITE_CACHE_DIR"):
+        return os.environ["LAWCITE_CACHE_DIR"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "lawcite")
+
+
+def pdf_digest(pdf: PdfReader) -> Optional[str]:
+    """Return the SHA-256 hex digest of the bytes behind a PdfReader.
+
+    Returns None when the reader is not backed by an in-memory stream, in
+    which case callers should skip caching.
+    """
+    stream = getattr(pdf, "stream", None)
+    data = stream.getvalue() if hasattr(stream, "getvalue") else None
+    if not isinstance(data, bytes):
+        return None
+    return hashlib.sha256(data).hexdigest()
+
+
+def _cache_path(digest: str, name: str) -> str:
+    return os.path.join(cache_dir(), f"{digest}.{name}.json")
+
+
+def load_cached(digest: Optional[str], name: str) -> Optional[Any]:
+    """Load a cached JSON value for a PDF digest, or None if absent."""
+    if not digest:
+        return None
+    try:
+        with open(_cache_path(digest, name), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached(digest: Optional[str], name: str, value: Any) -> None:
+    """Store a JSON value for a PDF digest; failures are ignored."""
+    if not digest:
+        return
+    path = _cache_path(digest, name)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except OSError:
+        pass
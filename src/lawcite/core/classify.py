@@ -0,0 +1,63 @@
+import logging
+import re
+from typing import Any, List
+from .parse_law import CHAPTER_PATTERN, PARAGRAPH_PATTERN, SECTION_PATTERN
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_PAGES = 3
+# Document type codes in the retsinformation.dk header, e.g. "LBK nr 1150 af ..."
+HEADER_PATTERN = re.compile(r"^(LOV|LBK|BEK|VEJ|CIR|CIRK|SKR|BKI) nr\b")
+LAW_TYPES = {"LOV", "LBK", "BEK"}
+MIN_MARKERS = 3
+MIN_DENSITY = 0.05
+
+
+def classify_text(text: str) -> str:
+    """Classify document text as a law or another document.
+
+    The document type in the header ("LBK nr", "VEJ nr", ...) decides when
+    present. Otherwise the document is a law if enough lines start with
+    "Kapitel", "§" or "Stk.", the markers parse_law_paragraphs splits on.
+
+    Args:
+        text: Text of the first pages.
+
+    Returns:
+        "law" or "other".
+    """
+    lines = [line.strip() for line in text.split("\n") if line.strip()]
+    for line in lines:
+        header = HEADER_PATTERN.match(line)
+        if header:
+            return "law" if header.group(1) in LAW_TYPES else "other"
+
+    markers = sum(
+        1
+        for line in lines
+        if CHAPTER_PATTERN.match(line)
+        or PARAGRAPH_PATTERN.match(line)
+        or SECTION_PATTERN.match(line)
+    )
+    if markers >= MIN_MARKERS and markers >= MIN_DENSITY * len(lines):
+        return "law"
+    return "other"
+
+
+def classify_document(pdf: Any, pages: int = SAMPLE_PAGES) -> str:
+    """Classify a PDF as a law or another document from its first pages.
+
+    Wrap the reader in CachedTextReader to reuse the sampled page text for
+    metadata and parsing.
+
+    Args:
+        pdf: PdfReader object containing the PDF content.
+        pages: Number of pages to sample.
+
+    Returns:
+        "law" or "other".
+    """
+    sample: List[str] = [page.extract_text() for page in pdf.pages[:pages]]
+    kind = classify_text("\n".join(sample))
+    logger.info("Classified document as %s from %d pages", kind, len(sample))
+    return kind
@@ -1,7 +1,6 @@
 import bibtexparser as bp
-from typing import Dict, Tuple
-import re
-from unidecode import unidecode
+from typing import Dict, Optional, Tuple
+from .keys import build_key_table, make_law_id
 
 
 def create_law_bibtex(
@@ -10,26 +9,25 @@ def create_law_bibtex(
     document_author: str,
     document_url: str,
     document_date: str,
+    keys: Optional[Dict[Tuple[str, str, str], str]] = None,
 ) -> bp.bibdatabase.BibDatabase:
-    """Create BibTeX entries for a legal document."""
-    bib_database = bp.bibdatabase.BibDatabase()
+    """Create BibTeX entries for a legal document.
 
-    title_lower = unidecode(document_title).lower()
-    clean_title = re.sub(r"[^a-z0-9]+", "", title_lower)
+    keys is the citation key table of the document (see build_key_table),
+    computed here if not given.
+    """
+    bib_database = bp.bibdatabase.BibDatabase()
+    if keys is None:
+        keys = build_key_table(paragraph_content, make_law_id(document_title))
 
     for chapter, paragraph, section in paragraph_content:
-        # Clean chapter, paragraph and section for BibTeX ID
-        clean_chapter = chapter.lower().replace(" ", "")
-        clean_para = "p" + paragraph.lower().replace(" ", "")
-        clean_section = section.lower().replace("stk. ", "stk").replace(".", "")
-
         short_title = f"§{paragraph} {section}"
         author = f"{document_title.capitalize()} {short_title},"
         title = paragraph_content[(chapter, paragraph, section)]
 
         entry = {
             "ENTRYTYPE": "article",
-            "ID": f"{clean_title}{clean_para}{clean_section}",
+            "ID": keys[(chapter, paragraph, section)],
             "author": author,
             "journal": document_author,
             "title": title,
@@ -47,19 +45,22 @@ def create_general_bibtex(
     document_author: str,
     document_url: str,
     document_date: str,
+    keys: Optional[Dict[str, str]] = None,
 ) -> bp.bibdatabase.BibDatabase:
-    """Create BibTeX entries for a general document."""
-    bib_database = bp.bibdatabase.BibDatabase()
+    """Create BibTeX entries for a general document.
 
-    # Clean title for use in BibTeX ID
-    title_lower = unidecode(document_title).lower()
-    clean_title = re.sub(r"[^a-z0-9]+", "", title_lower)
+    keys is the citation key table of the document (see build_key_table),
+    computed here if not given.
+    """
+    bib_database = bp.bibdatabase.BibDatabase()
+    if keys is None:
+        keys = build_key_table(paragraph_content, make_law_id(document_title))
 
     for para_id, content in paragraph_content.items():
         author = f"{document_title.capitalize()} Paragraph {para_id},"
         entry = {
             "ENTRYTYPE": "article",
-            "ID": f"{clean_title}_{para_id}",
+            "ID": keys[para_id],
             "author": author,
             "journal": document_author,
             "title": content,
@@ -69,3 +70,59 @@ def create_general_bibtex(
         bib_database.entries.append(entry)
 
     return bib_database
+
+
+def create_crossref_bibtex(
+    paragraph_content: Dict,
+    document_title: str,
+    document_author: str,
+    document_url: str,
+    document_date: str,
+    keys: Optional[Dict] = None,
+    parent: bool = True,
+) -> bp.bibdatabase.BibDatabase:
+    """Create compact BibLaTeX entries that crossref one parent entry per law.
+
+    The shared fields are written once, in a @book entry keyed by the law
+    ID: the document title as author, the ministry as title and journaltitle,
+    url and date. @book is a standard BibTeX type, so the parent survives
+    bibtexparser (used by merge and subset); a @periodical would be dropped.
+    Each section becomes an @article with only its crossref, its § and Stk.
+    as number, and its text as title, and inherits the other fields. Set
+    parent to False to leave out the parent, e.g. when it is written to a
+    separate file.
+    """
+    bib_database = bp.bibdatabase.BibDatabase()
+    law_id = make_law_id(document_title)
+    if keys is None:
+        keys = build_key_table(paragraph_content, law_id)
+
+    if parent:
+        bib_database.entries.append(
+            {
+                "ENTRYTYPE": "book",
+                "ID": law_id,
+                "author": f"{document_title.capitalize()},",
+                "title": document_author,
+                "journaltitle": document_author,
+                "url": document_url,
+                "date": document_date,
+            }
+        )
+    for key, content in paragraph_content.items():
+        if isinstance(key, tuple) and len(key) == 3:
+            _, paragraph, section = key
+            number = f"§{paragraph} {section}"
+        else:
+            number = f"Paragraph {key}"
+        bib_database.entries.append(
+            {
+                "ENTRYTYPE": "article",
+                "ID": keys[key],
+                "crossref": law_id,
+                "number": number,
+                "title": content,
+            }
+        )
+
+    return bib_database
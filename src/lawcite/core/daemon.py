@@ -0,0 +1,232 @@
+import json
+import os
+import socket
+import socketserver
+import stat
+import struct
+import sys
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Kept free of heavy imports: the light CLI client imports this module to
+# forward jobs before deciding whether to load the full CLI.
+
+HEADER = struct.Struct("!I")
+STDIO_FDS = (0, 1, 2)
+# Seconds a client has to send its job after connecting
+REQUEST_TIMEOUT = 5.0
+UCRED = struct.Struct("3i")  # pid, uid, gid
+
+# Environment variables a job reads: lawcite's own settings, the cache
+# location, and the proxy, certificate and locale settings used by requests
+FORWARDED_ENV_PREFIXES = ("LAWCITE_", "LC_")
+FORWARDED_ENV = frozenset(
+    {
+        "HOME",
+        "XDG_CACHE_HOME",
+        "TMPDIR",
+        "LANG",
+        "TZ",
+        "REQUESTS_CA_BUNDLE",
+        "CURL_CA_BUNDLE",
+        "SSL_CERT_FILE",
+        "SSL_CERT_DIR",
+        *(
+            name
+            for proxy in ("http_proxy", "https_proxy", "all_proxy", "no_proxy")
+            for name in (proxy, proxy.upper())
+        ),
+    }
+)
+
+
+def socket_path() -> str:
+    """Return the path of the daemon socket.
+
+    Uses LAWCITE_SOCKET if set, otherwise "lawcite-<uid>.sock" in
+    $XDG_RUNTIME_DIR. Without a runtime directory the socket goes in a
+    private "lawcite-<uid>" directory under $TMPDIR or /tmp, which
+    create_server creates with mode 0700.
+    """
+    if os.environ.get("LAWCITE_SOCKET"):
+        return os.environ["LAWCITE_SOCKET"]
+    uid = os.getuid()
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return os.path.join(os.environ["XDG_RUNTIME_DIR"], f"lawcite-{uid}.sock")
+    base = os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(base, f"lawcite-{uid}", "daemon.sock")
+
+
+def forwarded_env(environ: Dict[str, str]) -> Dict[str, str]:
+    """Return the part of an environment that is forwarded to the daemon."""
+    return {
+        name: value
+        for name, value in environ.items()
+        if name in FORWARDED_ENV or name.startswith(FORWARDED_ENV_PREFIXES)
+    }
+
+
+def is_own_socket(path: str) -> bool:
+    """Check that path is a socket (not a symlink) owned by the current user."""
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+def peer_uid(conn: socket.socket) -> Optional[int]:
+    """Return the uid of the process at the other end of a Unix socket.
+
+    Returns None on platforms without SO_PEERCRED, where only the
+    permissions of the socket and its directory restrict access.
+    """
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, UCRED.size)
+    return UCRED.unpack(creds)[1]
+
+
+def _make_private_dir(path: str) -> None:
+    """Create the socket directory, refusing one owned by another user."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid():
+        raise RuntimeError(f"{path} is not a directory owned by the current user")
+
+
+def _recv_exact(conn: socket.socket, size: int, data: bytes = b"") -> bytes:
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed by peer")
+        data += chunk
+    return data
+
+
+def request_job(
+    path: str,
+    argv: List[str],
+    cwd: str,
+    env: Dict[str, str],
+    fds: Sequence[int] = STDIO_FDS,
+) -> int:
+    """Run a CLI job in the daemon listening on path.
+
+    The job's stdin, stdout and stderr file descriptors are passed to the
+    daemon, so its output goes where the caller's output would go.
+
+    Returns:
+        Exit status of the job.
+
+    Raises:
+        OSError: If no daemon is listening on path.
+    """
+    payload = json.dumps({"argv": argv, "cwd": cwd, "env": env}).encode("utf-8")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(path)
+        socket.send_fds(conn, [HEADER.pack(len(payload))], list(fds))
+        conn.sendall(payload)
+        (status,) = HEADER.unpack(_recv_exact(conn, HEADER.size))
+    return status
+
+
+def receive_job(conn: socket.socket) -> Tuple[Dict, List[int]]:
+    """Receive a job request and its file descriptors from a client."""
+    data, fds, _, _ = socket.recv_fds(conn, HEADER.size, len(STDIO_FDS))
+    (size,) = HEADER.unpack(_recv_exact(conn, HEADER.size, data))
+    return json.loads(_recv_exact(conn, size)), fds
+
+
+def run_job(
+    conn: socket.socket,
+    run: Callable[[List[str]], int],
+    timeout: Optional[float] = REQUEST_TIMEOUT,
+) -> int:
+    """Run one job in the current (forked) process and report its status.
+
+    The process takes over the client's working directory, environment
+    and standard streams before calling run with the job's arguments. Only
+    the forwarded environment variables are taken from the client; the rest
+    of the daemon's environment is kept.
+    """
+    conn.settimeout(timeout)
+    request, fds = receive_job(conn)
+    conn.settimeout(None)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    for target, fd in zip(STDIO_FDS, fds):
+        os.dup2(fd, target)
+        os.close(fd)
+    os.chdir(request["cwd"])
+    for name in forwarded_env(dict(os.environ)):
+        del os.environ[name]
+    os.environ.update(forwarded_env(request["env"]))
+    try:
+        status = run(request["argv"])
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    conn.sendall(HEADER.pack(status & 0xFFFFFFFF))
+    return status
+
+
+class DaemonServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server running each job in a process forked from the warm daemon."""
+
+    request_timeout = REQUEST_TIMEOUT
+
+    def __init__(self, path: str, run: Callable[[List[str]], int]):
+        self.run = run
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                uid = peer_uid(self.request)
+                if uid is not None and uid != os.getuid():
+                    return  # closing the connection refuses the job
+                try:
+                    run_job(self.request, self.server.run, self.server.request_timeout)
+                except (ConnectionError, TimeoutError):
+                    pass  # e.g. the liveness probe of create_server
+
+        old_umask = os.umask(0o177)  # socket readable by the owner only
+        try:
+            super().__init__(path, Handler)
+        finally:
+            os.umask(old_umask)
+
+
+def create_server(path: str, run: Callable[[List[str]], int]) -> DaemonServer:
+    """Bind the daemon socket, replacing a stale socket file.
+
+    Raises:
+        RuntimeError: If another daemon is already listening on path, or
+            the socket's directory is owned by another user.
+    """
+    _make_private_dir(os.path.dirname(path) or ".")
+    if os.path.exists(path):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.connect(path)
+        except OSError:
+            os.remove(path)
+        else:
+            raise RuntimeError(f"A lawcite daemon is already listening on {path}")
+    return DaemonServer(path, run)
+
+
+def forward(argv: List[str], path: Optional[str] = None) -> Optional[int]:
+    """Forward a CLI job to a running daemon.
+
+    Only the environment variables lawcite reads are sent, and only to a
+    socket owned by the current user.
+
+    Returns:
+        Exit status of the job, or None if no daemon is running.
+    """
+    path = path or socket_path()
+    if not is_own_socket(path):
+        return None
+    try:
+        return request_job(path, argv, os.getcwd(), forwarded_env(dict(os.environ)))
+    except (ConnectionRefusedError, FileNotFoundError):
+        return None
@@ -0,0 +1,39 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+from .keys import SectionKey, make_law_id
+
+
+@dataclass
+class Document:
+    """A converted document: its metadata and the text of each section.
+
+    Attributes:
+        kind: Document kind, "law" or "other".
+        url: URL of the document.
+        date: Date of the document.
+        author: Author (ministry) of the document.
+        title: Title of the document.
+        sections: Dictionary mapping (chapter, paragraph, section) tuples
+            (laws) or paragraph IDs (general documents) to content strings.
+        references: Cross-reference graph of a law, mapping each section to
+            the sections it cites.
+        cited_by: Backlink index mapping each section to the sections
+            citing it.
+        keys: Citation key table mapping each section to its unique
+            citation key, shared by all renderers.
+    """
+
+    kind: str
+    url: str
+    date: str
+    author: str
+    title: str
+    sections: Dict[SectionKey, str] = field(default_factory=dict)
+    references: Dict[SectionKey, List[SectionKey]] = field(default_factory=dict)
+    cited_by: Dict[SectionKey, List[SectionKey]] = field(default_factory=dict)
+    keys: Dict[SectionKey, str] = field(default_factory=dict)
+
+    @property
+    def law_id(self) -> str:
+        """Cleaned law ID used as prefix for citation keys."""
+        return make_law_id(self.title)
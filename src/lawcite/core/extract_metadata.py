@@ -1,6 +1,10 @@
 from pypdf import PdfReader
 from datetime import datetime
+import logging
 import re
+from .metrics import timed
+
+logger = logging.getLogger(__name__)
 
 
 def extract_metadata(pdf: PdfReader, input_url: str) -> tuple[str, str, str, str]:
@@ -16,16 +20,34 @@ def extract_metadata(pdf: PdfReader, input_url: str) -> tuple[str, str, str, str
     Raises:
         KeyError: If required metadata cannot be extracted.
     """
-    first_page = pdf.pages[0].extract_text()
+    with timed("metadata"):
+        first_page = pdf.pages[0].extract_text()
+        return metadata_from_first_page(first_page, pdf.metadata, input_url)
+
+
+def metadata_from_first_page(
+    first_page: str, metadata: dict, input_url: str
+) -> tuple[str, str, str, str]:
+    """Extract metadata from the first page text and the PDF info dictionary.
+
+    Args:
+        first_page: Extracted text of the first page.
+        metadata: PDF document info dictionary.
+        input_url: Original input URL for fallback.
+
+    Returns:
+        Tuple of (document_url, document_date, document_author, document_title).
+    """
     lines = first_page.split("\n")
+    metadata = metadata or {}
 
     document_url = input_url
     document_date = ""
     document_author = ""
     document_title = ""
 
-    if "/Title" in pdf.metadata:
-        document_title = str(pdf.metadata["/Title"])
+    if "/Title" in metadata:
+        document_title = str(metadata["/Title"])
         if document_title.startswith("Bekendtgørelse af "):
             document_title = document_title[len("Bekendtgørelse af "):]
 
@@ -44,7 +66,7 @@ def extract_metadata(pdf: PdfReader, input_url: str) -> tuple[str, str, str, str
 
     # Fallback to metadata date if text-based date not found
     if not document_date:
-        document_date = pdf.metadata.get("/CreationDate", "")
+        document_date = metadata.get("/CreationDate", "")
         if document_date:
             match = re.search(r"D:(\d{8})(\d{2})", document_date)
             if match:
@@ -56,18 +78,18 @@ def extract_metadata(pdf: PdfReader, input_url: str) -> tuple[str, str, str, str
                 document_date = f"{year}-{month}-{day}"
             else:
                 document_date = datetime.now().strftime("%Y-%m-%d")
-                print(
-                    "Warning: No valid date found in PDF metadata, using current date."
+                logger.warning(
+                    "No valid date found in PDF metadata, using current date."
                 )
         else:
             document_date = datetime.now().strftime("%Y-%m-%d")
-            print("Warning: No date found, using current date.")
+            logger.warning("No date found, using current date.")
 
     if not document_author:
         document_author = "Unknown Author"
-        print("Warning: No valid author found in PDF, using 'Unknown Author'.")
+        logger.warning("No valid author found in PDF, using 'Unknown Author'.")
     if not document_title:
         document_title = "Untitled Document"
-        print("Warning: No valid title found in PDF, using 'Untitled Document'.")
+        logger.warning("No valid title found in PDF, using 'Untitled Document'.")
 
     return document_url, document_date, document_author, document_title
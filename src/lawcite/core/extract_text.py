@@ -0,0 +1,546 @@
+import logging
+import math
+import re
+from collections.abc import Sequence
+from typing import Any, Dict, List, Optional, Tuple
+from pypdf import PdfReader
+from pypdf.generic import IndirectObject
+
+logger = logging.getLogger(__name__)
+
+EXTRACTORS = ("pypdf", "fast")
+
+TOKEN_PATTERN = re.compile(
+    rb"\s*(?:"
+    rb"(?P<num>[+-]?(?:\d+\.?\d*|\.\d+))"
+    rb"|(?P<name>/[^\s/\[\]()<>{}%]*)"
+    rb"|(?P<dict><<|>>)"
+    rb"|(?P<hex><[0-9A-Fa-f\s]*>)"
+    rb"|(?P<open>\[)|(?P<close>\])"
+    rb"|(?P<str>\()"
+    rb"|(?P<comment>%[^\r\n]*)"
+    rb"|(?P<op>[^\s/\[\]()<>{}%]+)"
+    rb")"
+)
+INLINE_IMAGE_END = re.compile(rb"\sEI(?=\s|$)")
+ESCAPES = {
+    ord("n"): b"\n",
+    ord("r"): b"\r",
+    ord("t"): b"\t",
+    ord("b"): b"\b",
+    ord("f"): b"\f",
+}
+SIMPLE_ENCODINGS = {"/WinAnsiEncoding": "cp1252", "/MacRomanEncoding": "mac_roman"}
+CMAP_SECTION = re.compile(rb"begin(codespacerange|bfchar|bfrange)(.*?)end\1", re.DOTALL)
+CMAP_TOKEN = re.compile(rb"<([0-9A-Fa-f\s]*)>|\[|\]")
+
+
+class UnsupportedContent(Exception):
+    """Raised for page content this extractor leaves to pypdf."""
+
+
+class UnsupportedFont(UnsupportedContent):
+    """Raised for fonts this extractor cannot decode without pypdf."""
+
+
+def _is_translation(matrix: Any) -> bool:
+    """Return True if a transformation matrix only moves, not scales or rotates."""
+    return [float(v) for v in matrix[:4]] == [1.0, 0.0, 0.0, 1.0]
+
+
+def _hex_bytes(text: bytes) -> bytes:
+    digits = re.sub(rb"\s+", b"", text)
+    if len(digits) % 2:
+        digits += b"0"
+    return bytes.fromhex(digits.decode("ascii"))
+
+
+def _literal_string(data: bytes, pos: int) -> Tuple[bytes, int]:
+    """Parse a literal string starting after its "(" at pos."""
+    out = bytearray()
+    depth = 1
+    length = len(data)
+    while pos < length:
+        c = data[pos]
+        if c == 0x5C:  # backslash
+            pos += 1
+            if pos >= length:
+                break
+            c = data[pos]
+            if c in ESCAPES:
+                out += ESCAPES[c]
+            elif 0x30 <= c <= 0x37:
+                end = pos
+                while end < min(pos + 3, length) and 0x30 <= data[end] <= 0x37:
+                    end += 1
+                out.append(int(data[pos:end], 8) & 0xFF)
+                pos = end - 1
+            elif c == 0x0D:
+                if pos + 1 < length and data[pos + 1] == 0x0A:
+                    pos += 1
+            elif c != 0x0A:
+                out.append(c)
+        elif c == 0x28:
+            depth += 1
+            out.append(c)
+        elif c == 0x29:
+            depth -= 1
+            if depth == 0:
+                return bytes(out), pos + 1
+            out.append(c)
+        else:
+            out.append(c)
+        pos += 1
+    return bytes(out), pos
+
+
+def parse_to_unicode(data: bytes) -> Tuple[Dict[int, str], int]:
+    """Parse a ToUnicode CMap.
+
+    Returns:
+        Tuple of (character code -> text mapping, code length in bytes).
+    """
+    mapping: Dict[int, str] = {}
+    code_length = 0
+    for section, body in CMAP_SECTION.findall(data):
+        tokens = []
+        for match in CMAP_TOKEN.finditer(body):
+            tokens.append(match.group(0) if match.group(1) is None else _hex_bytes(match.group(1)))
+        if section == b"codespacerange":
+            if tokens and not code_length:
+                code_length = len(tokens[0])
+        elif section == b"bfchar":
+            for src, dst in zip(tokens[0::2], tokens[1::2]):
+                code_length = code_length or len(src)
+                mapping[int.from_bytes(src, "big")] = dst.decode("utf-16-be", "ignore")
+        else:
+            i = 0
+            while i + 2 < len(tokens):
+                low, high = tokens[i], tokens[i + 1]
+                code_length = code_length or len(low)
+                first, last = int.from_bytes(low, "big"), int.from_bytes(high, "big")
+                if tokens[i + 2] == b"[":
+                    i += 3
+                    code = first
+                    while i < len(tokens) and tokens[i] != b"]":
+                        mapping[code] = tokens[i].decode("utf-16-be", "ignore")
+                        code += 1
+                        i += 1
+                    i += 1
+                else:
+                    dst = tokens[i + 2]
+                    base = dst.decode("utf-16-be", "ignore")
+                    for offset in range(last - first + 1):
+                        if base:
+                            mapping[first + offset] = base[:-1] + chr(ord(base[-1]) + offset)
+                    i += 3
+    return mapping, code_length or 1
+
+
+class FontDecoder:
+    """Decodes the strings shown with one font and measures their width."""
+
+    def __init__(self, font: Any):
+        font = font.get_object()
+        self.subtype = font.get("/Subtype")
+        self.code_length = 1
+        self.to_unicode: Optional[Dict[int, str]] = None
+        self.codec: Optional[str] = None
+        self.widths: Dict[int, float] = {}
+        self.default_width = 500.0
+
+        if "/ToUnicode" in font:
+            self.to_unicode, self.code_length = parse_to_unicode(
+                font["/ToUnicode"].get_object().get_data()
+            )
+        elif self.subtype == "/Type0":
+            raise UnsupportedFont("Composite font without ToUnicode")
+        else:
+            encoding = font.get("/Encoding")
+            encoding = encoding.get_object() if encoding is not None else None
+            if not isinstance(encoding, str) or encoding not in SIMPLE_ENCODINGS:
+                raise UnsupportedFont(f"Unsupported encoding {encoding!r}")
+            self.codec = SIMPLE_ENCODINGS[encoding]
+
+        if self.subtype == "/Type0":
+            if font.get("/Encoding") not in ("/Identity-H", "/Identity-V"):
+                raise UnsupportedFont(f"Unsupported CMap {font.get('/Encoding')!r}")
+            self.code_length = 2
+            descendant = font["/DescendantFonts"].get_object()[0].get_object()
+            self.default_width = float(descendant.get("/DW", 1000))
+            widths = descendant.get("/W")
+            widths = widths.get_object() if widths is not None else []
+            i = 0
+            while i + 1 < len(widths):
+                first = int(widths[i])
+                item = widths[i + 1].get_object()
+                if isinstance(item, list):
+                    for offset, width in enumerate(item):
+                        self.widths[first + offset] = float(width.get_object())
+                    i += 2
+                else:
+                    for code in range(first, int(item) + 1):
+                        self.widths[code] = float(widths[i + 2].get_object())
+                    i += 3
+        elif "/Widths" in font:
+            first = int(font.get("/FirstChar", 0))
+            for offset, width in enumerate(font["/Widths"].get_object()):
+                self.widths[first + offset] = float(width)
+            descriptor = font.get("/FontDescriptor")
+            if descriptor is not None:
+                self.default_width = float(descriptor.get_object().get("/MissingWidth", 0)) or 500.0
+
+    def codes(self, data: bytes) -> List[int]:
+        """Split a shown string into character codes."""
+        if self.code_length == 1:
+            return list(data)
+        n = self.code_length
+        return [int.from_bytes(data[i:i + n], "big") for i in range(0, len(data) - n + 1, n)]
+
+    def decode(self, data: bytes) -> Tuple[str, float, int, int]:
+        """Decode a shown string.
+
+        Returns:
+            Tuple of (text, width in 1/1000 text space units, number of
+            characters, number of single-byte spaces for word spacing).
+        """
+        codes = self.codes(data)
+        if self.codec:
+            text = data.decode(self.codec, "replace")
+        else:
+            to_unicode = self.to_unicode
+            text = "".join(to_unicode.get(code, "") for code in codes)
+        widths = self.widths
+        default = self.default_width
+        width = sum(widths.get(code, default) for code in codes)
+        spaces = codes.count(32) if self.code_length == 1 else 0
+        return text, width, len(codes), spaces
+
+
+class TextExtractor:
+    """Extracts page text from content streams, sharing fonts across pages.
+
+    Retsinformation PDFs use the same few fonts on every page, so each
+    font's decoding table (ToUnicode CMap or simple encoding) and widths are
+    built once per document and reused for all pages. Lines are broken
+    where the text position moves to a new line, as pypdf does, so the
+    parsers see the same lines. The current transformation matrix (cm) is
+    only followed for translations; pages that scale or rotate content with
+    cm or a form matrix, or use a font this extractor cannot decode, are
+    extracted with pypdf instead.
+    """
+
+    def __init__(self) -> None:
+        self.fonts: Dict[Any, Optional[FontDecoder]] = {}
+
+    def font(self, ref: Any) -> FontDecoder:
+        """Return the cached decoder of a font, building it on first use."""
+        key = (ref.idnum, ref.generation) if isinstance(ref, IndirectObject) else id(ref)
+        if key not in self.fonts:
+            try:
+                self.fonts[key] = FontDecoder(ref)
+            except UnsupportedFont as e:
+                logger.debug("Falling back to pypdf: %s", e)
+                self.fonts[key] = None
+        decoder = self.fonts[key]
+        if decoder is None:
+            raise UnsupportedFont(str(key))
+        return decoder
+
+    def extract_text(self, page: Any) -> str:
+        """Extract the text of a page as newline-separated lines."""
+        try:
+            out: List[str] = []
+            contents = page.get("/Contents")
+            if contents is not None:
+                contents = contents.get_object()
+                if isinstance(contents, list):
+                    data = b"\n".join(c.get_object().get_data() for c in contents)
+                else:
+                    data = contents.get_data()
+                self._run(data, page.get("/Resources"), out, depth=0)
+            return "".join(out)
+        except UnsupportedContent as e:
+            logger.debug("Falling back to pypdf: %s", e)
+            return page.extract_text()
+
+    def _run(self, data: bytes, resources: Any, out: List[str], depth: int) -> None:
+        resources = resources.get_object() if resources is not None else {}
+        font_resources = resources.get("/Font")
+        font_resources = font_resources.get_object() if font_resources is not None else {}
+
+        decoder: Optional[FontDecoder] = None
+        font_size = 0.0
+        char_spacing = word_spacing = leading = 0.0
+        scale = 1.0
+        tm = lm = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+        last_y: Optional[float] = None
+        last_x: Optional[float] = None
+        # Translation of the current transformation matrix, saved by q/Q
+        origin = (0.0, 0.0)
+        saved: List[Tuple[float, float]] = []
+
+        operands: List[Any] = []
+        arrays: List[List[Any]] = []
+        pos = 0
+        length = len(data)
+
+        def size() -> float:
+            return font_size * (math.hypot(tm[2], tm[3]) or 1.0)
+
+        def show(string: bytes) -> None:
+            # Like pypdf, break the line when text is shown at a new vertical
+            # position (never twice in a row), and add a space when it jumped
+            # forward on the same line.
+            nonlocal tm, last_x, last_y
+            if decoder is None:
+                return
+            x, y = tm[4] + origin[0], tm[5] + origin[1]
+            if last_y is None:
+                last_y = y
+            elif abs(y - last_y) > 0.3 * max(size(), 1.0):
+                if out and not out[-1].endswith("\n"):
+                    out.append("\n")
+                last_y = y
+            elif last_x is not None and x - last_x > 0.15 * size():
+                if out and not out[-1].endswith((" ", "\n")):
+                    out.append(" ")
+            text, width, count, spaces = decoder.decode(string)
+            if text:
+                out.append(text)
+            advance = (width / 1000 * font_size + char_spacing * count + word_spacing * spaces) * scale
+            tm = (tm[0], tm[1], tm[2], tm[3], tm[4] + advance * tm[0], tm[5] + advance * tm[1])
+            last_x = tm[4] + origin[0]
+
+        def move(tx: float, ty: float) -> None:
+            nonlocal tm, lm
+            lm = (lm[0], lm[1], lm[2], lm[3], lm[4] + tx * lm[0] + ty * lm[2], lm[5] + tx * lm[1] + ty * lm[3])
+            tm = lm
+
+        while pos < length:
+            match = TOKEN_PATTERN.match(data, pos)
+            if not match or match.end() == pos:
+                break
+            pos = match.end()
+            kind = match.lastgroup
+            if kind == "num":
+                value: Any = float(match.group("num"))
+            elif kind == "str":
+                value, pos = _literal_string(data, pos)
+            elif kind == "hex":
+                value = _hex_bytes(match.group("hex")[1:-1])
+            elif kind == "name":
+                value = match.group("name").decode("latin-1")
+            elif kind == "open":
+                arrays.append([])
+                continue
+            elif kind == "close":
+                value = arrays.pop() if arrays else []
+            elif kind in ("dict", "comment") or kind is None:
+                continue
+            else:
+                op = match.group("op")
+                if arrays:
+                    continue
+                if op == b"BT":
+                    tm = lm = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+                elif op == b"q":
+                    saved.append(origin)
+                elif op == b"Q":
+                    origin = saved.pop() if saved else (0.0, 0.0)
+                elif op == b"cm" and len(operands) >= 6:
+                    if not _is_translation(operands[-6:]):
+                        raise UnsupportedContent("Scaled or rotated cm")
+                    origin = (origin[0] + operands[-2], origin[1] + operands[-1])
+                elif op == b"Tf" and len(operands) >= 2:
+                    font_ref = font_resources.get(operands[-2]) if hasattr(font_resources, "get") else None
+                    if font_ref is None:
+                        raise UnsupportedFont(f"Missing font {operands[-2]}")
+                    decoder = self.font(font_ref)
+                    font_size = operands[-1]
+                elif op == b"Td" and len(operands) >= 2:
+                    move(operands[-2], operands[-1])
+                elif op == b"TD" and len(operands) >= 2:
+                    leading = -operands[-1]
+                    move(operands[-2], operands[-1])
+                elif op == b"Tm" and len(operands) >= 6:
+                    tm = lm = tuple(operands[-6:])
+                elif op == b"T*":
+                    move(0.0, -leading)
+                elif op == b"TL" and operands:
+                    leading = operands[-1]
+                elif op == b"Tc" and operands:
+                    char_spacing = operands[-1]
+                elif op == b"Tw" and operands:
+                    word_spacing = operands[-1]
+                elif op == b"Tz" and operands:
+                    scale = operands[-1] / 100
+                elif op == b"Tj" and operands:
+                    show(operands[-1])
+                elif op == b"'" and operands:
+                    move(0.0, -leading)
+                    show(operands[-1])
+                elif op == b'"' and len(operands) >= 3:
+                    word_spacing, char_spacing = operands[-3], operands[-2]
+                    move(0.0, -leading)
+                    show(operands[-1])
+                elif op == b"TJ" and operands:
+                    for item in operands[-1]:
+                        if isinstance(item, bytes):
+                            show(item)
+                        else:
+                            shift = -item / 1000 * font_size * scale
+                            tm = (tm[0], tm[1], tm[2], tm[3], tm[4] + shift * tm[0], tm[5] + shift * tm[1])
+                            if shift > 0.15 * size() and out and not out[-1].endswith((" ", "\n")):
+                                out.append(" ")
+                            last_x = tm[4] + origin[0]
+                elif op == b"Do" and operands and depth < 5:
+                    self._run_form(resources, operands[-1], out, depth)
+                elif op == b"BI":
+                    end = INLINE_IMAGE_END.search(data, data.find(b"ID", pos))
+                    pos = end.end() if end else length
+                operands = []
+                continue
+            if arrays:
+                arrays[-1].append(value)
+            else:
+                operands.append(value)
+
+    def _run_form(self, resources: Any, name: str, out: List[str], depth: int) -> None:
+        xobjects = resources.get("/XObject")
+        if xobjects is None:
+            return
+        xobject = xobjects.get_object().get(name)
+        if xobject is None:
+            return
+        xobject = xobject.get_object()
+        if xobject.get("/Subtype") != "/Form":
+            return
+        if not _is_translation(xobject.get("/Matrix", [1, 0, 0, 1, 0, 0])):
+            raise UnsupportedContent("Scaled or rotated form matrix")
+        self._run(xobject.get_data(), xobject.get("/Resources", resources), out, depth + 1)
+
+
+class ExtractedPage:
+    """A page whose extract_text() uses a shared TextExtractor."""
+
+    def __init__(self, page: Any, extractor: TextExtractor):
+        self.page = page
+        self.extractor = extractor
+
+    def extract_text(self) -> str:
+        return self.extractor.extract_text(self.page)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.page, name)
+
+
+class ExtractedPages(Sequence):
+    """Lazy sequence of ExtractedPage objects over a reader's pages."""
+
+    def __init__(self, pages: Any, extractor: TextExtractor):
+        self.pages = pages
+        self.extractor = extractor
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [ExtractedPage(page, self.extractor) for page in self.pages[index]]
+        return ExtractedPage(self.pages[index], self.extractor)
+
+
+class FastTextReader:
+    """PdfReader wrapper extracting page text with a shared TextExtractor.
+
+    It exposes pages, metadata and stream like PdfReader, so the parsers
+    and the page-index cache work on it unchanged.
+    """
+
+    def __init__(self, pdf: PdfReader):
+        self.pdf = pdf
+        self.extractor = TextExtractor()
+        self.pages = ExtractedPages(pdf.pages, self.extractor)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.pdf, name)
+
+
+def with_extractor(pdf: PdfReader, extractor: str = "pypdf") -> Any:
+    """Return a reader that extracts page text with the chosen extractor.
+
+    Args:
+        pdf: PdfReader object containing the PDF content.
+        extractor: "pypdf" for pypdf's extract_text() or "fast" for the
+            content-stream extractor with cross-page font caching.
+
+    Raises:
+        ValueError: If the extractor is unknown.
+    """
+    if extractor == "pypdf":
+        return pdf
+    if extractor == "fast":
+        return FastTextReader(pdf)
+    raise ValueError(f"Unknown extractor: {extractor!r} (expected one of {', '.join(EXTRACTORS)})")
+
+
+class CachedPage:
+    """A page whose extracted text is kept for later callers."""
+
+    def __init__(self, page: Any, cache: Dict[int, str], index: int, keep: bool):
+        self.page = page
+        self.cache = cache
+        self.index = index
+        self.keep = keep
+
+    def extract_text(self) -> str:
+        if self.index in self.cache:
+            return self.cache[self.index]
+        text = self.page.extract_text()
+        if self.keep:
+            self.cache[self.index] = text
+        return text
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.page, name)
+
+
+class CachedPages(Sequence):
+    """Lazy sequence of CachedPage objects over a reader's pages."""
+
+    def __init__(self, pages: Any, cache: Dict[int, str], keep: int):
+        self.pages = pages
+        self.cache = cache
+        self.keep = keep
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return CachedPage(self.pages[index], self.cache, index, index < self.keep)
+
+    def __iter__(self) -> Any:
+        for index in range(len(self)):
+            yield self[index]
+
+
+class CachedTextReader:
+    """Reader wrapper keeping the extracted text of the first pages.
+
+    The first pages are read by several steps of a conversion (metadata,
+    document classification, then the parser), so their text is extracted
+    once and shared. Later pages are extracted as usual.
+    """
+
+    def __init__(self, pdf: Any, keep: int = 3):
+        self.pdf = pdf
+        self.text: Dict[int, str] = {}
+        self.pages = CachedPages(pdf.pages, self.text, keep)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.pdf, name)
@@ -2,44 +2,102 @@ import requests
 from pypdf import PdfReader
 from datetime import datetime
 from unidecode import unidecode
-import os
+import io
+import logging
+import time
+from .metrics import BYTES_FETCHED, RETRIES, timed
 
+logger = logging.getLogger(__name__)
 
-def fetch_pdf_content(input_url: str, debug: bool = False) -> PdfReader:
-    """Fetch PDF content from a URL.
 
-    Args:
-        input_url: URL of the PDF file or PDF-generating API.
-        debug: If True, save the fetched PDF to a file.
-
-    Returns:
-        PdfReader object containing the PDF content.
+def check_pdf_response(response: requests.Response) -> None:
+    """Check that a response is successful and contains a PDF.
 
     Raises:
-        requests.RequestException: If the request fails.
-        ValueError: If the URL does not return a PDF.
+        requests.RequestException: If the request failed.
+        ValueError: If the response is not a PDF.
     """
-    response = requests.get(input_url, timeout=10)
     response.raise_for_status()
 
     if "application/pdf" not in response.headers.get("Content-Type", ""):
         raise ValueError("URL does not return a PDF file")
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    temp_filename = f"temp_{timestamp}.pdf"
-    with open(temp_filename, "wb") as f:
-        f.write(response.content)
 
-    pdf = PdfReader(temp_filename)
-    print(f"Loaded PDF content from {input_url}")
+def read_pdf_bytes(content: bytes, input_url: str, debug: bool = False) -> PdfReader:
+    """Load fetched PDF bytes into a PdfReader.
+
+    The PDF is read from memory; nothing is written to disk unless debug is set.
+
+    Args:
+        content: Raw PDF content.
+        input_url: URL the content was fetched from.
+        debug: If True, save the PDF to a file.
+
+    Returns:
+        PdfReader object containing the PDF content.
+    """
+    pdf = PdfReader(io.BytesIO(content))
+    logger.info("Loaded PDF content from %s", input_url, extra={"url": input_url})
 
     if debug:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         debug_filename = (
             f"debug_{unidecode(input_url.split('/')[-1] or 'document')}_{timestamp}.pdf"
         )
-        os.rename(temp_filename, debug_filename)
-        print(f"Saved PDF content to {debug_filename}")
-    else:
-        os.remove(temp_filename)
+        with open(debug_filename, "wb") as f:
+            f.write(content)
+        logger.info("Saved PDF content to %s", debug_filename)
 
     return pdf
+
+
+def fetch_pdf_bytes(input_url: str, retries: int = 2) -> bytes:
+    """Fetch raw PDF bytes from a URL.
+
+    Args:
+        input_url: URL of the PDF file or PDF-generating API.
+        retries: Number of retries on connection errors and timeouts.
+
+    Returns:
+        Raw PDF content.
+
+    Raises:
+        requests.RequestException: If the request fails.
+        ValueError: If the URL does not return a PDF.
+    """
+    with timed("fetch"):
+        for attempt in range(retries + 1):
+            try:
+                response = requests.get(input_url, timeout=10)
+                break
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == retries:
+                    raise
+                RETRIES.inc()
+                logger.warning(
+                    "Retrying %s after error: %s", input_url, e, extra={"url": input_url}
+                )
+                time.sleep(2**attempt)
+        check_pdf_response(response)
+    BYTES_FETCHED.inc(len(response.content))
+    return response.content
+
+
+def fetch_pdf_content(
+    input_url: str, debug: bool = False, retries: int = 2
+) -> PdfReader:
+    """Fetch PDF content from a URL.
+
+    Args:
+        input_url: URL of the PDF file or PDF-generating API.
+        debug: If True, save the fetched PDF to a file.
+        retries: Number of retries on connection errors and timeouts.
+
+    Returns:
+        PdfReader object containing the PDF content.
+
+    Raises:
+        requests.RequestException: If the request fails.
+        ValueError: If the URL does not return a PDF.
+    """
+    return read_pdf_bytes(fetch_pdf_bytes(input_url, retries), input_url, debug)
@@ -0,0 +1,189 @@
+import logging
+import math
+import re
+from collections import Counter
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from .cache import pdf_digest, load_cached, store_cached
+from .metrics import CACHE_REQUESTS, timed
+from .parse_law import CHAPTER_PATTERN, PARAGRAPH_PATTERN, SECTION_PATTERN
+
+logger = logging.getLogger(__name__)
+
+FURNITURE_VERSION = 2
+# Number of non-blank lines at the top and bottom of a page that can be furniture
+EDGE_LINES = 3
+# Share of the pages a line must repeat on
+MIN_SHARE = 0.5
+# Number of pages, spread over the document, furniture is detected from
+SAMPLE_PAGES = 8
+DIGITS_PATTERN = re.compile(r"\d+")
+
+Pattern = Tuple[str, int, str]
+
+
+def normalize_line(line: str) -> str:
+    """Normalize a line for comparison across pages.
+
+    Whitespace is collapsed and numbers are replaced by "#", so page numbers
+    and dates such as "Side 3 af 40" match on every page.
+    """
+    return DIGITS_PATTERN.sub("#", " ".join(line.split()))
+
+
+def _edge_lines(lines: List[str]) -> Iterator[Tuple[str, int, int]]:
+    """Yield (edge, position, line index) for the lines at the page edges."""
+    filled = [i for i, line in enumerate(lines) if line.strip()]
+    for position, index in enumerate(filled[:EDGE_LINES]):
+        yield "top", position, index
+    for position, index in enumerate(reversed(filled[-EDGE_LINES:])):
+        yield "bottom", position, index
+
+
+def _is_marker(line: str) -> bool:
+    line = line.strip()
+    return bool(
+        CHAPTER_PATTERN.match(line)
+        or PARAGRAPH_PATTERN.match(line)
+        or SECTION_PATTERN.match(line)
+    )
+
+
+def detect_furniture(texts: List[str]) -> List[Pattern]:
+    """Detect header and footer lines repeated across the pages of a document.
+
+    A line is page furniture if, after normalization, it appears at the same
+    position from the top or bottom of at least half of the pages (and at
+    least two). Lines starting a chapter, § or Stk. are never furniture.
+
+    Args:
+        texts: Extracted text of the pages to compare.
+
+    Returns:
+        Sorted list of (edge, position, normalized line) patterns, where edge
+        is "top" or "bottom" and position counts non-blank lines from it.
+    """
+    counts: Counter = Counter()
+    for text in texts:
+        lines = text.split("\n")
+        counts.update(
+            {
+                (edge, position, normalize_line(lines[index]))
+                for edge, position, index in _edge_lines(lines)
+                if not _is_marker(lines[index])
+            }
+        )
+    threshold = max(2, math.ceil(MIN_SHARE * len(texts)))
+    return sorted(pattern for pattern, count in counts.items() if count >= threshold)
+
+
+def sample_pages(page_count: int) -> List[int]:
+    """Return the indices of up to SAMPLE_PAGES pages spread evenly over a document."""
+    if page_count <= SAMPLE_PAGES:
+        return list(range(page_count))
+    step = (page_count - 1) / (SAMPLE_PAGES - 1)
+    return sorted({round(i * step) for i in range(SAMPLE_PAGES)})
+
+
+def strip_furniture(text: str, patterns: Set[Pattern]) -> str:
+    """Remove the lines of a page's text that match furniture patterns."""
+    if not patterns:
+        return text
+    lines = text.split("\n")
+    furniture = {
+        index
+        for edge, position, index in _edge_lines(lines)
+        if (edge, position, normalize_line(lines[index])) in patterns
+    }
+    return "\n".join(line for i, line in enumerate(lines) if i not in furniture)
+
+
+class StrippedPage:
+    """A page whose extract_text() omits the document's page furniture."""
+
+    def __init__(self, page: Any, patterns: Set[Pattern], text: Optional[str] = None):
+        self.page = page
+        self.patterns = patterns
+        self.text = text
+
+    def extract_text(self) -> str:
+        text = self.page.extract_text() if self.text is None else self.text
+        return strip_furniture(text, self.patterns)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.page, name)
+
+
+class StrippedPages(Sequence):
+    """Lazy sequence of StrippedPage objects over a reader's pages."""
+
+    def __init__(self, pages: Any, patterns: Set[Pattern], texts: Dict[int, str]):
+        self.pages = pages
+        self.patterns = patterns
+        self.texts = texts
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return StrippedPage(self.pages[index], self.patterns, self.texts.get(index))
+
+    def __iter__(self) -> Iterator[StrippedPage]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+class StrippedTextReader:
+    """Reader wrapper whose pages have their header and footer lines removed.
+
+    Text extracted for detection (by page index) is reused, so sampled
+    pages are extracted only once.
+    """
+
+    def __init__(
+        self, pdf: Any, patterns: List[Pattern], texts: Optional[Dict[int, str]] = None
+    ):
+        self.pdf = pdf
+        self.patterns = patterns
+        self.pages = StrippedPages(pdf.pages, set(patterns), texts or {})
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.pdf, name)
+
+
+def strip_page_furniture(pdf: Any, cache: bool = True) -> StrippedTextReader:
+    """Detect the page furniture of a PDF and strip it from its pages.
+
+    Furniture is detected from a sample of SAMPLE_PAGES pages spread over
+    the document; all other pages are only extracted when the parser reads
+    them. With cache set, the detected patterns are stored with the PDF
+    hash and later conversions skip the sample.
+
+    Args:
+        pdf: PdfReader object containing the PDF content.
+        cache: Whether to read and write the furniture cache.
+
+    Returns:
+        A reader whose pages return text without headers and footers.
+    """
+    digest = pdf_digest(pdf) if cache else None
+    if digest:
+        cached = load_cached(digest, "furniture")
+        if cached and cached.get("version") == FURNITURE_VERSION:
+            CACHE_REQUESTS.inc(cache="furniture", result="hit")
+            return StrippedTextReader(pdf, [tuple(p) for p in cached["patterns"]])
+        CACHE_REQUESTS.inc(cache="furniture", result="miss")
+
+    with timed("furniture"):
+        texts = {
+            index: pdf.pages[index].extract_text()
+            for index in sample_pages(len(pdf.pages))
+        }
+        patterns = detect_furniture(list(texts.values()))
+    store_cached(digest, "furniture", {"version": FURNITURE_VERSION, "patterns": patterns})
+    logger.info("Detected %d repeated header and footer lines", len(patterns))
+    return StrippedTextReader(pdf, patterns, texts)
@@ -0,0 +1,85 @@
+import logging
+import re
+from typing import Dict, Iterable, Optional, Set, Tuple, Union
+from unidecode import unidecode
+
+logger = logging.getLogger(__name__)
+
+SectionKey = Union[Tuple[str, str, str], str]
+
+# Citation keys as generated below, split into law ID and section suffix
+CITATION_KEY_PATTERN = re.compile(
+    r"([a-z0-9]+)(?:p\d+[a-z]?stk\d+(?:kap\d+(?:_\d+)?)?|_para\d+)(?:_\d+)?"
+)
+
+
+def make_law_id(document_title: str) -> str:
+    """Return the cleaned law ID used as prefix for citation keys."""
+    title_lower = unidecode(document_title).lower()
+    return re.sub(r"[^a-z0-9]+", "", title_lower)
+
+
+def make_citation_key(law_id: str, key: SectionKey) -> str:
+    """Return the citation key for a law section or a general paragraph.
+
+    Args:
+        law_id: Cleaned law ID.
+        key: (chapter, paragraph, section) tuple or general paragraph ID.
+
+    Returns:
+        Citation key, e.g. "konkurrencelovenp9stk2" or "vejledning_para1".
+    """
+    if isinstance(key, tuple):
+        _, paragraph, section = key
+        clean_para = "p" + paragraph.lower().replace(" ", "")
+        clean_section = section.lower().replace("stk. ", "stk").replace(".", "")
+        return f"{law_id}{clean_para}{clean_section}"
+    return f"{law_id}_{key}"
+
+
+def law_id_of_key(citation_key: str) -> Optional[str]:
+    """Return the law ID of a generated citation key, or None for other keys."""
+    match = CITATION_KEY_PATTERN.fullmatch(citation_key)
+    return match.group(1) if match else None
+
+
+def unique_citation_key(law_id: str, key: SectionKey, used: Set[str]) -> str:
+    """Return the citation key for a section, disambiguated against used keys.
+
+    Law sections only differ by chapter when a paragraph number repeats
+    (e.g. in an annex), so a clashing key gets the chapter appended
+    ("...p1stk1kap12"), and a number ("..._2") if it still clashes. The
+    returned key is added to used.
+    """
+    citation_key = make_citation_key(law_id, key)
+    if citation_key in used:
+        base = citation_key
+        if isinstance(key, tuple):
+            citation_key = base = f"{base}kap{key[0]}"
+        number = 2
+        while citation_key in used:
+            citation_key = f"{base}_{number}"
+            number += 1
+        logger.warning(
+            "Duplicate citation key %s, using %s", make_citation_key(law_id, key), citation_key
+        )
+    used.add(citation_key)
+    return citation_key
+
+
+def build_key_table(sections: Iterable[SectionKey], law_id: str) -> Dict[SectionKey, str]:
+    """Compute the citation key of every section of a document once.
+
+    Keys are assigned in document order, so the first of two clashing
+    sections keeps the plain key and the result is the same for every
+    writer and run.
+
+    Args:
+        sections: Section keys in document order.
+        law_id: Cleaned law ID.
+
+    Returns:
+        Dictionary mapping section keys to unique citation keys.
+    """
+    used: Set[str] = set()
+    return {key: unique_citation_key(law_id, key, used) for key in sections}
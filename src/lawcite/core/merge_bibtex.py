@@ -0,0 +1,199 @@
+import fcntl
+import json
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+from .keys import law_id_of_key
+from .metrics import CACHE_REQUESTS
+
+ENTRY_START_PATTERN = re.compile(rb"^@\s*\w+\s*\{\s*([^,\s]+)\s*,", re.MULTILINE)
+INDEX_VERSION = 1
+
+
+def index_path(bib_path: str) -> str:
+    """Return the path of the sidecar index for a BibTeX file."""
+    return f"{bib_path}.idx"
+
+
+def scan_bibtex_entries(data: bytes) -> Dict[str, Tuple[int, int]]:
+    """Find the byte span of each entry in BibTeX data.
+
+    Each span runs from the entry's "@" to the start of the next entry (or
+    the end of the data), so spans are contiguous and include separators.
+
+    Args:
+        data: Raw BibTeX file content.
+
+    Returns:
+        Dictionary mapping entry keys to (start, end) byte offsets.
+
+    Raises:
+        ValueError: If a key occurs more than once, since the entries sharing
+            it could not be told apart.
+    """
+    starts = [
+        (match.group(1).decode("utf-8"), match.start())
+        for match in ENTRY_START_PATTERN.finditer(data)
+    ]
+    entries: Dict[str, Tuple[int, int]] = {}
+    for i, (key, start) in enumerate(starts):
+        if key in entries:
+            raise ValueError(
+                f"Duplicate BibTeX key {key!r} at byte offsets {entries[key][0]} and {start}"
+            )
+        end = starts[i + 1][1] if i + 1 < len(starts) else len(data)
+        entries[key] = (start, end)
+    return entries
+
+
+def group_by_law(keys: List[str]) -> Dict[str, List[str]]:
+    """Group generated citation keys by law ID.
+
+    A key equal to the ID of a law with other entries (such as the parent
+    entry of --crossref output) belongs to that law. Keys not generated by
+    lawcite are left out.
+    """
+    laws: Dict[str, List[str]] = {}
+    for key in keys:
+        law_id = law_id_of_key(key)
+        if law_id:
+            laws.setdefault(law_id, []).append(key)
+    for key in keys:
+        if key in laws:
+            laws[key].insert(0, key)
+    return laws
+
+
+def load_bibtex_index(bib_path: str) -> Dict:
+    """Load the sidecar index of a BibTeX file, rebuilding it if stale.
+
+    The index is valid when the size and modification time recorded in it
+    match the BibTeX file; otherwise the file is rescanned once.
+
+    Returns:
+        Dictionary with "entries" (key -> [start, end]) and "laws"
+        (law ID -> list of keys) mappings. A rebuilt index groups the keys
+        by the law ID they were generated from.
+    """
+    if not os.path.exists(bib_path):
+        return {"entries": {}, "laws": {}}
+
+    stat = os.stat(bib_path)
+    try:
+        with open(index_path(bib_path), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if (
+            index.get("version") == INDEX_VERSION
+            and index.get("size") == stat.st_size
+            and index.get("mtime_ns") == stat.st_mtime_ns
+        ):
+            CACHE_REQUESTS.inc(cache="bibtex_index", result="hit")
+            return index
+    except (OSError, ValueError):
+        pass
+
+    CACHE_REQUESTS.inc(cache="bibtex_index", result="miss")
+    with open(bib_path, "rb") as f:
+        entries = scan_bibtex_entries(f.read())
+    return {
+        "entries": {k: list(v) for k, v in entries.items()},
+        "laws": group_by_law(list(entries)),
+    }
+
+
+@contextmanager
+def locked(bib_path: str) -> Iterator[None]:
+    """Hold an exclusive lock on a BibTeX file for concurrent writers."""
+    with open(f"{bib_path}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def upsert_bibtex_entries(
+    bib_path: str, law_id: str, entries: Dict[str, str], prune: bool = True
+) -> None:
+    """Replace or append the entries of one law in a shared BibTeX file.
+
+    Entries already in the file keep their position, entries previously
+    recorded for the law but no longer present are dropped (unless prune
+    is False, e.g. when only some chapters were converted), and new entries
+    are appended. Untouched entries are copied by byte offset without being
+    parsed. The file and its index are replaced atomically under a lock.
+
+    Args:
+        bib_path: Path of the master BibTeX file.
+        law_id: Cleaned law ID grouping the entries.
+        entries: Dictionary mapping entry keys to rendered BibTeX entries.
+        prune: Whether the law's entries missing from entries are dropped.
+    """
+    dir_path = os.path.dirname(bib_path)
+    if dir_path:
+        os.makedirs(dir_path, exist_ok=True)
+
+    with locked(bib_path):
+        index = load_bibtex_index(bib_path)
+        recorded = index["laws"].get(law_id, [])
+        stale = set(recorded) - set(entries) if prune else set()
+        data = b""
+        if os.path.exists(bib_path):
+            with open(bib_path, "rb") as f:
+                data = f.read()
+
+        spans = sorted(index["entries"].items(), key=lambda item: item[1][0])
+        chunks: List[bytes] = [data[: spans[0][1][0]] if spans else data]
+        new_entries: Dict[str, List[int]] = {}
+        offset = len(chunks[0])
+        pending = dict(entries)
+
+        def add(key: str, chunk: bytes) -> None:
+            nonlocal offset
+            chunks.append(chunk)
+            new_entries[key] = [offset, offset + len(chunk)]
+            offset += len(chunk)
+
+        for key, (start, end) in spans:
+            if key in pending:
+                add(key, pending.pop(key).rstrip("\n").encode("utf-8") + b"\n\n")
+            elif key not in stale:
+                add(key, data[start:end])
+        for key, text in pending.items():
+            add(key, text.rstrip("\n").encode("utf-8") + b"\n\n")
+
+        _write_atomic(bib_path, b"".join(chunks))
+
+        laws = {k: v for k, v in index["laws"].items() if k != law_id}
+        if prune:
+            laws[law_id] = list(entries)
+        else:
+            laws[law_id] = recorded + [key for key in entries if key not in recorded]
+        stat = os.stat(bib_path)
+        new_index = {
+            "version": INDEX_VERSION,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "entries": new_entries,
+            "laws": laws,
+        }
+        _write_atomic(
+            index_path(bib_path),
+            json.dumps(new_index, ensure_ascii=False).encode("utf-8"),
+        )
@@ -1,11 +1,21 @@
 from pypdf import PdfReader
-from typing import Dict
+from typing import Dict, Iterator, Tuple
+import logging
 import re
+from .metrics import PAGES
 
+logger = logging.getLogger(__name__)
 
-def parse_general_paragraphs(pdf: PdfReader) -> Dict[str, str]:
-    """Parse paragraphs from a general PDF, assigning incremental IDs."""
-    paragraph_content: Dict[str, str] = {}
+
+def iter_general_paragraphs(pdf: PdfReader) -> Iterator[Tuple[str, str]]:
+    """Yield paragraphs from a general PDF as they are completed.
+
+    Args:
+        pdf: PdfReader object containing the PDF content.
+
+    Yields:
+        Tuples of (paragraph ID, content) with incremental IDs.
+    """
     current_para_id = 0
     current_content = []
     in_body = False
@@ -17,6 +27,7 @@ def parse_general_paragraphs(pdf: PdfReader) -> Dict[str, str]:
 
     for page_num, page in enumerate(pdf.pages):
         text = page.extract_text()
+        PAGES.inc()
         if not text:
             continue
         lines = text.split("\n")
@@ -26,9 +37,9 @@ def parse_general_paragraphs(pdf: PdfReader) -> Dict[str, str]:
             if not line:
                 if current_content and in_body:
                     current_para_id += 1
-                    paragraph_content[f"para{current_para_id}"] = " ".join(
-                        current_content
-                    ).strip()
+                    content = " ".join(current_content).strip()
+                    if content:
+                        yield f"para{current_para_id}", content
                     current_content = []
                 continue
 
@@ -48,30 +59,25 @@ def parse_general_paragraphs(pdf: PdfReader) -> Dict[str, str]:
                 if line.endswith("."):
                     if i + 1 < len(lines):
                         next_line = lines[i + 1].strip()
-                        if next_line and not re.match(
-                            r"^\d+\.\s|^\d+\.\d+\.\s", next_line
-                        ):
+                        if next_line:
                             current_para_id += 1
-                            paragraph_content[f"para{current_para_id}"] = " ".join(
-                                current_content
-                            ).strip()
-                            current_content = []
-                        elif next_line and re.match(
-                            r"^\d+\.\s|^\d+\.\d+\.\s", next_line
-                        ):
-                            current_para_id += 1
-                            paragraph_content[f"para{current_para_id}"] = " ".join(
-                                current_content
-                            ).strip()
+                            content = " ".join(current_content).strip()
+                            if content:
+                                yield f"para{current_para_id}", content
                             current_content = []
 
     if current_content and in_body:
         current_para_id += 1
-        paragraph_content[f"para{current_para_id}"] = " ".join(current_content).strip()
+        content = " ".join(current_content).strip()
+        if content:
+            yield f"para{current_para_id}", content
+
 
-    paragraph_content = {k: v for k, v in paragraph_content.items() if v}
+def parse_general_paragraphs(pdf: PdfReader) -> Dict[str, str]:
+    """Parse paragraphs from a general PDF, assigning incremental IDs."""
+    paragraph_content = dict(iter_general_paragraphs(pdf))
 
     if not paragraph_content:
-        print("Warning: No paragraphs extracted from PDF")
+        logger.warning("No paragraphs extracted from PDF")
 
     return paragraph_content
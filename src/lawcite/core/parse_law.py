@@ -1,69 +1,150 @@
 from pypdf import PdfReader
-from typing import Dict, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 import re
+from .metrics import PAGES
 
+CHAPTER_PATTERN = re.compile(r"Kapitel (\d+)")
+PARAGRAPH_PATTERN = re.compile(r"§ (\d+\s*[a-zA-Z]?)\.\s*(.*)")
+SECTION_PATTERN = re.compile(r"Stk\. (\d+)\.\s*(.*)")
 
-def parse_law_paragraphs(pdf: PdfReader) -> Dict[Tuple[str, str, str], str]:
-    """Parse paragraphs, subsections, and chapters from a legal PDF.
+
+def new_parser_state() -> Dict[str, Any]:
+    """Return the parser state at the start of a legal document."""
+    return {
+        "chapter": None,
+        "paragraph": None,
+        "section": None,
+        "skip_next": False,
+        "part": 1,
+    }
+
+
+def section_chapter(state: Dict[str, Any]) -> str:
+    """Return the chapter part of the keys of sections started in state.
+
+    After the § numbering restarts (e.g. in an annex), the part number is
+    appended ("1_2"), so the later sections keep keys of their own.
+    """
+    chapter = state["chapter"] or "1"  # Default to chapter 1 if none detected
+    return chapter if state["part"] == 1 else f"{chapter}_{state['part']}"
+
+
+def chapter_number(chapter: str) -> str:
+    """Return the chapter number of a key's chapter part ("1_2" -> "1")."""
+    return chapter.partition("_")[0]
+
+
+def _paragraph_order(paragraph: str) -> Tuple[int, str]:
+    match = re.match(r"(\d+)(.*)", paragraph)
+    return int(match.group(1)), match.group(2).lower()
+
+
+def parse_law_lines(
+    lines: Iterable[str],
+    paragraph_content: Dict[Tuple[str, str, str], str],
+    state: Dict[str, Any],
+) -> List[Tuple[str, str, str]]:
+    """Parse lines of a legal PDF into paragraph_content, updating state in place.
+
+    § numbers increase through a law, so a § that does not come after the
+    previous one starts a new part of the document (see section_chapter)
+    instead of overwriting the earlier section with the same key.
 
     Args:
-        pdf: PdfReader object containing the PDF content.
+        lines: Text lines, typically from a single page.
+        paragraph_content: Dictionary collecting (chapter, paragraph, section) content.
+        state: Parser state as returned by new_parser_state().
 
     Returns:
-        Dictionary mapping (chapter, paragraph, section) tuples to content strings.
+        Keys of the paragraphs and subsections started within these lines.
+    """
+    started: List[Tuple[str, str, str]] = []
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        if state["skip_next"]:
+            state["skip_next"] = False
+            continue
+
+        # Detect chapter (e.g., "Kapitel 1")
+        chapter_match = CHAPTER_PATTERN.match(line)
+        if chapter_match:
+            state["chapter"] = chapter_match.group(1)
+            state["skip_next"] = True  # Skip the next line (chapter title)
+            continue
+
+        # Detect paragraph (e.g., "§ 1.", "§ 15a.", "§ 15 a.")
+        para_match = PARAGRAPH_PATTERN.match(line)
+        if para_match:
+            paragraph = para_match.group(1).replace(" ", "")
+            if state["paragraph"] and _paragraph_order(paragraph) <= _paragraph_order(
+                state["paragraph"]
+            ):
+                state["part"] += 1
+            state["paragraph"] = paragraph
+            state["section"] = "Stk. 1."
+            content = para_match.group(2).strip()
+            key = (section_chapter(state), state["paragraph"], state["section"])
+            paragraph_content[key] = content if content else " "
+            started.append(key)
+            continue
+
+        # Detect subsection (e.g., "Stk. 2.")
+        stk_match = SECTION_PATTERN.match(line)
+        if stk_match and state["paragraph"]:
+            state["section"] = f"Stk. {stk_match.group(1)}."
+            content = stk_match.group(2).strip()
+            key = (section_chapter(state), state["paragraph"], state["section"])
+            paragraph_content[key] = content if content else " "
+            started.append(key)
+            continue
+
+        # Append to current paragraph/section if applicable
+        if state["paragraph"] and state["section"]:
+            key = (section_chapter(state), state["paragraph"], state["section"])
+            if key in paragraph_content:
+                paragraph_content[key] += " " + line
+
+    return started
+
+
+def iter_law_paragraphs(pdf: PdfReader) -> Iterator[Tuple[Tuple[str, str, str], str]]:
+    """Yield (chapter, paragraph, section) keys and content from a legal PDF.
+
+    Sections are yielded as soon as they are complete, i.e. once a later
+    section has started, so callers can stream them without holding the
+    whole document.
+
+    Args:
+        pdf: PdfReader object containing the PDF content.
+
+    Yields:
+        Tuples of ((chapter, paragraph, section), content).
     """
     paragraph_content: Dict[Tuple[str, str, str], str] = {}
-    current_chapter = None
-    current_paragraph = None
-    current_section = None
-    skip_next = False
+    state = new_parser_state()
 
     for page in pdf.pages:
         text = page.extract_text()
-        lines = text.split("\n")
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            if skip_next:
-                skip_next = False
-                continue
-
-            # Detect chapter (e.g., "Kapitel 1")
-            chapter_match = re.match(r"Kapitel (\d+)", line)
-            if chapter_match:
-                current_chapter = chapter_match.group(1)
-                skip_next = True  # Skip the next line (chapter title)
-                continue
-
-            # Detect paragraph (e.g., "§ 1.", "§ 15a.", "§ 15 a.")
-            para_match = re.match(r"§ (\d+\s*[a-zA-Z]?)\.\s*(.*)", line)
-            if para_match:
-                current_paragraph = para_match.group(1).replace(" ", "")
-                current_section = "Stk. 1."
-                content = para_match.group(2).strip()
-                chapter = current_chapter or "1"  # Default to chapter 1 if none detected
-                key = (chapter, current_paragraph, current_section)
-                paragraph_content[key] = content if content else " "
-                continue
-
-            # Detect subsection (e.g., "Stk. 2.")
-            stk_match = re.match(r"Stk\. (\d+)\.\s*(.*)", line)
-            if stk_match and current_paragraph:
-                current_section = f"Stk. {stk_match.group(1)}."
-                content = stk_match.group(2).strip()
-                chapter = current_chapter or "1"
-                key = (chapter, current_paragraph, current_section)
-                paragraph_content[key] = content if content else " "
-                continue
-
-            # Append to current paragraph/section if applicable
-            if current_paragraph and current_section:
-                chapter = current_chapter or "1"
-                key = (chapter, current_paragraph, current_section)
-                if key in paragraph_content:
-                    paragraph_content[key] += " " + line
-
-    return paragraph_content
+        PAGES.inc()
+        parse_law_lines(text.split("\n"), paragraph_content, state)
+        current = (section_chapter(state), state["paragraph"], state["section"])
+        for key in [k for k in paragraph_content if k != current]:
+            yield key, paragraph_content.pop(key)
+
+    yield from paragraph_content.items()
+
+
+def parse_law_paragraphs(pdf: PdfReader) -> Dict[Tuple[str, str, str], str]:
+    """Parse paragraphs, subsections, and chapters from a legal PDF.
+
+    Args:
+        pdf: PdfReader object containing the PDF content.
+
+    Returns:
+        Dictionary mapping (chapter, paragraph, section) tuples to content strings.
+    """
+    return dict(iter_law_paragraphs(pdf))
@@ -0,0 +1,197 @@
+import io
+import logging
+import re
+import requests
+from pypdf import PdfReader, PageObject
+from pypdf.errors import PdfReadError
+from pypdf.generic import NameObject
+from typing import Dict, Optional
+from .extract_metadata import metadata_from_first_page
+from .fetch_pdf import check_pdf_response
+from .metrics import BYTES_FETCHED
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 64 * 1024
+
+
+class RangeFile(io.RawIOBase):
+    """Read-only, seekable file whose content is fetched with HTTP Range requests.
+
+    Content is fetched in blocks of block_size bytes, which are cached, so
+    a PdfReader only downloads the parts of the file it actually reads.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        size: int,
+        session: Optional[requests.Session] = None,
+        block_size: int = BLOCK_SIZE,
+    ):
+        super().__init__()
+        self.url = url
+        self.size = size
+        self.session = session or requests.Session()
+        self.block_size = block_size
+        self.blocks: Dict[int, bytes] = {}
+        self.position = 0
+        self.bytes_fetched = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self.position = offset
+        elif whence == io.SEEK_CUR:
+            self.position += offset
+        elif whence == io.SEEK_END:
+            self.position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if self.position < 0:
+            raise OSError("Negative seek position")
+        return self.position
+
+    def _fetch(self, first_block: int, last_block: int) -> None:
+        """Fetch a run of missing blocks with a single Range request."""
+        start = first_block * self.block_size
+        end = min((last_block + 1) * self.block_size, self.size) - 1
+        response = self.session.get(
+            self.url, headers={"Range": f"bytes={start}-{end}"}, timeout=10
+        )
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise OSError(f"Server ignored Range request for {self.url}")
+        data = response.content
+        self.bytes_fetched += len(data)
+        BYTES_FETCHED.inc(len(data))
+        for block in range(first_block, last_block + 1):
+            offset = (block - first_block) * self.block_size
+            self.blocks[block] = data[offset : offset + self.block_size]
+
+    def readinto(self, buffer) -> int:
+        if self.position >= self.size:
+            return 0
+        end = min(self.position + len(buffer), self.size)
+        first_block = self.position // self.block_size
+        last_block = (end - 1) // self.block_size
+
+        missing = None
+        for block in range(first_block, last_block + 2):
+            if block <= last_block and block not in self.blocks:
+                missing = block if missing is None else missing
+            elif missing is not None:
+                self._fetch(missing, block - 1)
+                missing = None
+
+        data = b"".join(self.blocks[b] for b in range(first_block, last_block + 1))
+        offset = self.position - first_block * self.block_size
+        chunk = data[offset : offset + end - self.position]
+        buffer[: len(chunk)] = chunk
+        self.position += len(chunk)
+        return len(chunk)
+
+
+def open_remote_pdf(
+    input_url: str,
+    session: Optional[requests.Session] = None,
+    block_size: int = BLOCK_SIZE,
+) -> PdfReader:
+    """Open a remote PDF, reading only the parts that are accessed.
+
+    The first block is requested with a Range header. If the server answers
+    with partial content, the PDF is backed by a RangeFile; otherwise the
+    full response is used as a regular download.
+
+    Raises:
+        requests.RequestException: If the request fails.
+        ValueError: If the URL does not return a PDF.
+    """
+    session = session or requests.Session()
+    response = session.get(
+        input_url, headers={"Range": f"bytes=0-{block_size - 1}"}, timeout=10
+    )
+    check_pdf_response(response)
+    BYTES_FETCHED.inc(len(response.content))
+
+    content_range = re.match(
+        r"bytes \d+-\d+/(\d+)", response.headers.get("Content-Range", "")
+    )
+    if response.status_code != 206 or not content_range:
+        logger.info(
+            "Server does not support range requests, downloaded %s", input_url
+        )
+        return PdfReader(io.BytesIO(response.content))
+
+    remote = RangeFile(input_url, int(content_range.group(1)), session, block_size)
+    remote.blocks[0] = response.content
+    remote.bytes_fetched = len(response.content)
+    try:
+        # Strict mode skips the validation pass that seeks to every object
+        return PdfReader(remote, strict=True)
+    except PdfReadError:
+        return PdfReader(remote)
+
+
+INHERITABLE_PAGE_ATTRIBUTES = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")
+
+
+def first_page(pdf: PdfReader) -> PageObject:
+    """Return the first page by walking down the page tree.
+
+    Unlike pdf.pages[0], this only loads the page tree nodes on the path to
+    the first page instead of every page object in the document.
+    """
+    node = pdf.trailer["/Root"]["/Pages"]
+    reference = pdf.trailer["/Root"].raw_get("/Pages")
+    inherited = {}
+    while "/Kids" in node:
+        for name in INHERITABLE_PAGE_ATTRIBUTES:
+            if name in node:
+                inherited[name] = node.raw_get(name)
+        reference = node["/Kids"][0].indirect_reference
+        node = node["/Kids"][0].get_object()
+
+    page = PageObject(pdf, reference)
+    page.update(node)
+    for name, value in inherited.items():
+        if name not in page:
+            page[NameObject(name)] = value
+    return page
+
+
+def probe_metadata(
+    input_url: str,
+    session: Optional[requests.Session] = None,
+    block_size: int = BLOCK_SIZE,
+) -> tuple[str, str, str, str]:
+    """Extract metadata from a remote PDF without downloading all of it.
+
+    Only the trailer, cross-reference data, info dictionary and first page
+    are fetched when the server supports Range requests.
+
+    Returns:
+        Tuple of (document_url, document_date, document_author, document_title),
+        as returned by extract_metadata.
+    """
+    pdf = open_remote_pdf(input_url, session, block_size)
+    metadata = metadata_from_first_page(
+        first_page(pdf).extract_text(), pdf.metadata, input_url
+    )
+    if isinstance(pdf.stream, RangeFile):
+        logger.info(
+            "Fetched %d of %d bytes from %s",
+            pdf.stream.bytes_fetched,
+            pdf.stream.size,
+            input_url,
+            extra={"url": input_url, "bytes_fetched": pdf.stream.bytes_fetched},
+        )
+    return metadata
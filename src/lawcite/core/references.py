@@ -0,0 +1,195 @@
+import json
+import re
+from typing import Dict, List, Tuple
+
+Key = Tuple[str, str, str]
+
+# A paragraph number with an optional letter, either attached ("12a") or
+# separated by a space and followed by punctuation, "stk." or a list
+# separator ("12 a, stk. 2"), so "§ 9 i denne lov" is § 9.
+PARAGRAPH_NUMBER = (
+    r"\d+(?:[a-z](?![a-zæøå])"
+    r"|\s[a-z](?=\s*(?:[.,;:)]|stk\.|og\b|eller\b|-|–|$)))?"
+)
+PARAGRAPH_LIST = rf"{PARAGRAPH_NUMBER}(?:\s*(?:,|og|eller|-|–)\s*{PARAGRAPH_NUMBER})+"
+SECTION_LIST = r"\d+(?:\s*(?:,|og|-|–)\s*\d+)*"
+
+# "§ 12", "§ 12 a", "§§ 12", optionally followed by ", stk. 2" / "stk. 2 og 3",
+# lists and ranges of paragraphs such as "§§ 3-5" or "§§ 3 og 4", or a
+# stand-alone "stk. 1" referring to the current paragraph.
+REFERENCE_PATTERN = re.compile(
+    rf"§§\s*(?P<paragraph_list>{PARAGRAPH_LIST})"
+    rf"(?:\s*,?\s*stk\.\s*(?P<list_sections>{SECTION_LIST}))?"
+    rf"|§§?\s*(?P<paragraph>{PARAGRAPH_NUMBER})"
+    rf"(?:\s*,?\s*stk\.\s*(?P<paragraph_sections>{SECTION_LIST}))?"
+    rf"|\bstk\.\s*(?P<sections>{SECTION_LIST})",
+    re.IGNORECASE,
+)
+# A reference followed by the law it is in, e.g. "§ 2 i lov om finansiel
+# virksomhed", "§ 5, stk. 2, i straffeloven" or "§ 3 i bekendtgørelse nr. 12",
+# cites another law. "i denne lov" and "i loven" refer to the document itself.
+OTHER_LAW_PATTERN = re.compile(
+    r"\s*,?\s*i\s+(?:(?:lov|lovbekendtgørelse|bekendtgørelse|forordning|direktiv)\b"
+    r"|[a-zæøå-]+loven\b)",
+    re.IGNORECASE,
+)
+
+
+def _section_numbers(text: str) -> List[int]:
+    """Expand a list of Stk. numbers such as "2", "2 og 3" or "1-3"."""
+    numbers: List[int] = []
+    for part in re.split(r"\s*(?:,|og|eller)\s*", text):
+        bounds = [int(n) for n in re.findall(r"\d+", part)]
+        if len(bounds) == 2:
+            numbers.extend(range(bounds[0], bounds[1] + 1))
+        else:
+            numbers.extend(bounds)
+    return numbers
+
+
+def _paragraph_numbers(text: str) -> List[str]:
+    """Expand a list of paragraph numbers such as "3 og 4", "3-5" or "3, 4 a"."""
+    numbers: List[str] = []
+    for part in re.split(r"\s*(?:,|og|eller)\s*", text, flags=re.IGNORECASE):
+        bounds = [bound.replace(" ", "") for bound in re.split(r"\s*[-–]\s*", part)]
+        if len(bounds) == 2 and bounds[0].isdigit() and bounds[1].isdigit():
+            numbers.extend(str(n) for n in range(int(bounds[0]), int(bounds[1]) + 1))
+        else:
+            numbers.extend(bound for bound in bounds if bound)
+    return numbers
+
+
+def find_references(
+    text: str, source: Key, paragraphs: Dict[str, List[Key]]
+) -> List[Key]:
+    """Resolve the § and Stk. references in a section text to section keys.
+
+    A reference to a whole paragraph resolves to all of its sections, and a
+    stand-alone "stk. N" refers to the paragraph of the source section.
+    References naming another law ("§ 5 i straffeloven", "§ 2 i lov om
+    ...") and references to paragraphs not in the document are ignored.
+
+    Args:
+        text: Text of the citing section.
+        source: Key of the citing section.
+        paragraphs: Dictionary mapping paragraph numbers to their section keys.
+
+    Returns:
+        Referenced section keys in order of appearance, without duplicates
+        or self-references.
+    """
+    targets: List[Key] = []
+    for match in REFERENCE_PATTERN.finditer(text):
+        if match.group("sections") is None and OTHER_LAW_PATTERN.match(text, match.end()):
+            continue
+        if match.group("paragraph_list"):
+            # A trailing "stk." applies to the last paragraph of the list
+            numbers = _paragraph_numbers(match.group("paragraph_list"))
+            references = [(number, None) for number in numbers[:-1]]
+            references.append((numbers[-1], match.group("list_sections")))
+        elif match.group("paragraph"):
+            references = [
+                (match.group("paragraph").replace(" ", ""), match.group("paragraph_sections"))
+            ]
+        else:
+            references = [(source[1], match.group("sections"))]
+        for paragraph, sections in references:
+            keys = paragraphs.get(paragraph, [])
+            if sections:
+                wanted = {f"Stk. {n}." for n in _section_numbers(sections)}
+                keys = [key for key in keys if key[2] in wanted]
+            for key in keys:
+                if key != source and key not in targets:
+                    targets.append(key)
+    return targets
+
+
+def build_reference_graph(paragraph_content: Dict[Key, str]) -> Dict[Key, List[Key]]:
+    """Build the cross-reference graph between the sections of a law.
+
+    Args:
+        paragraph_content: Dictionary mapping (chapter, paragraph, section)
+            tuples to content strings.
+
+    Returns:
+        Adjacency index mapping each citing section to the sections it
+        references. Sections without references are omitted.
+    """
+    paragraphs: Dict[str, List[Key]] = {}
+    for key in paragraph_content:
+        paragraphs.setdefault(key[1], []).append(key)
+
+    graph: Dict[Key, List[Key]] = {}
+    for key, content in paragraph_content.items():
+        targets = find_references(content, key, paragraphs)
+        if targets:
+            graph[key] = targets
+    return graph
+
+
+def invert_graph(graph: Dict[Key, List[Key]]) -> Dict[Key, List[Key]]:
+    """Return the backlink index mapping each section to the sections citing it."""
+    backlinks: Dict[Key, List[Key]] = {}
+    for source, targets in graph.items():
+        for target in targets:
+            backlinks.setdefault(target, []).append(source)
+    return backlinks
+
+
+def graph_to_json(
+    graph: Dict[Key, List[Key]], law_id: str, keys: Dict[Key, str]
+) -> str:
+    """Export a reference graph as JSON with citation keys as node IDs.
+
+    Args:
+        graph: Adjacency index as returned by build_reference_graph.
+        law_id: Cleaned law ID.
+        keys: Citation key table of the document (see build_key_table).
+    """
+    nodes: Dict[str, None] = {}
+    edges: List[List[str]] = []
+    for source, targets in graph.items():
+        source_id = keys[source]
+        nodes[source_id] = None
+        for target in targets:
+            target_id = keys[target]
+            nodes[target_id] = None
+            edges.append([source_id, target_id])
+    return json.dumps(
+        {"law_id": law_id, "nodes": list(nodes), "edges": edges},
+        ensure_ascii=False,
+        indent=2,
+    )
+
+
+def graph_to_dot(
+    graph: Dict[Key, List[Key]], law_id: str, keys: Dict[Key, str]
+) -> str:
+    """Export a reference graph in Graphviz DOT format, like graph_to_json."""
+    lines = [f'digraph "{law_id}" {{']
+    labels: Dict[str, str] = {}
+    edges: List[str] = []
+    for source, targets in graph.items():
+        for key in [source] + targets:
+            labels.setdefault(keys[key], f"§ {key[1]} {key[2]}")
+        for target in targets:
+            edges.append(f'  "{keys[source]}" -> "{keys[target]}";')
+    lines.extend(f'  "{node}" [label="{label}"];' for node, label in labels.items())
+    lines.extend(edges)
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def save_graph(
+    graph: Dict[Key, List[Key]],
+    law_id: str,
+    keys: Dict[Key, str],
+    output_filename: str,
+) -> None:
+    """Write a reference graph as DOT (.dot/.gv) or JSON (any other suffix)."""
+    if output_filename.endswith((".dot", ".gv")):
+        text = graph_to_dot(graph, law_id, keys)
+    else:
+        text = graph_to_json(graph, law_id, keys)
+    with open(output_filename, "w", encoding="utf-8") as f:
+        f.write(text)
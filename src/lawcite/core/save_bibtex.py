@@ -1,11 +1,78 @@
 import bibtexparser as bp
-import re
-from unidecode import unidecode
 import os
+import logging
 import yaml
-from typing import Dict
-from .create_bibtex import create_law_bibtex, create_general_bibtex
-from .save_md import save_markdown
+from typing import Dict, Optional
+from .create_bibtex import create_law_bibtex, create_general_bibtex, create_crossref_bibtex
+from .save_md import save_markdown, save_markdown_chunks
+from .merge_bibtex import upsert_bibtex_entries
+from .save_jsonl import is_jsonl, save_jsonl
+from .keys import build_key_table, make_law_id
+from .shard import shard_filename, split_sections, write_shard_index
+
+logger = logging.getLogger(__name__)
+
+
+def create_bibtex(
+    paragraph_content: Dict,
+    document_title: str,
+    document_author: str,
+    document_url: str,
+    document_date: str,
+    keys: Optional[Dict] = None,
+    crossref: bool = False,
+    crossref_parent: bool = True,
+) -> bp.bibdatabase.BibDatabase:
+    """Create BibTeX entries for a legal or general document.
+
+    With crossref, create compact BibLaTeX entries that inherit the shared
+    fields from one parent entry (see create_crossref_bibtex), which is
+    left out if crossref_parent is False.
+    """
+    if crossref:
+        return create_crossref_bibtex(paragraph_content, document_title, document_author, document_url, document_date, keys, crossref_parent)
+    if isinstance(paragraph_content, dict) and all(isinstance(k, tuple) and len(k) == 3 for k in paragraph_content):
+        return create_law_bibtex(paragraph_content, document_title, document_author, document_url, document_date, keys)
+    return create_general_bibtex(paragraph_content, document_title, document_author, document_url, document_date, keys)
+
+
+def create_hayagriva(
+    paragraph_content: Dict,
+    document_title: str,
+    document_author: str,
+    document_url: str,
+    document_date: str,
+    keys: Optional[Dict] = None,
+) -> Dict[str, Dict]:
+    """Create Hayagriva YAML entries for a legal or general document."""
+    if keys is None:
+        keys = build_key_table(paragraph_content, make_law_id(document_title))
+    entries = {}
+    for key, content in paragraph_content.items():
+        if isinstance(key, tuple) and len(key) == 3:  # Law: (chapter, paragraph, section)
+            _, para, sec = key
+            author = [f"{document_title.capitalize()} §{para} {sec}"]
+        else:  # General: para_id
+            author = [f"{document_title.capitalize()} Paragraph {key}"]
+        entries[keys[key]] = {
+            "type": "Article",
+            "title": content,
+            "author": author,
+            "publisher": document_author,
+            "url": document_url,
+            "date": document_date,
+        }
+    return entries
+
+
+def render_bibtex_entries(bib_database: bp.bibdatabase.BibDatabase) -> Dict[str, str]:
+    """Render each entry of a BibTeX database separately, keyed by entry ID."""
+    rendered = {}
+    for entry in bib_database.entries:
+        single = bp.bibdatabase.BibDatabase()
+        single.entries = [entry]
+        rendered[entry["ID"]] = bp.dumps(single)
+    return rendered
 
 
 def save_bibtex(
@@ -15,8 +82,16 @@ def save_bibtex(
     document_url: str,
     document_date: str,
     output_filename: str = "__temp.bib",
+    merge_into: str = None,
+    chunk_size: int = None,
+    chunk_unit: str = "chars",
+    shard: str = None,
+    keys: Optional[Dict] = None,
+    crossref: bool = False,
+    partial: bool = False,
+    crossref_parent: bool = True,
 ) -> None:
-    """Save bibliography entries to a file in BibTeX, YAML, or Markdown format.
+    """Save bibliography entries to a file in BibTeX, YAML, Markdown, or JSON Lines format.
 
     Args:
         paragraph_content: Dictionary of paragraph content.
@@ -25,43 +100,96 @@ def save_bibtex(
         document_url: URL of the document.
         document_date: Date of the document.
         output_filename: Output file path, determines format by extension.
+        merge_into: If given, upsert the BibTeX entries into this shared
+            bibliography instead of writing output_filename.
+        chunk_size: If given, split Markdown output into chunks of at most
+            this many chunk_unit ("chars" or "tokens").
+        shard: If given ("chapter" or "size=N"), split BibTeX or YAML output
+            into shard files listed in "<name>.shards.json".
+        keys: Citation key table of the document (see build_key_table),
+            computed once here and shared by all writers if not given.
+        crossref: If True, write compact BibLaTeX entries that crossref one
+            parent entry per document.
+        partial: If True, paragraph_content is only a selection of the
+            document, so merging keeps the document's other entries.
+        crossref_parent: If False, leave the crossref parent entry out of
+            BibTeX output. Sharded BibTeX output writes the parent once, to
+            "<name>.parent.bib", so loading several shards does not
+            duplicate its key.
     """
-    # Generate law ID
-    title_lower = unidecode(document_title).lower()
-    clean_title = re.sub(r"[^a-z0-9]+", "", title_lower)
-    law_id = clean_title
+    law_id = make_law_id(document_title)
+    if keys is None:
+        keys = build_key_table(paragraph_content, law_id)
 
-    if output_filename.endswith(('.yaml', '.yml')):
+    if merge_into:
+        bib_database = create_bibtex(paragraph_content, document_title, document_author, document_url, document_date, keys, crossref)
+        upsert_bibtex_entries(
+            merge_into, law_id, render_bibtex_entries(bib_database), prune=not partial
+        )
+        logger.info(
+            "Merged %d BibTeX entries into %s", len(bib_database.entries), merge_into
+        )
+    elif shard:
+        # Save one file per shard plus an index of the shards
+        if not output_filename.endswith(('.bib', '.yaml', '.yml')):
+            raise ValueError("Sharding is only supported for BibTeX and YAML output")
+        shards = split_sections(paragraph_content, shard)
+        parent_filename = None
+        if crossref and output_filename.endswith('.bib'):
+            parent_filename = shard_filename(output_filename, "parent")
+            save_bibtex({}, document_title, document_author, document_url, document_date, parent_filename, keys=keys, crossref=True)
+        for name, content in shards:
+            save_bibtex(
+                content,
+                document_title,
+                document_author,
+                document_url,
+                document_date,
+                shard_filename(output_filename, name),
+                keys=keys,
+                crossref=crossref,
+                crossref_parent=parent_filename is None,
+            )
+        index_filename = write_shard_index(output_filename, law_id, document_title, shards, keys, parent_filename)
+        logger.info("Written %d shards listed in %s", len(shards), index_filename)
+    elif output_filename.endswith(('.yaml', '.yml')):
         # Save in Hayagriva YAML format
-        entries = {}
-        # Paragraph entries
-        for key, content in paragraph_content.items():
-            if isinstance(key, tuple) and len(key) == 3:  # Law: (chapter, paragraph, section)
-                chapter, para, sec = key
-                clean_chapter = chapter.lower().replace(" ", "")
-                clean_para = "p" + para.lower().replace(" ", "")
-                clean_sec = sec.lower().replace("stk. ", "stk").replace(".", "")
-                para_id = f"{law_id}{clean_para}{clean_sec}"
-                short_title = f"§{para} {sec}"
-                author = [f"{document_title.capitalize()} {short_title}"]
-            else:  # General: para_id
-                para_id = f"{law_id}_{key}"
-                author = [f"{document_title.capitalize()} Paragraph {key}"]
-            entries[para_id] = {
-                "type": "Article",
-                "title": content,
-                "author": author,
-                "publisher": document_author,
-                "url": document_url,
-                "date": document_date,
-            }
+        entries = create_hayagriva(
+            paragraph_content, document_title, document_author, document_url, document_date, keys
+        )
         # Ensure directory exists
         dir_path = os.path.dirname(output_filename)
         if dir_path:
             os.makedirs(dir_path, exist_ok=True)
         with open(output_filename, "w", encoding="utf-8") as f:
             yaml.dump(entries, f, default_flow_style=False, allow_unicode=True)
-        print(f"Written Hayagriva YAML output to {output_filename}")
+        logger.info("Written Hayagriva YAML output to %s", output_filename)
+    elif is_jsonl(output_filename):
+        # Save in JSON Lines format, one record per section
+        save_jsonl(
+            paragraph_content.items(),
+            document_title,
+            document_author,
+            document_url,
+            document_date,
+            law_id,
+            output_filename,
+            keys,
+        )
+    elif output_filename.endswith('.md') and chunk_size:
+        # Save in chunked Markdown format
+        save_markdown_chunks(
+            paragraph_content,
+            document_title,
+            document_author,
+            document_url,
+            document_date,
+            law_id,
+            output_filename,
+            chunk_size,
+            chunk_unit,
+            keys,
+        )
     elif output_filename.endswith('.md'):
         # Save in Markdown format
         save_markdown(
@@ -75,12 +203,9 @@ def save_bibtex(
         )
     else:
         # Save in BibTeX format
-        if isinstance(paragraph_content, dict) and all(isinstance(k, tuple) and len(k) == 3 for k in paragraph_content):
-            bib_database = create_law_bibtex(paragraph_content, document_title, document_author, document_url, document_date)
-        else:
-            bib_database = create_general_bibtex(paragraph_content, document_title, document_author, document_url, document_date)
+        bib_database = create_bibtex(paragraph_content, document_title, document_author, document_url, document_date, keys, crossref, crossref_parent)
         if not output_filename:
-            filename = f"{clean_title}.bib"
+            filename = f"{law_id}.bib"
         else:
             filename = output_filename
         dir_path = os.path.dirname(filename)
@@ -88,4 +213,4 @@ def save_bibtex(
             os.makedirs(dir_path, exist_ok=True)
         with open(filename, "w", encoding="utf-8") as bib_file:
             bp.dump(bib_database, bib_file)
-        print(f"Written BibTeX output to {filename}")
+        logger.info("Written BibTeX output to %s", filename)
@@ -0,0 +1,123 @@
+import gzip
+import json
+import logging
+import os
+from typing import IO, Any, Dict, Iterable, Iterator, Optional, Set, Tuple, Union
+from .keys import unique_citation_key
+
+logger = logging.getLogger(__name__)
+
+JSONL_SUFFIXES = (".jsonl", ".jsonl.gz", ".jsonl.zst")
+
+
+def is_jsonl(output_filename: str) -> bool:
+    """Return True if the output filename selects JSON Lines output."""
+    return output_filename.endswith(JSONL_SUFFIXES)
+
+
+def open_jsonl(output_filename: str) -> IO[str]:
+    """Open a JSON Lines file for writing, compressed according to its suffix.
+
+    Raises:
+        ImportError: If zstd compression is requested but zstandard is missing.
+    """
+    dir_path = os.path.dirname(output_filename)
+    if dir_path:
+        os.makedirs(dir_path, exist_ok=True)
+    if output_filename.endswith(".gz"):
+        return gzip.open(output_filename, "wt", encoding="utf-8")
+    if output_filename.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "zstd output requires the zstandard package (pip install lawcite[zstd])"
+            ) from e
+        return zstandard.open(output_filename, "wt", encoding="utf-8")
+    return open(output_filename, "w", encoding="utf-8")
+
+
+def iter_jsonl_records(
+    sections: Iterable[Tuple[Union[Tuple[str, str, str], str], str]],
+    document_title: str,
+    document_author: str,
+    document_url: str,
+    document_date: str,
+    law_id: str,
+    keys: Optional[Dict] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield one JSON Lines record per section.
+
+    Args:
+        sections: Iterable of (key, content) pairs, where key is a
+            (chapter, paragraph, section) tuple or a general paragraph ID.
+        document_title: Title of the document.
+        document_author: Author of the document.
+        document_url: URL of the document.
+        document_date: Date of the document.
+        law_id: Cleaned law ID.
+        keys: Citation key table of the document. If not given, keys are
+            assigned as the sections arrive, as build_key_table would.
+
+    Yields:
+        Record dictionaries in section order.
+    """
+    used: Set[str] = set()
+    for key, content in sections:
+        if isinstance(key, tuple):
+            chapter, paragraph, section = key
+        else:
+            chapter, paragraph, section = None, key, None
+        yield {
+            "law_id": law_id,
+            "document": document_title,
+            "author": document_author,
+            "chapter": chapter,
+            "paragraph": paragraph,
+            "section": section,
+            "key": keys[key] if keys is not None else unique_citation_key(law_id, key, used),
+            "text": content,
+            "url": document_url,
+            "date": document_date,
+        }
+
+
+def save_jsonl(
+    sections: Iterable[Tuple[Union[Tuple[str, str, str], str], str]],
+    document_title: str,
+    document_author: str,
+    document_url: str,
+    document_date: str,
+    law_id: str,
+    output_filename: str,
+    keys: Optional[Dict] = None,
+) -> int:
+    """Write sections to a JSON Lines file, one record per section.
+
+    Records are written as the sections are produced, so a streaming parser
+    never has to build the whole document in memory.
+
+    Args:
+        sections: Iterable of (key, content) pairs, where key is a
+            (chapter, paragraph, section) tuple or a general paragraph ID.
+        document_title: Title of the document.
+        document_author: Author of the document.
+        document_url: URL of the document.
+        document_date: Date of the document.
+        law_id: Cleaned law ID.
+        output_filename: Output file path (.jsonl, .jsonl.gz or .jsonl.zst).
+        keys: Citation key table of the document, if already computed.
+
+    Returns:
+        Number of records written.
+    """
+    count = 0
+    records = iter_jsonl_records(
+        sections, document_title, document_author, document_url, document_date, law_id, keys
+    )
+    with open_jsonl(output_filename) as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    logger.info("Written JSON Lines output to %s", output_filename)
+    return count
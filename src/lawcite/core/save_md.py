@@ -1,32 +1,45 @@
+import json
+import logging
 import os
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
+from .keys import build_key_table
+from .select_law import paragraph_number
 
+logger = logging.getLogger(__name__)
 
-def save_markdown(
-    paragraph_content: Dict,
-    document_title: str,
-    document_author: str,
-    document_url: str,
-    document_date: str,
-    law_id: str,
-    output_filename: str,
-) -> None:
-    """Save the full document text to a Markdown file, structured for LLM input.
+
+def law_sort_key(key: Tuple[str, str, str]) -> Tuple[int, int, int, str, int]:
+    """Return a key sorting law sections numerically (§ 2 before § 10, Stk. 2 before Stk. 10).
+
+    Sections after a restart of the § numbering ("1_2" chapters, see
+    parse_law.section_chapter) sort after the sections before it.
+    """
+    chapter, paragraph, section = key
+    chapter, _, part = chapter.partition("_")
+    return (
+        int(part or 1),
+        paragraph_number(chapter),
+        paragraph_number(paragraph),
+        paragraph,
+        paragraph_number(section.removeprefix("Stk. ")),
+    )
+
+
+def render_markdown(paragraph_content: Dict, document_title: str) -> str:
+    """Render the full document text as Markdown, structured for LLM input.
 
     Args:
         paragraph_content: Dictionary of paragraph content.
         document_title: Title of the document.
-        document_author: Author of the document.
-        document_url: URL of the document.
-        document_date: Date of the document.
-        law_id: Cleaned law ID.
-        output_filename: Output file path.
+
+    Returns:
+        Markdown text of the document.
     """
     md_content = f"# {document_title}\n\n"
 
     if isinstance(paragraph_content, dict) and all(isinstance(k, tuple) and len(k) == 3 for k in paragraph_content):
         # Law: sort by chapter, paragraph, section
-        sorted_keys = sorted(paragraph_content.keys(), key=lambda x: (int(x[0]), x[1], x[2]))
+        sorted_keys = sorted(paragraph_content.keys(), key=law_sort_key)
         current_chapter = None
         current_paragraph = None
         for key in sorted_keys:
@@ -46,10 +59,188 @@ def save_markdown(
             para_num = key.replace('para', '')
             md_content += f"### Paragraph {para_num}\n\n{paragraph_content[key]}\n\n"
 
+    return md_content
+
+
+def save_markdown(
+    paragraph_content: Dict,
+    document_title: str,
+    document_author: str,
+    document_url: str,
+    document_date: str,
+    law_id: str,
+    output_filename: str,
+) -> None:
+    """Save the full document text to a Markdown file, structured for LLM input.
+
+    Args:
+        paragraph_content: Dictionary of paragraph content.
+        document_title: Title of the document.
+        document_author: Author of the document.
+        document_url: URL of the document.
+        document_date: Date of the document.
+        law_id: Cleaned law ID.
+        output_filename: Output file path.
+    """
+    md_content = render_markdown(paragraph_content, document_title)
+
     # Ensure directory exists
     dir_path = os.path.dirname(output_filename)
     if dir_path:
         os.makedirs(dir_path, exist_ok=True)
     with open(output_filename, "w", encoding="utf-8") as f:
         f.write(md_content)
-    print(f"Written Markdown output to {output_filename}")
+    logger.info("Written Markdown output to %s", output_filename)
+
+
+def estimate_size(text: str, unit: str = "chars") -> int:
+    """Return the size of text in characters or approximate tokens.
+
+    Tokens are estimated as one token per four characters.
+    """
+    return _size_of_length(len(text), unit)
+
+
+def _size_of_length(length: int, unit: str) -> int:
+    if unit == "tokens":
+        return -(-length // 4)
+    if unit == "chars":
+        return length
+    raise ValueError(f"Unknown chunk unit: {unit!r} (expected 'chars' or 'tokens')")
+
+
+def _chunk_filename(output_filename: str, number: int) -> str:
+    base, ext = os.path.splitext(output_filename)
+    return f"{base}.{number:03d}{ext or '.md'}"
+
+
+def save_markdown_chunks(
+    paragraph_content: Dict,
+    document_title: str,
+    document_author: str,
+    document_url: str,
+    document_date: str,
+    law_id: str,
+    output_filename: str,
+    chunk_size: int,
+    chunk_unit: str = "chars",
+    keys: Optional[Dict] = None,
+) -> List[str]:
+    """Save the document text as Markdown chunks within a size budget.
+
+    Sections (Stk.) or general paragraphs are never split; a chunk is closed
+    when the next section would exceed the budget, so a single oversized
+    section gets a chunk of its own. Each chunk starts with the document
+    title and a breadcrumb of the chapter and § it continues from. Chunks
+    are written as "<name>.001.md", "<name>.002.md", ... next to a
+    "<name>.chunks.json" manifest, which records the citation keys of the
+    first and last section of each chunk.
+
+    Args:
+        paragraph_content: Dictionary of paragraph content.
+        document_title: Title of the document.
+        document_author: Author of the document.
+        document_url: URL of the document.
+        document_date: Date of the document.
+        law_id: Cleaned law ID.
+        output_filename: Output file path used to name the chunks.
+        chunk_size: Maximum chunk size in chunk_unit.
+        chunk_unit: "chars" or "tokens".
+        keys: Citation key table of the document (see build_key_table),
+            computed here if not given.
+
+    Returns:
+        List of written chunk file paths.
+    """
+    estimate_size("", chunk_unit)
+    if keys is None:
+        keys = build_key_table(paragraph_content, law_id)
+    dir_path = os.path.dirname(output_filename)
+    if dir_path:
+        os.makedirs(dir_path, exist_ok=True)
+
+    is_law = isinstance(paragraph_content, dict) and all(isinstance(k, tuple) and len(k) == 3 for k in paragraph_content)
+    if is_law:
+        sorted_keys = sorted(paragraph_content.keys(), key=law_sort_key)
+    else:
+        sorted_keys = sorted(paragraph_content.keys(), key=lambda x: int(x.replace('para', '')))
+
+    manifest = []
+    # Blocks of the current chunk and their total length in characters
+    chunk_blocks: List[str] = []
+    chunk_length = 0
+    chunk_keys = []
+    breadcrumb = ""
+    current_chapter = None
+    current_paragraph = None
+
+    def flush() -> None:
+        filename = _chunk_filename(output_filename, len(manifest) + 1)
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write("".join(chunk_blocks))
+        manifest.append(
+            {
+                "file": os.path.basename(filename),
+                "breadcrumb": breadcrumb,
+                "first": chunk_keys[0],
+                "last": chunk_keys[-1],
+                "sections": len(chunk_keys),
+                "size": _size_of_length(chunk_length, chunk_unit),
+            }
+        )
+
+    for key in sorted_keys:
+        if is_law:
+            chapter, paragraph, section = key
+            headings = ""
+            if chapter != current_chapter or not chunk_keys:
+                headings += f"## Kapitel {chapter}\n\n"
+            if paragraph != current_paragraph or chapter != current_chapter or not chunk_keys:
+                headings += f"### § {paragraph}\n\n"
+            block = f"{section}: {paragraph_content[key]}\n\n"
+            crumb = f"Kapitel {chapter} › § {paragraph} › {section}"
+        else:
+            para_num = key.replace('para', '')
+            headings = ""
+            block = f"### Paragraph {para_num}\n\n{paragraph_content[key]}\n\n"
+            crumb = f"Paragraph {para_num}"
+
+        added = len(headings) + len(block)
+        if chunk_keys and _size_of_length(chunk_length + added, chunk_unit) > chunk_size:
+            flush()
+            chunk_keys = []
+            if is_law:
+                headings = f"## Kapitel {chapter}\n\n### § {paragraph}\n\n"
+                added = len(headings) + len(block)
+
+        if not chunk_keys:
+            breadcrumb = crumb
+            chunk_blocks = [f"# {document_title}\n\n> {crumb}\n\n"]
+            chunk_length = len(chunk_blocks[0])
+        chunk_blocks += (headings, block)
+        chunk_length += added
+        chunk_keys.append(keys[key])
+        if is_law:
+            current_chapter, current_paragraph = chapter, paragraph
+
+    if chunk_keys:
+        flush()
+
+    base, _ = os.path.splitext(output_filename)
+    with open(f"{base}.chunks.json", "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "title": document_title,
+                "law_id": law_id,
+                "url": document_url,
+                "date": document_date,
+                "unit": chunk_unit,
+                "budget": chunk_size,
+                "chunks": manifest,
+            },
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+    logger.info("Written %d Markdown chunks to %s.*.md", len(manifest), base)
+    return [os.path.join(dir_path, chunk["file"]) for chunk in manifest]
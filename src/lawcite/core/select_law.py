@@ -0,0 +1,190 @@
+from pypdf import PdfReader
+from typing import Any, Dict, List, Optional, Set, Tuple
+import re
+from .cache import pdf_digest, load_cached, store_cached
+from .parse_law import chapter_number, new_parser_state, parse_law_lines
+from .metrics import CACHE_REQUESTS, PAGES
+
+PAGE_INDEX_VERSION = 3
+
+
+def paragraph_number(paragraph: str) -> int:
+    """Return the numeric part of a paragraph number (e.g. "15a" -> 15)."""
+    match = re.match(r"\d+", paragraph)
+    return int(match.group(0)) if match else 0
+
+
+def parse_chapters(text: str) -> Set[str]:
+    """Parse a chapter selection such as "27", "3,5" or "3-5"."""
+    chapters: Set[str] = set()
+    for part in text.split(","):
+        part = part.strip().replace("–", "-")
+        if not part:
+            continue
+        if "-" in part:
+            first, last = (int(p) for p in part.split("-", 1))
+            chapters.update(str(n) for n in range(first, last + 1))
+        else:
+            chapters.add(str(int(part)))
+    if not chapters:
+        raise ValueError(f"Invalid chapter selection: {text!r}")
+    return chapters
+
+
+def parse_paragraph_range(text: str) -> Tuple[int, int]:
+    """Parse a § range such as "245-250", "§ 245–§ 250" or "9"."""
+    numbers = re.findall(r"\d+", text.replace("–", "-"))
+    if len(numbers) == 1:
+        return int(numbers[0]), int(numbers[0])
+    if len(numbers) == 2 and "-" in text.replace("–", "-"):
+        return int(numbers[0]), int(numbers[1])
+    raise ValueError(f"Invalid paragraph selection: {text!r}")
+
+
+def build_page_index(
+    pdf: PdfReader, texts: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """Build a page-level index of chapters and paragraphs in a legal PDF.
+
+    Each entry records the parser state at the start of the page together
+    with the chapters and the lowest and highest paragraph touched by the page.
+
+    Args:
+        pdf: PdfReader object containing the PDF content.
+        texts: If given, the extracted text of every page is appended to it,
+            so callers can parse pages without extracting them again.
+
+    Returns:
+        List with one index entry per page.
+    """
+    index: List[Dict[str, Any]] = []
+    paragraph_content: Dict[Tuple[str, str, str], str] = {}
+    state = new_parser_state()
+
+    for page in pdf.pages:
+        start = dict(state)
+        text = page.extract_text()
+        PAGES.inc()
+        if texts is not None:
+            texts.append(text)
+        started = parse_law_lines(text.split("\n"), paragraph_content, state)
+        chapters = [start["chapter"] or "1"] if start["paragraph"] else []
+        paragraphs = [start["paragraph"]] if start["paragraph"] else []
+        for chapter, paragraph, _ in started:
+            if chapter_number(chapter) not in chapters:
+                chapters.append(chapter_number(chapter))
+            paragraphs.append(paragraph)
+        if state["chapter"] and state["chapter"] not in chapters:
+            chapters.append(state["chapter"])
+        index.append(
+            {
+                "start": start,
+                "chapters": chapters,
+                # Lowest and highest §, as the numbering restarts in annexes
+                "paragraphs": (
+                    [min(paragraphs, key=paragraph_number), max(paragraphs, key=paragraph_number)]
+                    if paragraphs
+                    else []
+                ),
+            }
+        )
+
+    return index
+
+
+def load_page_index(
+    pdf: PdfReader, texts: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """Return the page index for a PDF, using the cache keyed by the PDF hash.
+
+    On a cache miss the page texts extracted for the index are appended to
+    texts, as in build_page_index.
+    """
+    digest = pdf_digest(pdf)
+    cached = load_cached(digest, "page_index")
+    if cached and cached.get("version") == PAGE_INDEX_VERSION:
+        if len(cached["pages"]) == len(pdf.pages):
+            CACHE_REQUESTS.inc(cache="page_index", result="hit")
+            return cached["pages"]
+
+    CACHE_REQUESTS.inc(cache="page_index", result="miss")
+    index = build_page_index(pdf, texts)
+    store_cached(digest, "page_index", {"version": PAGE_INDEX_VERSION, "pages": index})
+    return index
+
+
+def _page_selected(
+    entry: Dict[str, Any],
+    chapters: Optional[Set[str]],
+    paragraphs: Optional[Tuple[int, int]],
+) -> bool:
+    if chapters is not None and not chapters.intersection(entry["chapters"]):
+        return False
+    if paragraphs is not None:
+        if not entry["paragraphs"]:
+            return False
+        first, last = (paragraph_number(p) for p in entry["paragraphs"])
+        if last < paragraphs[0] or first > paragraphs[1]:
+            return False
+    return True
+
+
+def select_pages(
+    index: List[Dict[str, Any]],
+    chapters: Optional[Set[str]] = None,
+    paragraphs: Optional[Tuple[int, int]] = None,
+) -> List[int]:
+    """Return the page numbers covering the selected chapters and § range."""
+    return [
+        page_num
+        for page_num, entry in enumerate(index)
+        if _page_selected(entry, chapters, paragraphs)
+    ]
+
+
+def parse_law_selection(
+    pdf: PdfReader,
+    chapters: Optional[Set[str]] = None,
+    paragraphs: Optional[Tuple[int, int]] = None,
+) -> Dict[Tuple[str, str, str], str]:
+    """Parse only the chapters and/or § range selected from a legal PDF.
+
+    Only the pages covering the selection, as found in the page index, are
+    extracted and parsed. If the index has to be built first, the page texts
+    extracted for it are parsed instead of extracting the pages again.
+
+    Args:
+        pdf: PdfReader object containing the PDF content.
+        chapters: Chapter numbers to keep, e.g. {"27"}.
+        paragraphs: Inclusive range of paragraph numbers, e.g. (245, 250).
+
+    Returns:
+        Dictionary mapping (chapter, paragraph, section) tuples to content strings.
+    """
+    texts: List[str] = []
+    index = load_page_index(pdf, texts)
+    paragraph_content: Dict[Tuple[str, str, str], str] = {}
+    state = new_parser_state()
+    previous = None
+
+    for page_num in select_pages(index, chapters, paragraphs):
+        if page_num != previous:
+            # Resume the parser where the previous page left off
+            state = dict(index[page_num]["start"])
+        if texts:
+            text = texts[page_num]
+        else:
+            text = pdf.pages[page_num].extract_text()
+            PAGES.inc()
+        parse_law_lines(text.split("\n"), paragraph_content, state)
+        previous = page_num + 1
+
+    return {
+        key: content
+        for key, content in paragraph_content.items()
+        if (chapters is None or chapter_number(key[0]) in chapters)
+        and (
+            paragraphs is None
+            or paragraphs[0] <= paragraph_number(key[1]) <= paragraphs[1]
+        )
+    }
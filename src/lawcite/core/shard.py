@@ -0,0 +1,107 @@
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+from .keys import build_key_table
+
+SHARD_MODES = ("chapter", "size")
+
+
+def parse_shard_spec(spec: str) -> Tuple[str, Optional[int]]:
+    """Parse a shard specification such as "chapter" or "size=200".
+
+    Returns:
+        Tuple of (mode, size), where size is None for chapter shards.
+
+    Raises:
+        ValueError: If the specification is invalid.
+    """
+    mode, _, value = spec.strip().partition("=")
+    if mode == "chapter" and not value:
+        return mode, None
+    if mode == "size" and value.isdigit() and int(value) > 0:
+        return mode, int(value)
+    raise ValueError(f"Invalid shard specification: {spec!r} (expected 'chapter' or 'size=N')")
+
+
+def split_sections(paragraph_content: Dict, spec: str) -> List[Tuple[str, Dict]]:
+    """Split paragraph content into shards.
+
+    Chapter shards group law sections by the chapter in their
+    (chapter, paragraph, section) key; size shards hold at most N sections
+    each, in document order.
+
+    Args:
+        paragraph_content: Dictionary of paragraph content.
+        spec: Shard specification, "chapter" or "size=N".
+
+    Returns:
+        List of (shard name, paragraph content) pairs, e.g. ("chapter27", {...}).
+
+    Raises:
+        ValueError: If the specification is invalid, or chapter shards are
+            requested for a document without chapters.
+    """
+    mode, size = parse_shard_spec(spec)
+    shards: Dict[str, Dict] = {}
+    if mode == "chapter":
+        if not all(isinstance(k, tuple) and len(k) == 3 for k in paragraph_content):
+            raise ValueError("Chapter shards are only supported for laws")
+        for key, content in paragraph_content.items():
+            shards.setdefault(f"chapter{key[0]}", {})[key] = content
+    else:
+        for i, (key, content) in enumerate(paragraph_content.items()):
+            shards.setdefault(f"part{i // size + 1:03d}", {})[key] = content
+    return list(shards.items())
+
+
+def shard_filename(output_filename: str, name: str) -> str:
+    """Return the file name of a shard, e.g. "straffeloven.chapter27.bib"."""
+    base, ext = os.path.splitext(output_filename)
+    return f"{base}.{name}{ext}"
+
+
+def write_shard_index(
+    output_filename: str,
+    law_id: str,
+    document_title: str,
+    shards: List[Tuple[str, Dict]],
+    keys: Optional[Dict] = None,
+    parent_filename: Optional[str] = None,
+) -> str:
+    """Write the index listing the shards of a document.
+
+    keys is the citation key table of the whole document; it is computed
+    from the shards if not given. parent_filename is the file holding the
+    crossref parent entry shared by the shards, if any.
+
+    Returns:
+        Path of the index file, "<name>.shards.json".
+    """
+    base, ext = os.path.splitext(output_filename)
+    index_filename = f"{base}.shards.json"
+    if keys is None:
+        keys = build_key_table((key for _, content in shards for key in content), law_id)
+    entries = []
+    for name, content in shards:
+        shard_keys = [keys[key] for key in content]
+        entry = {
+            "file": os.path.basename(shard_filename(output_filename, name)),
+            "entries": len(shard_keys),
+            "first": shard_keys[0],
+            "last": shard_keys[-1],
+        }
+        if name.startswith("chapter"):
+            entry["chapter"] = name[len("chapter"):]
+        entries.append(entry)
+    index = {"title": document_title, "law_id": law_id, "format": ext.lstrip(".")}
+    if parent_filename:
+        index["parent"] = os.path.basename(parent_filename)
+    index["shards"] = entries
+    with open(index_filename, "w", encoding="utf-8") as f:
+        json.dump(
+            index,
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+    return index_filename
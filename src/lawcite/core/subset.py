@@ -0,0 +1,125 @@
+import logging
+import os
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+from .merge_bibtex import load_bibtex_index
+
+logger = logging.getLogger(__name__)
+
+CITING_SUFFIXES = (".aux", ".bcf", ".tex", ".typ")
+
+# Matches the keys generated by lawcite ("konkurrencelovenp9stk2",
+# "vejledning_para12", disambiguated "...p1stk1kap12" or "..._2") anywhere
+# in a file, so one pass finds the keys of \citation{...}, <bcf:citekey>,
+# \cite{...}, @key and #cite(<key>) alike.
+CITE_KEY_PATTERN = re.compile(
+    rb"(?<![A-Za-z0-9_])"
+    rb"([a-z0-9]+(?:p\d+[a-z]?stk\d+(?:kap\d+(?:_\d+)?)?|_para\d+)(?:_\d+)?)"
+    rb"(?![A-Za-z0-9_])"
+)
+CROSSREF_PATTERN = re.compile(rb"\bcrossref\s*=\s*[{\"]?\s*([^\s,}\"]+)", re.IGNORECASE)
+
+
+def _iter_files(path: str, suffixes: Tuple[str, ...]) -> Iterable[str]:
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for filename in sorted(files):
+                if filename.endswith(suffixes):
+                    yield os.path.join(root, filename)
+    else:
+        yield path
+
+
+def find_cited_keys(paths: Iterable[str]) -> List[str]:
+    """Find the lawcite keys cited in .aux, .bcf, .tex or .typ files.
+
+    Args:
+        paths: Files to scan, or directories searched for such files.
+
+    Returns:
+        Cited keys in order of first appearance.
+    """
+    keys: Dict[str, None] = {}
+    for path in paths:
+        for filename in _iter_files(path, CITING_SUFFIXES):
+            with open(filename, "rb") as f:
+                for match in CITE_KEY_PATTERN.finditer(f.read()):
+                    keys[match.group(1).decode("ascii")] = None
+    return list(keys)
+
+
+def _copy_entries(
+    keys: List[str],
+    bib_paths: Iterable[str],
+    output_path: str,
+    found: Dict[str, bytes],
+    skipped: Set[str],
+) -> None:
+    """Add the entries of the given keys from BibTeX files to found.
+
+    Files that cannot be indexed, such as hand-written bibliographies with
+    duplicate keys, are logged once, added to skipped and left out.
+    """
+    for path in bib_paths:
+        for bib_path in _iter_files(path, (".bib",)):
+            if os.path.abspath(bib_path) == output_path or bib_path in skipped:
+                continue
+            try:
+                spans = load_bibtex_index(bib_path)["entries"]
+            except ValueError as e:
+                logger.warning("Skipping %s: %s", bib_path, e)
+                skipped.add(bib_path)
+                continue
+            present = [key for key in keys if key in spans and key not in found]
+            if not present:
+                continue
+            logger.debug("Copying %d entries from %s", len(present), bib_path)
+            with open(bib_path, "rb") as f:
+                data = f.read()
+            for key in present:
+                start, end = spans[key]
+                found[key] = data[start:end].rstrip() + b"\n\n"
+
+
+def subset_bibliography(
+    keys: Iterable[str], bib_paths: Iterable[str], output_filename: str
+) -> Tuple[List[str], List[str]]:
+    """Write a bibliography with only the given entries from BibTeX files.
+
+    Entries are copied byte for byte using the sidecar index of each
+    BibTeX file (see load_bibtex_index), without parsing the files. The
+    parent entry each copied entry crossrefs (see --crossref) is copied
+    too, after the entries referring to it as BibTeX requires. BibTeX
+    files that cannot be indexed are skipped with a warning.
+
+    Args:
+        keys: Keys of the entries to keep.
+        bib_paths: BibTeX files, or directories searched for .bib files.
+        output_filename: Path of the bibliography to write.
+
+    Returns:
+        Tuple of (written keys, keys not found in any BibTeX file).
+    """
+    bib_paths = list(bib_paths)
+    wanted = list(dict.fromkeys(keys))
+    found: Dict[str, bytes] = {}
+    output_path = os.path.abspath(output_filename)
+    skipped: Set[str] = set()
+    _copy_entries(wanted, bib_paths, output_path, found, skipped)
+
+    parents: Dict[str, None] = {}
+    for key in wanted:
+        match = CROSSREF_PATTERN.search(found.get(key, b""))
+        if match and match.group(1).decode("utf-8") not in wanted:
+            parents[match.group(1).decode("utf-8")] = None
+    _copy_entries(list(parents), bib_paths, output_path, found, skipped)
+
+    dir_path = os.path.dirname(output_filename)
+    if dir_path:
+        os.makedirs(dir_path, exist_ok=True)
+    requested = wanted + list(parents)
+    written = [key for key in requested if key in found]
+    with open(output_filename, "wb") as f:
+        f.write(b"".join(found[key] for key in written))
+    return written, [key for key in requested if key not in found]
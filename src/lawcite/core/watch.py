@@ -0,0 +1,210 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+import requests
+import yaml
+from .extract_text import FastTextReader
+from .fetch_pdf import check_pdf_response, read_pdf_bytes
+from .metrics import BYTES_FETCHED, timed
+
+logger = logging.getLogger(__name__)
+
+
+def load_manifest(manifest_path: str) -> List[Dict[str, str]]:
+    """Load a manifest of documents to watch.
+
+    The manifest is a YAML file with a "laws" list (as in examples/laws.yml).
+    Each item needs "name" and "url", and may set "kind" ("law" or "other",
+    default "law") and "file" (output path, default "<name>.bib" next to the
+    manifest).
+
+    Returns:
+        List of manifest entries with all fields filled in.
+    """
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = yaml.safe_load(f) or {}
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    entries = []
+    for item in manifest.get("laws", []):
+        if "name" not in item or "url" not in item:
+            raise ValueError(f"Manifest entry needs a name and url: {item}")
+        entries.append(
+            {
+                "name": item["name"],
+                "url": item["url"],
+                "kind": item.get("kind", "law"),
+                "file": os.path.join(base_dir, item.get("file", f"{item['name']}.bib")),
+            }
+        )
+    return entries
+
+
+def load_status(status_path: str) -> Dict[str, Dict[str, Any]]:
+    """Load the watch status file, keyed by document name."""
+    try:
+        with open(status_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_status(status_path: str, status: Dict[str, Dict[str, Any]]) -> None:
+    """Atomically write the watch status file."""
+    dir_path = os.path.dirname(status_path) or "."
+    os.makedirs(dir_path, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=dir_path, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(status, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, status_path)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def text_fingerprint(content: bytes) -> str:
+    """Hash the text of a PDF, ignoring how it is rendered.
+
+    Whitespace is collapsed, so a republished PDF with new timestamps, IDs
+    or layout but the same text has the same fingerprint.
+    """
+    pdf = FastTextReader(read_pdf_bytes(content, ""))
+    digest = hashlib.sha256()
+    for page in pdf.pages:
+        digest.update(" ".join(page.extract_text().split()).encode("utf-8"))
+        digest.update(b"\f")
+    return digest.hexdigest()
+
+
+def check_source(
+    url: str,
+    entry_status: Dict[str, Any],
+    session: Optional[requests.Session] = None,
+) -> Optional[bytes]:
+    """Poll a URL with a conditional GET and report changed content.
+
+    The ETag, Last-Modified, content hash and text fingerprint of the last
+    response are kept in entry_status, which is updated in place. A changed
+    hash is only reported if the text changed too, so documents that were
+    merely re-rendered are not regenerated.
+
+    Returns:
+        The new PDF content if its text changed since the last check, else None.
+    """
+    headers = {}
+    if entry_status.get("etag"):
+        headers["If-None-Match"] = entry_status["etag"]
+    if entry_status.get("last_modified"):
+        headers["If-Modified-Since"] = entry_status["last_modified"]
+
+    with timed("poll"):
+        response = (session or requests).get(url, headers=headers, timeout=10)
+    entry_status["last_checked"] = _now()
+    if response.status_code == 304:
+        return None
+    check_pdf_response(response)
+    BYTES_FETCHED.inc(len(response.content))
+
+    entry_status["etag"] = response.headers.get("ETag")
+    entry_status["last_modified"] = response.headers.get("Last-Modified")
+    digest = hashlib.sha256(response.content).hexdigest()
+    if digest == entry_status.get("hash"):
+        return None
+    with timed("fingerprint"):
+        fingerprint = text_fingerprint(response.content)
+    entry_status["hash"] = digest
+    if fingerprint == entry_status.get("fingerprint"):
+        return None
+    entry_status["fingerprint"] = fingerprint
+    return response.content
+
+
+def poll_once(
+    entries: List[Dict[str, str]],
+    status: Dict[str, Dict[str, Any]],
+    on_change: Callable[[Dict[str, str], bytes], None],
+    session: Optional[requests.Session] = None,
+) -> List[str]:
+    """Check every manifest entry once and regenerate changed documents.
+
+    Errors are recorded in the status of the affected entry and do not stop
+    the remaining entries from being checked. A document whose regeneration
+    fails keeps its previous hash and fingerprint so it is retried on the
+    next poll.
+
+    Returns:
+        Names of the documents that were regenerated.
+    """
+    changed = []
+    for entry in entries:
+        entry_status = status.setdefault(entry["name"], {"url": entry["url"]})
+        if entry_status.get("url") != entry["url"]:
+            entry_status.clear()
+            entry_status["url"] = entry["url"]
+        previous = dict(entry_status)
+        try:
+            content = check_source(entry["url"], entry_status, session)
+            if content is not None:
+                on_change(entry, content)
+                entry_status["last_changed"] = entry_status["last_checked"]
+                changed.append(entry["name"])
+            entry_status.pop("error", None)
+        except Exception as e:
+            for field in ("etag", "last_modified", "hash", "fingerprint"):
+                entry_status[field] = previous.get(field)
+            entry_status["error"] = str(e)
+            logger.error(
+                "Failed to check %s: %s", entry["name"], e, extra={"url": entry["url"]}
+            )
+    return changed
+
+
+def watch(
+    manifest_path: str,
+    status_path: str,
+    on_change: Callable[[Dict[str, str], bytes], None],
+    interval: float = 3600,
+    iterations: Optional[int] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    on_poll: Optional[Callable[[], None]] = None,
+) -> None:
+    """Poll the documents in a manifest on a schedule.
+
+    The manifest is reloaded on every poll, and the status file records the
+    last-checked and last-changed time of each document.
+
+    Args:
+        manifest_path: Path of the YAML manifest.
+        status_path: Path of the JSON status file.
+        on_change: Called with the manifest entry and new PDF content when a
+            document changed.
+        interval: Seconds between polls.
+        iterations: Number of polls, or None to poll forever.
+        sleep: Function used to wait between polls.
+        on_poll: Called after every poll, e.g. to export metrics.
+    """
+    session = requests.Session()
+    status = load_status(status_path)
+    count = 0
+    while True:
+        entries = load_manifest(manifest_path)
+        changed = poll_once(entries, status, on_change, session)
+        save_status(status_path, status)
+        logger.info(
+            "Checked %d documents, %d changed",
+            len(entries),
+            len(changed),
+            extra={"changed": changed},
+        )
+        if on_poll:
+            on_poll()
+        count += 1
+        if iterations is not None and count >= iterations:
+            break
+        sleep(interval)
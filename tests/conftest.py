@@ -0,0 +1,143 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep per-PDF cache files of every test out of ~/.cache/lawcite."""
+    monkeypatch.setenv("LAWCITE_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _pdf_string(text):
+    data = text.encode("cp1252")
+    data = data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+    return b"(" + data + b")"
+
+
+def build_pdf(
+    pages,
+    title="Bekendtgørelse af konkurrenceloven",
+    creation_date="D:20241103000000",
+    transform=None,
+):
+    """Build an uncompressed PDF with one text line per line of each page.
+
+    If transform is given (e.g. "1 0 0 1 10 20"), the text of each page is
+    drawn with that current transformation matrix.
+    """
+    page_count = len(pages)
+    # 1: catalog, 2: pages, 3: font, 4: info, then a page and content per page
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids ["
+        + b" ".join(f"{5 + 2 * i} 0 R".encode() for i in range(page_count))
+        + f"] /Count {page_count} >>".encode(),
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        4: b"<< /Title " + _pdf_string(title) + b" /CreationDate (" + creation_date.encode() + b") >>",
+    }
+    for i, text in enumerate(pages):
+        page_id, content_id = 5 + 2 * i, 6 + 2 * i
+        stream = b"BT /F1 10 Tf 12 TL 50 800 Td\n"
+        for line in text.split("\n"):
+            stream += _pdf_string(line) + b" Tj T*\n"
+        stream += b"ET"
+        if transform:
+            stream = f"q {transform} cm\n".encode() + stream + b"\nQ"
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode()
+        objects[content_id] = (
+            f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream"
+        )
+
+    out = b"%PDF-1.4\n"
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += f"{obj_id} 0 obj\n".encode() + objects[obj_id] + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for obj_id in sorted(objects):
+        out += f"{offsets[obj_id]:010d} 00000 n \n".encode()
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R /Info 4 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+    return out
+
+
+@pytest.fixture
+def make_pdf():
+    """Return a factory building real PDF bytes from page texts."""
+    return build_pdf
+
+
+def build_cmap_pdf(pages, title="Bekendtgørelse af konkurrenceloven"):
+    """Build a PDF with a composite (Identity-H) font decoded through a ToUnicode CMap.
+
+    Words are shown as glyph runs in TJ arrays separated by a negative
+    displacement of one space, as many PDF producers write them, and lines
+    are started with Td.
+    """
+    chars = sorted({c for text in pages for c in text if c not in " \n"})
+    codes = {c: i + 1 for i, c in enumerate(chars)}
+    cmap = (
+        "/CIDInit /ProcSet findresource begin 12 dict begin begincmap\n"
+        "1 begincodespacerange <0000> <FFFF> endcodespacerange\n"
+        f"{len(chars)} beginbfchar\n"
+        + "".join(f"<{codes[c]:04X}> <{c.encode('utf-16-be').hex().upper()}>\n" for c in chars)
+        + "endbfchar\nendcmap CMapName currentdict /CMap defineresource pop end end"
+    ).encode()
+    widths = " ".join("600" if c.isupper() else "500" for c in chars)
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type0 /BaseFont /Arial /Encoding /Identity-H "
+        b"/DescendantFonts [5 0 R] /ToUnicode 6 0 R >>",
+        4: b"<< /Title (" + title.encode("cp1252") + b") /CreationDate (D:20241103000000) >>",
+        5: f"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /Arial /DW 500 "
+        f"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+        f"/W [1 [{widths}]] >>".encode(),
+        6: f"<< /Length {len(cmap)} >>\nstream\n".encode() + cmap + b"\nendstream",
+    }
+    kids = []
+    for i, text in enumerate(pages):
+        page_id, content_id = 7 + 2 * i, 8 + 2 * i
+        kids.append(f"{page_id} 0 R")
+        stream = b"BT /F1 10 Tf 50 800 Td\n"
+        for line in text.split("\n"):
+            runs = [
+                "<" + "".join(f"{codes[c]:04X}" for c in word) + ">"
+                for word in line.split(" ")
+            ]
+            stream += f"[{' -250 '.join(runs)}] TJ 0 -14 Td\n".encode()
+        stream += b"ET"
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode()
+        objects[content_id] = (
+            f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream"
+        )
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode()
+
+    out = b"%PDF-1.4\n"
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += f"{obj_id} 0 obj\n".encode() + objects[obj_id] + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for obj_id in sorted(objects):
+        out += f"{offsets[obj_id]:010d} 00000 n \n".encode()
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R /Info 4 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+    return out
+
+
+@pytest.fixture
+def make_cmap_pdf():
+    """Return a factory building PDF bytes with a ToUnicode-mapped composite font."""
+    return build_cmap_pdf
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import lawcite
+from lawcite import Document, aconvert, convert, render
+
+
+def law_pages(n):
+    return [
+        f"Kapitel 1\nIndledning\n§ 1. Lov nummer {n}.\nStk. 2. Andet stykke.\n",
+        "§ 2. Anden bestemmelse\nder fortsætter.\n",
+    ]
+
+
+def test_convert_bytes(make_pdf, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    document = convert(make_pdf(law_pages(1)), kind="law", url="https://example.com/law")
+
+    assert isinstance(document, Document)
+    assert document.title == "konkurrenceloven"
+    assert document.law_id == "konkurrenceloven"
+    assert document.url == "https://example.com/law"
+    assert document.sections[("1", "1", "Stk. 1.")] == "Lov nummer 1."
+    assert ("1", "2", "Stk. 1.") in document.sections
+    # No files in the working directory (which is also the cache directory)
+    # and nothing printed
+    assert os.listdir(tmp_path) == []
+    assert capsys.readouterr().out == ""
+
+
+def test_render_formats(make_pdf):
+    document = convert(make_pdf(law_pages(1)))
+
+    bib = render(document, "bib").decode("utf-8")
+    assert "konkurrencelovenp1stk2" in bib
+    assert render(document, "md").decode("utf-8").startswith("# konkurrenceloven\n")
+    assert "konkurrencelovenp1stk1:" in render(document, "yaml").decode("utf-8")
+    records = [json.loads(line) for line in render(document, "jsonl").splitlines()]
+    assert records[0]["key"] == "konkurrencelovenp1stk1"
+    with pytest.raises(ValueError):
+        render(document, "docx")
+
+
+def test_convert_builds_reference_graph(make_pdf):
+    document = convert(
+        make_pdf(["Kapitel 1\nIndledning\n§ 1. Se stk. 2.\nStk. 2. Jf. § 2.\n§ 2. Slut.\n"])
+    )
+
+    assert document.references[("1", "1", "Stk. 1.")] == [("1", "1", "Stk. 2.")]
+    assert document.cited_by[("1", "2", "Stk. 1.")] == [("1", "1", "Stk. 2.")]
+    assert b'"konkurrencelovenp1stk2" -> "konkurrencelovenp2stk1";' in render(document, "dot")
+
+
+def test_convert_rejects_unknown_kind(make_pdf):
+    with pytest.raises(ValueError):
+        convert(make_pdf(law_pages(1)), kind="treaty")
+
+
+def test_concurrent_conversions(make_pdf, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sources = [make_pdf(law_pages(n)) for n in range(64)]
+    expected = [render(convert(source), "jsonl") for source in sources]
+
+    def run(source):
+        return render(convert(source), "jsonl")
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(run, sources))
+
+    assert results == expected
+    assert os.listdir(tmp_path) == []
+
+
+def test_aconvert(make_pdf):
+    async def run_all():
+        return await asyncio.gather(
+            *(aconvert(make_pdf(law_pages(n))) for n in range(8))
+        )
+
+    documents = asyncio.run(run_all())
+    assert [d.sections[("1", "1", "Stk. 1.")] for d in documents] == [
+        f"Lov nummer {n}." for n in range(8)
+    ]
+
+
+def test_public_api_is_lazy():
+    assert "convert" in lawcite.__all__
+    with pytest.raises(AttributeError):
+        lawcite.missing
+
+
+def test_convert_auto_detects_kind(make_pdf):
+    law = convert(make_pdf(law_pages(1)), kind="auto")
+    assert law.kind == "law"
+    assert ("1", "1", "Stk. 2.") in law.sections
+
+    guide = convert(
+        make_pdf(["VEJ nr 10267 af 03/06/2021\n\nVejledning om reglerne.\n\nMere tekst.\n"]),
+        kind="auto",
+    )
+    assert guide.kind == "other"
+    assert list(guide.sections) == ["para1", "para2"]
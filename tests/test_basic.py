@@ -9,3 +9,11 @@ def test_cli_module_importable():
     from lawcite.cli.main import main
 
     assert callable(main)
+
+
+def test_cli_commands_bind_their_options():
+    from lawcite.cli.main import app
+
+    # treeparse requires the callback parameters to match the option dests
+    for cmd in app.commands:
+        cmd.validate()
@@ -0,0 +1,115 @@
+import json
+import zipfile
+import pytest
+import yaml
+from lawcite.core.bundle import (
+    BundleReader,
+    create_bundle,
+    load_bundle_index,
+    read_entry,
+    read_law,
+)
+
+BIB = """@article{lovap1stk1,
+ author = {Lova §1 Stk. 1.,},
+ title = {Første.}
+}
+
+@article{lovap1stk2,
+ author = {Lova §1 Stk. 2.,},
+ title = {Anden.}
+}
+"""
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    root = tmp_path / "corpus"
+    (root / "md").mkdir(parents=True)
+    (root / "lova.bib").write_text(BIB, encoding="utf-8")
+    entries = {
+        "lovbp1stk1": {"type": "Article", "title": "Én " + "lang tekst " * 20},
+        "lovbp2stk1": {"type": "Article", "title": "To."},
+    }
+    (root / "lovb.yaml").write_text(
+        yaml.dump(entries, default_flow_style=False, allow_unicode=True), encoding="utf-8"
+    )
+    records = [{"key": "lovap1stk1", "text": "Første."}, {"key": "lovap1stk2", "text": "Anden."}]
+    (root / "lova.jsonl").write_text(
+        "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records), encoding="utf-8"
+    )
+    (root / "md" / "lova.md").write_text("# lova\n\n### § 1\n\n", encoding="utf-8")
+    (root / "notes.txt").write_text("not bundled", encoding="utf-8")
+    return root
+
+
+def test_create_and_read_bundle(corpus, tmp_path):
+    output = tmp_path / "out" / "corpus.zip"
+    index = create_bundle(str(corpus), str(output))
+
+    assert sorted(index["members"]) == ["lova.bib", "lova.jsonl", "lovb.yaml", "md/lova.md"]
+    assert index["laws"]["lova"] == ["lova.bib", "lova.jsonl", "md/lova.md"]
+
+    with zipfile.ZipFile(output) as zf:
+        assert all(info.compress_type == zipfile.ZIP_DEFLATED for info in zf.infolist())
+        index = load_bundle_index(zf)
+        entry = read_entry(zf, index, "lovap1stk2")
+        assert entry.startswith("@article{lovap1stk2,")
+        assert "Første" not in entry
+        assert json.loads(read_entry(zf, index, "lovap1stk1", "jsonl"))["text"] == "Første."
+        assert yaml.safe_load(read_entry(zf, index, "lovbp1stk1", "yaml")) == {
+            "lovbp1stk1": {"type": "Article", "title": "Én " + "lang tekst " * 20}
+        }
+        assert read_law(zf, index, "lova", "bib") == BIB
+        assert read_law(zf, index, "lova", "md").startswith("# lova")
+        with pytest.raises(KeyError):
+            read_entry(zf, index, "lovbp1stk1", "bib")
+        with pytest.raises(KeyError):
+            read_law(zf, index, "lovc")
+
+
+def test_load_bundle_index_rejects_other_archives(tmp_path):
+    path = tmp_path / "other.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("readme.txt", "hello")
+    with zipfile.ZipFile(path) as zf, pytest.raises(ValueError):
+        load_bundle_index(zf)
+
+
+def test_bundle_reader_caches_members(corpus, tmp_path, monkeypatch):
+    output = tmp_path / "corpus.zip"
+    create_bundle(str(corpus), str(output))
+
+    with BundleReader(str(output), cached_members=1) as reader:
+        reads = []
+        read = reader.zf.read
+        monkeypatch.setattr(reader.zf, "read", lambda name: reads.append(name) or read(name))
+
+        assert reader.read_entry("lovap1stk1").startswith("@article{lovap1stk1,")
+        assert reader.read_entry("lovap1stk2").startswith("@article{lovap1stk2,")
+        assert reads == ["lova.bib"]
+        assert "lovbp2stk1" in reader.read_entry("lovbp2stk1", "yaml")
+        assert reader.read_entry("lovap1stk1").startswith("@article{lovap1stk1,")
+        assert reads == ["lova.bib", "lovb.yaml", "lova.bib"]
+        assert reader.read_law("lova") == BIB
+        with pytest.raises(KeyError):
+            reader.read_entry("lovc", "bib")
+
+
+def test_extract_prefers_entry_with_law_id(tmp_path, capsys):
+    from lawcite.cli.main import extract_callback
+
+    root = tmp_path / "corpus"
+    root.mkdir()
+    parent = "@book{lova,\n title = {Lov A}\n}\n\n"
+    (root / "lova.bib").write_text(parent + BIB, encoding="utf-8")
+    output = tmp_path / "corpus.zip"
+    create_bundle(str(root), str(output))
+
+    # The --crossref parent has the law ID as its key
+    extract_callback(str(output), "lova")
+    assert capsys.readouterr().out == parent
+    extract_callback(str(output), "lova", law=True)
+    assert capsys.readouterr().out == parent + BIB
+    extract_callback(str(output), "lovap1stk1")
+    assert capsys.readouterr().out.startswith("@article{lovap1stk1,")
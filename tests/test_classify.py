@@ -0,0 +1,61 @@
+from lawcite.core.classify import classify_document, classify_text
+from lawcite.core.extract_metadata import extract_metadata
+from lawcite.core.extract_text import CachedTextReader
+from lawcite.core.parse_law import parse_law_paragraphs
+
+
+class MockPage:
+    def __init__(self, text):
+        self.text = text
+        self.extracted = 0
+
+    def extract_text(self):
+        self.extracted += 1
+        return self.text
+
+
+class MockPdfReader:
+    def __init__(self, texts):
+        self.pages = [MockPage(text) for text in texts]
+        self.metadata = {"/Title": "Bekendtgørelse af straffeloven"}
+
+
+LAW_TEXT = "Kapitel 1\nIndledning\n§ 1. Første bestemmelse.\nStk. 2. Andet stykke.\n§ 2. Anden.\n"
+GUIDE_TEXT = (
+    "Vejledning om anbringelse\n"
+    "1. Indledning\n"
+    "Denne vejledning beskriver reglerne i serviceloven, jf. § 52.\n"
+    "Kommunen skal efter § 68 følge op på anbringelsen.\n"
+)
+
+
+def test_classify_by_header():
+    assert classify_text("LBK nr 1150 af 09/10/2024\n" + GUIDE_TEXT) == "law"
+    assert classify_text("VEJ nr 10267 af 03/06/2021\n" + LAW_TEXT) == "other"
+    assert classify_text("Udskriftsdato: 1. maj 2025\nBEK nr 12 af 01/01/2024\n") == "law"
+
+
+def test_classify_by_marker_density():
+    assert classify_text(LAW_TEXT) == "law"
+    # References to § inside sentences are not paragraph markers
+    assert classify_text(GUIDE_TEXT * 10) == "other"
+    assert classify_text("") == "other"
+
+
+def test_sampled_pages_are_extracted_once():
+    pdf = MockPdfReader([LAW_TEXT, "§ 3. Tredje.\n", "§ 4. Fjerde.\n", "§ 5. Femte.\n"])
+    reader = CachedTextReader(pdf)
+
+    assert classify_document(reader) == "law"
+    extract_metadata(reader, "https://example.com/law.pdf")
+    sections = parse_law_paragraphs(reader)
+
+    assert ("1", "5", "Stk. 1.") in sections
+    assert [page.extracted for page in pdf.pages] == [1, 1, 1, 1]
+
+
+def test_classify_document_samples_first_pages():
+    pdf = MockPdfReader(["Forord\n", "Indhold\n", "Indledning\n", LAW_TEXT])
+    assert classify_document(pdf) == "other"
+    assert classify_document(pdf, pages=4) == "law"
+    assert pdf.pages[3].extracted == 1
@@ -0,0 +1,65 @@
+import bibtexparser as bp
+from lawcite.core.create_bibtex import create_crossref_bibtex, create_law_bibtex
+from lawcite.core.save_bibtex import save_bibtex
+from lawcite.core.subset import subset_bibliography
+
+SECTIONS = {
+    ("1", "9", "Stk. 1."): "Første stykke.",
+    ("1", "9", "Stk. 2."): "Andet stykke.",
+}
+METADATA = ("konkurrenceloven", "Erhvervsministeriet", "https://example.com/lov", "2024-11-03")
+
+
+def test_create_crossref_bibtex():
+    entries = create_crossref_bibtex(SECTIONS, *METADATA).entries
+
+    assert entries[0] == {
+        "ENTRYTYPE": "book",
+        "ID": "konkurrenceloven",
+        "author": "Konkurrenceloven,",
+        "title": "Erhvervsministeriet",
+        "journaltitle": "Erhvervsministeriet",
+        "url": "https://example.com/lov",
+        "date": "2024-11-03",
+    }
+    assert entries[2] == {
+        "ENTRYTYPE": "article",
+        "ID": "konkurrencelovenp9stk2",
+        "crossref": "konkurrenceloven",
+        "number": "§9 Stk. 2.",
+        "title": "Andet stykke.",
+    }
+    assert [e["ID"] for e in entries[1:]] == [e["ID"] for e in create_law_bibtex(SECTIONS, *METADATA).entries]
+
+
+def test_save_crossref_bibtex_is_smaller(tmp_path):
+    sections = {("1", str(n), "Stk. 1."): f"Tekst {n}." for n in range(1, 50)}
+    full, compact = tmp_path / "full.bib", tmp_path / "compact.bib"
+    save_bibtex(sections, *METADATA, str(full))
+    save_bibtex(sections, *METADATA, str(compact), crossref=True)
+
+    with open(compact, encoding="utf-8") as f:
+        db = bp.load(f)
+    assert len(db.entries) == 50
+    assert compact.stat().st_size < full.stat().st_size * 0.7
+
+
+def test_crossref_parent_survives_merge_and_subset(tmp_path):
+    master = tmp_path / "master.bib"
+    save_bibtex(SECTIONS, *METADATA, merge_into=str(master), crossref=True)
+    # Merging the law again replaces its entries, parent included, once
+    save_bibtex(SECTIONS, *METADATA, merge_into=str(master), crossref=True)
+
+    with open(master, encoding="utf-8") as f:
+        db = bp.load(f)
+    assert [e["ID"] for e in db.entries].count("konkurrenceloven") == 1
+    assert db.entries_dict["konkurrenceloven"]["ENTRYTYPE"] == "book"
+    assert db.entries_dict["konkurrencelovenp9stk2"]["crossref"] == "konkurrenceloven"
+
+    output = tmp_path / "refs.bib"
+    written, missing = subset_bibliography(["konkurrencelovenp9stk2"], [str(master)], str(output))
+    assert written == ["konkurrencelovenp9stk2", "konkurrenceloven"]
+    assert missing == []
+    with open(output, encoding="utf-8") as f:
+        db = bp.load(f)
+    assert sorted(db.entries_dict) == ["konkurrenceloven", "konkurrencelovenp9stk2"]
@@ -0,0 +1,124 @@
+import os
+import sys
+import threading
+import pytest
+from lawcite.core.daemon import (
+    create_server,
+    forward,
+    forwarded_env,
+    request_job,
+    socket_path,
+)
+
+
+def fake_run(argv):
+    print(f"{os.getcwd()} {os.environ.get('LAWCITE_TEST')} {' '.join(argv)}")
+    return 3 if argv[:1] == ["fail"] else 0
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    path = str(tmp_path / "lawcite.sock")
+    server = create_server(path, fake_run)
+    # Handlers forked from this process can inherit a client's socket (such
+    # as the liveness probe of create_server) and would wait for it forever
+    server.request_timeout = 0.5
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield path
+    server.shutdown()
+    server.server_close()
+
+
+def test_request_job(daemon, tmp_path):
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    out_path = tmp_path / "out.txt"
+    with open(out_path, "w") as out, open(os.devnull) as devnull:
+        status = request_job(
+            daemon,
+            ["law", "--file", "x.bib"],
+            str(work_dir),
+            {"LAWCITE_TEST": "1"},
+            fds=[devnull.fileno(), out.fileno(), sys.stderr.fileno()],
+        )
+        fail_status = request_job(
+            daemon,
+            ["fail"],
+            str(work_dir),
+            {},
+            fds=[devnull.fileno(), out.fileno(), sys.stderr.fileno()],
+        )
+
+    assert status == 0
+    assert fail_status == 3
+    assert out_path.read_text().splitlines() == [
+        f"{work_dir} 1 law --file x.bib",
+        f"{work_dir} None fail",
+    ]
+    # The daemon's own working directory and environment are untouched
+    assert os.getcwd() != str(work_dir)
+    assert "LAWCITE_TEST" not in os.environ
+
+
+def test_create_server_refuses_running_daemon(daemon):
+    with pytest.raises(RuntimeError):
+        create_server(daemon, fake_run)
+
+
+def test_forward_without_daemon(tmp_path):
+    path = str(tmp_path / "missing.sock")
+    assert forward(["info", "x"], path) is None
+    # A stale socket file is ignored by the client and replaced by the daemon
+    server = create_server(path, fake_run)
+    server.server_close()
+    assert forward(["info", "x"], path) is None
+    create_server(path, fake_run).server_close()
+
+
+def test_forwarded_env():
+    env = {
+        "LAWCITE_LOG_LEVEL": "DEBUG",
+        "HTTPS_PROXY": "http://proxy:3128",
+        "no_proxy": "localhost",
+        "LC_ALL": "da_DK.UTF-8",
+        "AWS_SECRET_ACCESS_KEY": "secret",
+        "LD_PRELOAD": "/tmp/evil.so",
+    }
+    assert forwarded_env(env) == {
+        "LAWCITE_LOG_LEVEL": "DEBUG",
+        "HTTPS_PROXY": "http://proxy:3128",
+        "no_proxy": "localhost",
+        "LC_ALL": "da_DK.UTF-8",
+    }
+
+
+def test_socket_path_in_private_dir(tmp_path, monkeypatch):
+    monkeypatch.delenv("LAWCITE_SOCKET", raising=False)
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setenv("TMPDIR", str(tmp_path))
+    path = socket_path()
+    assert os.path.dirname(path) == str(tmp_path / f"lawcite-{os.getuid()}")
+    create_server(path, fake_run).server_close()
+    assert os.stat(os.path.dirname(path)).st_mode & 0o777 == 0o700
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+
+def test_forward_ignores_foreign_socket(daemon, monkeypatch):
+    # The socket is owned by the test user, so pretend to be someone else
+    monkeypatch.setattr(os, "getuid", lambda: os.geteuid() + 1)
+    assert forward(["info", "x"], daemon) is None
+
+
+def test_create_server_refuses_foreign_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(os, "getuid", lambda: os.geteuid() + 1)
+    with pytest.raises(RuntimeError):
+        create_server(str(tmp_path / "lawcite.sock"), fake_run)
+
+
+def test_daemon_refuses_other_users(daemon, monkeypatch):
+    # Jobs are handled in processes forked after the patch, which then see
+    # the client as another user and close the connection
+    monkeypatch.setattr(os, "getuid", lambda: os.geteuid() + 1)
+    with open(os.devnull) as devnull, pytest.raises(ConnectionError):
+        request_job(daemon, ["info", "x"], os.getcwd(), {}, fds=[devnull.fileno()] * 3)
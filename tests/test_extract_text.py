@@ -0,0 +1,132 @@
+import logging
+import time
+import pytest
+from lawcite.core.extract_text import (
+    FastTextReader,
+    parse_to_unicode,
+    with_extractor,
+)
+from lawcite.core.fetch_pdf import read_pdf_bytes
+from lawcite.core.parse_general import parse_general_paragraphs
+from lawcite.core.parse_law import parse_law_paragraphs
+
+LAW_PAGES = [
+    "Kapitel 1\nIndledning\n§ 1. Første bestemmelse (jf. § 2).\nStk. 2. Andet stykke æøå.\n",
+    "§ 2. Anden bestemmelse\nder fortsætter.\n",
+    "fortsat fra forrige side.\nKapitel 2\nStraf\n§ 3. Tredje bestemmelse.\n",
+]
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture(params=["make_pdf", "make_cmap_pdf"])
+def law_pdf(request):
+    build = request.getfixturevalue(request.param)
+    return read_pdf_bytes(build(LAW_PAGES), "https://example.com/law.pdf")
+
+
+def test_fast_extractor_matches_pypdf(law_pdf):
+    fast = FastTextReader(law_pdf)
+    assert len(fast.pages) == len(law_pdf.pages)
+    for pypdf_page, fast_page in zip(law_pdf.pages, fast.pages):
+        assert fast_page.extract_text() == pypdf_page.extract_text()
+    assert parse_law_paragraphs(fast) == parse_law_paragraphs(law_pdf)
+    assert parse_general_paragraphs(fast) == parse_general_paragraphs(law_pdf)
+    assert fast.metadata == law_pdf.metadata
+
+
+def test_fonts_are_cached_across_pages(law_pdf):
+    fast = FastTextReader(law_pdf)
+    for page in fast.pages:
+        page.extract_text()
+    assert len(fast.extractor.fonts) == 1
+
+
+def test_parse_to_unicode():
+    cmap = (
+        b"begincmap\n1 begincodespacerange <0000> <FFFF> endcodespacerange\n"
+        b"2 beginbfchar\n<0001> <00A7>\n<0002> <00E6>\nendbfchar\n"
+        b"2 beginbfrange\n<0010> <0012> <0041>\n<0020> <0021> [<0078> <0079>]\nendbfrange\n"
+        b"endcmap"
+    )
+    mapping, code_length = parse_to_unicode(cmap)
+    assert code_length == 2
+    assert mapping == {
+        0x01: "§",
+        0x02: "æ",
+        0x10: "A",
+        0x11: "B",
+        0x12: "C",
+        0x20: "x",
+        0x21: "y",
+    }
+
+
+def test_unsupported_font_falls_back_to_pypdf(make_pdf):
+    # Drop the encoding (blanked out so the xref offsets stay valid), which
+    # leaves the font's built-in encoding to pypdf
+    data = make_pdf(LAW_PAGES).replace(b"/Encoding /WinAnsiEncoding", b" " * 26)
+    pdf = read_pdf_bytes(data, "https://example.com/law.pdf")
+    fast = FastTextReader(pdf)
+    assert [page.extract_text() for page in fast.pages] == [
+        page.extract_text() for page in pdf.pages
+    ]
+    assert list(fast.extractor.fonts.values()) == [None]
+
+
+def test_translated_pages_match_pypdf(make_pdf):
+    pdf = read_pdf_bytes(make_pdf(LAW_PAGES, transform="1 0 0 1 10 -20"), "")
+    fast = FastTextReader(pdf)
+    assert [page.extract_text() for page in fast.pages] == [
+        page.extract_text() for page in pdf.pages
+    ]
+    assert len(fast.extractor.fonts) == 1
+
+
+def test_scaled_pages_fall_back_to_pypdf(make_pdf):
+    pdf = read_pdf_bytes(make_pdf(LAW_PAGES, transform="0.5 0 0 0.5 0 0"), "")
+    fast = FastTextReader(pdf)
+    assert [page.extract_text() for page in fast.pages] == [
+        page.extract_text() for page in pdf.pages
+    ]
+    # The cm comes before any text, so no page reached the fast path
+    assert fast.extractor.fonts == {}
+
+
+def test_with_extractor(law_pdf):
+    assert with_extractor(law_pdf) is law_pdf
+    assert isinstance(with_extractor(law_pdf, "fast"), FastTextReader)
+    with pytest.raises(ValueError):
+        with_extractor(law_pdf, "ocr")
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("builder", ["make_pdf", "make_cmap_pdf"])
+def test_benchmark_extractors(request, builder):
+    pages = [
+        "".join(
+            f"§ {n * 40 + i}. Bestemmelse nummer {i} (jf. § {i + 1}, stk. 2).\n"
+            f"Stk. 2. Andet stykke med æøå og flere ord i linjen.\n"
+            for i in range(40)
+        )
+        for n in range(25)
+    ]
+    data = request.getfixturevalue(builder)(pages)
+
+    timings = {}
+    results = {}
+    for extractor in ("pypdf", "fast"):
+        pdf = with_extractor(read_pdf_bytes(data, "https://example.com/law.pdf"), extractor)
+        start = time.perf_counter()
+        results[extractor] = parse_law_paragraphs(pdf)
+        timings[extractor] = time.perf_counter() - start
+
+    assert results["fast"] == results["pypdf"]
+    assert len(results["fast"]) == 2000
+    logger.info(
+        "%s: pypdf %.2fs, fast %.2fs (%.1fx)",
+        builder,
+        timings["pypdf"],
+        timings["fast"],
+        timings["pypdf"] / timings["fast"],
+    )
@@ -0,0 +1,106 @@
+from lawcite.core.fetch_pdf import read_pdf_bytes
+from lawcite.core.furniture import (
+    SAMPLE_PAGES,
+    detect_furniture,
+    normalize_line,
+    sample_pages,
+    strip_furniture,
+    strip_page_furniture,
+)
+from lawcite.core.parse_law import parse_law_paragraphs
+
+
+def furnished(pages):
+    return [
+        f"LBK nr 1150 af 09/10/2024\n{text}Udskriftsdato: 17. maj 2025\nSide {i + 1} af {len(pages)}\n"
+        for i, text in enumerate(pages)
+    ]
+
+
+LAW_PAGES = [
+    "Kapitel 1\nIndledning\n§ 1. Første bestemmelse.\nStk. 2. Andet stykke,\n",
+    "der fortsætter.\n§ 2. Anden bestemmelse.\n",
+    "Kapitel 2\nStraf\n§ 3. Tredje bestemmelse.\n",
+    "Kapitel 3\nAfslutning\n§ 4. Fjerde bestemmelse.\n",
+]
+
+
+def test_normalize_line():
+    assert normalize_line("Side 3  af 40 ") == "Side # af #"
+    assert normalize_line("Udskriftsdato: 17. maj 2025") == "Udskriftsdato: #. maj #"
+
+
+def test_detect_furniture():
+    patterns = detect_furniture(furnished(LAW_PAGES))
+    assert patterns == [
+        ("bottom", 0, "Side # af #"),
+        ("bottom", 1, "Udskriftsdato: #. maj #"),
+        ("top", 0, "LBK nr # af #/#/#"),
+    ]
+    # Chapter headings at the top of most pages are kept
+    assert not any("Kapitel" in line for _, _, line in patterns)
+    assert detect_furniture(LAW_PAGES) == []
+    assert detect_furniture(furnished(LAW_PAGES[:1])) == []
+
+
+def test_strip_furniture():
+    text = furnished(LAW_PAGES)[1]
+    patterns = set(detect_furniture(furnished(LAW_PAGES)))
+    assert strip_furniture(text, patterns) == LAW_PAGES[1]
+    assert strip_furniture(text, set()) == text
+
+
+def test_furniture_is_not_appended_to_sections(make_pdf, cache_dir):
+    pdf = read_pdf_bytes(make_pdf(furnished(LAW_PAGES)), "https://example.com/law.pdf")
+
+    sections = parse_law_paragraphs(strip_page_furniture(pdf))
+    assert sections[("1", "1", "Stk. 2.")] == "Andet stykke, der fortsætter."
+    assert sections[("3", "4", "Stk. 1.")] == "Fjerde bestemmelse."
+    # Without the pre-pass the footer ends up in the section text
+    assert "Udskriftsdato" in parse_law_paragraphs(pdf)[("1", "1", "Stk. 2.")]
+
+    # The patterns are cached with the PDF hash and reused without sampling
+    assert len(list(cache_dir.glob("*.furniture.json"))) == 1
+    cached = strip_page_furniture(pdf)
+    assert cached.pages.texts == {}
+    assert parse_law_paragraphs(cached) == sections
+
+
+def test_sample_pages():
+    assert sample_pages(3) == [0, 1, 2]
+    assert sample_pages(100) == [0, 14, 28, 42, 57, 71, 85, 99]
+    assert len(sample_pages(SAMPLE_PAGES + 1)) == SAMPLE_PAGES
+
+
+class MockPage:
+    def __init__(self, text):
+        self.text = text
+        self.extracted = 0
+
+    def extract_text(self):
+        self.extracted += 1
+        return self.text
+
+
+class MockPdfReader:
+    def __init__(self, texts):
+        self.pages = [MockPage(text) for text in texts]
+
+
+def test_detection_samples_pages_once(cache_dir):
+    pdf = MockPdfReader(furnished(LAW_PAGES * 10))
+    stripped = strip_page_furniture(pdf)
+    assert sum(page.extracted for page in pdf.pages) == SAMPLE_PAGES
+    assert ("top", 0, "LBK nr # af #/#/#") in stripped.patterns
+
+    # The parser reads every page once, reusing the sampled texts
+    sections = parse_law_paragraphs(stripped)
+    assert [page.extracted for page in pdf.pages] == [1] * len(pdf.pages)
+    assert "Udskriftsdato" not in sections[("1", "1", "Stk. 2.")]
+
+
+def test_cache_can_be_disabled(make_pdf, cache_dir):
+    pdf = read_pdf_bytes(make_pdf(furnished(LAW_PAGES)), "https://example.com/law.pdf")
+    stripped = strip_page_furniture(pdf, cache=False)
+    assert len(stripped.patterns) == 3
+    assert not list(cache_dir.glob("*.furniture.json"))
@@ -0,0 +1,99 @@
+import json
+from lawcite.core.keys import build_key_table, law_id_of_key, make_citation_key, make_law_id
+from lawcite.core.save_jsonl import iter_jsonl_records
+from lawcite.core.subset import CITE_KEY_PATTERN
+
+
+def test_make_law_id():
+    assert make_law_id("Konkurrenceloven") == "konkurrenceloven"
+    assert make_law_id("Lov om fuldbyrdelse af straf m.v.") == "lovomfuldbyrdelseafstrafmv"
+
+
+def test_law_id_of_key():
+    assert law_id_of_key("konkurrencelovenp9stk2") == "konkurrenceloven"
+    assert law_id_of_key("konkurrencelovenp15astk1kap12_2") == "konkurrenceloven"
+    assert law_id_of_key("vejledning_para12") == "vejledning"
+    assert law_id_of_key("knuth1984") is None
+
+
+def test_build_key_table():
+    table = build_key_table(
+        [("1", "9", "Stk. 2."), ("2", "15 a", "Stk. 1."), "para3"], "lov"
+    )
+    assert table == {
+        ("1", "9", "Stk. 2."): "lovp9stk2",
+        ("2", "15 a", "Stk. 1."): "lovp15astk1",
+        "para3": "lov_para3",
+    }
+    assert table[("1", "9", "Stk. 2.")] == make_citation_key("lov", ("1", "9", "Stk. 2."))
+
+
+def test_build_key_table_disambiguates_duplicates(caplog):
+    sections = [
+        ("1", "1", "Stk. 1."),
+        ("2", "15a", "Stk. 1."),
+        ("12", "1", "Stk. 1."),  # § 1 repeated in an annex chapter
+        ("3", "15 a", "Stk. 1."),
+        ("12", " 1", "Stk. 1."),
+    ]
+    table = build_key_table(sections, "lov")
+
+    assert list(table.values()) == [
+        "lovp1stk1",
+        "lovp15astk1",
+        "lovp1stk1kap12",
+        "lovp15astk1kap3",
+        "lovp1stk1kap12_2",
+    ]
+    assert build_key_table(sections, "lov") == table
+    assert "Duplicate citation key lovp1stk1" in caplog.text
+    for key in table.values():
+        assert CITE_KEY_PATTERN.fullmatch(key.encode())
+
+
+def test_streaming_records_match_key_table():
+    sections = {("1", "1", "Stk. 1."): "A.", ("12", "1", "Stk. 1."): "B."}
+    table = build_key_table(sections, "lov")
+
+    streamed = [r["key"] for r in iter_jsonl_records(sections.items(), "lov", "", "", "", "lov")]
+    shared = [r["key"] for r in iter_jsonl_records(sections.items(), "lov", "", "", "", "lov", table)]
+    assert streamed == shared == list(table.values())
+    json.dumps(streamed)
+
+
+def test_restarted_numbering_keeps_both_sections():
+    from lawcite.core.parse_law import iter_law_paragraphs, parse_law_paragraphs
+
+    class Page:
+        def __init__(self, text):
+            self.text = text
+
+        def extract_text(self):
+            return self.text
+
+    class Pdf:
+        pages = [
+            Page("Kapitel 1\nIndledning\n§ 1. Første.\n§ 2. Anden.\n"),
+            Page("Bilag 1\n§ 1. Bilagets første.\n§ 2. Bilagets anden.\n"),
+        ]
+
+    sections = parse_law_paragraphs(Pdf())
+    assert sections == {
+        ("1", "1", "Stk. 1."): "Første.",
+        ("1", "2", "Stk. 1."): "Anden. Bilag 1",
+        ("1_2", "1", "Stk. 1."): "Bilagets første.",
+        ("1_2", "2", "Stk. 1."): "Bilagets anden.",
+    }
+    table = build_key_table(sections, "lov")
+    assert list(table.values()) == [
+        "lovp1stk1",
+        "lovp2stk1",
+        "lovp1stk1kap1_2",
+        "lovp2stk1kap1_2",
+    ]
+    # The streaming JSON Lines path sees the same sections and keys
+    streamed = [r["key"] for r in iter_jsonl_records(iter_law_paragraphs(Pdf()), "lov", "", "", "", "lov")]
+    assert streamed == list(table.values())
+    for key in table.values():
+        assert CITE_KEY_PATTERN.fullmatch(key.encode())
+        assert law_id_of_key(key) == "lov"
@@ -0,0 +1,110 @@
+import json
+import threading
+import pytest
+from lawcite.core.merge_bibtex import (
+    index_path,
+    load_bibtex_index,
+    scan_bibtex_entries,
+    upsert_bibtex_entries,
+)
+
+
+def entry(key, title):
+    return f"@article{{{key},\n title = {{{title}}}\n}}\n"
+
+
+def test_scan_bibtex_entries():
+    data = b"% comment\n" + entry("ap1stk1", "A").encode() + b"\n" + entry("bp1stk1", "B").encode()
+    spans = scan_bibtex_entries(data)
+    assert list(spans) == ["ap1stk1", "bp1stk1"]
+    start, end = spans["ap1stk1"]
+    assert data[start:end].startswith(b"@article{ap1stk1,")
+    assert spans["bp1stk1"][1] == len(data)
+
+
+def test_scan_rejects_duplicate_keys():
+    data = entry("ap1stk1", "A").encode() + entry("ap1stk1", "B").encode()
+    with pytest.raises(ValueError, match="ap1stk1"):
+        scan_bibtex_entries(data)
+
+
+def test_upsert_replaces_and_appends(tmp_path):
+    master = str(tmp_path / "master.bib")
+    upsert_bibtex_entries(master, "a", {"ap1stk1": entry("ap1stk1", "A1"), "ap2stk1": entry("ap2stk1", "A2")})
+    upsert_bibtex_entries(master, "b", {"bp1stk1": entry("bp1stk1", "B1")})
+    upsert_bibtex_entries(master, "a", {"ap1stk1": entry("ap1stk1", "A1 new"), "ap3stk1": entry("ap3stk1", "A3")})
+
+    with open(master, "r", encoding="utf-8") as f:
+        content = f.read()
+    assert "A1 new" in content
+    assert "ap2stk1" not in content
+    assert content.index("ap1stk1") < content.index("bp1stk1") < content.index("ap3stk1")
+
+    index = load_bibtex_index(master)
+    assert index["laws"] == {"b": ["bp1stk1"], "a": ["ap1stk1", "ap3stk1"]}
+    data = content.encode("utf-8")
+    for key, (start, end) in index["entries"].items():
+        assert data[start:end].startswith(f"@article{{{key},".encode())
+
+
+def test_partial_upsert_keeps_other_entries(tmp_path):
+    master = str(tmp_path / "master.bib")
+    upsert_bibtex_entries(master, "a", {"ap1stk1": entry("ap1stk1", "A1"), "ap2stk1": entry("ap2stk1", "A2")})
+    # Re-merging a selection only replaces and adds the selected entries
+    upsert_bibtex_entries(
+        master,
+        "a",
+        {"ap2stk1": entry("ap2stk1", "A2 new"), "ap245stk1": entry("ap245stk1", "A245")},
+        prune=False,
+    )
+
+    with open(master, "r", encoding="utf-8") as f:
+        content = f.read()
+    assert "A1" in content and "A2 new" in content and "A245" in content
+    assert load_bibtex_index(master)["laws"] == {"a": ["ap1stk1", "ap2stk1", "ap245stk1"]}
+    # A later full conversion prunes again
+    upsert_bibtex_entries(master, "a", {"ap1stk1": entry("ap1stk1", "A1")})
+    assert list(load_bibtex_index(master)["entries"]) == ["ap1stk1"]
+
+
+def test_upsert_rebuilds_stale_index(tmp_path):
+    master = tmp_path / "master.bib"
+    master.write_text(entry("xp1stk1", "X") + "\n" + entry("ap1stk1", "old"), encoding="utf-8")
+    upsert_bibtex_entries(str(master), "a", {"ap1stk1": entry("ap1stk1", "new")})
+
+    content = master.read_text(encoding="utf-8")
+    assert "xp1stk1" in content and "new" in content and "old" not in content
+    with open(index_path(str(master)), "r", encoding="utf-8") as f:
+        assert set(json.load(f)["entries"]) == {"xp1stk1", "ap1stk1"}
+
+
+def test_upsert_after_external_edit_keeps_law_keys(tmp_path):
+    master = tmp_path / "master.bib"
+    upsert_bibtex_entries(str(master), "a", {"ap1stk1": entry("ap1stk1", "A1"), "ap2stk1": entry("ap2stk1", "A2")})
+    # Edited by hand, which invalidates the index
+    master.write_text(master.read_text(encoding="utf-8") + entry("other2020", "Book"), encoding="utf-8")
+
+    index = load_bibtex_index(str(master))
+    assert index["laws"] == {"a": ["ap1stk1", "ap2stk1"]}
+
+    upsert_bibtex_entries(str(master), "a", {"ap1stk1": entry("ap1stk1", "A1 new")})
+    with open(master, "rb") as f:
+        assert list(scan_bibtex_entries(f.read())) == ["ap1stk1", "other2020"]
+
+
+def test_concurrent_upserts(tmp_path):
+    master = str(tmp_path / "master.bib")
+
+    def worker(law):
+        for i in range(5):
+            upsert_bibtex_entries(master, law, {f"{law}p{i}stk1": entry(f"{law}p{i}stk1", law)})
+
+    threads = [threading.Thread(target=worker, args=(law,)) for law in ("a", "b", "c", "d")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with open(master, "rb") as f:
+        keys = set(scan_bibtex_entries(f.read()))
+    assert keys == {"ap4stk1", "bp4stk1", "cp4stk1", "dp4stk1"}
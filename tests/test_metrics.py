@@ -0,0 +1,53 @@
+import json
+import logging
+import requests
+from lawcite.core.log import JsonFormatter
+from lawcite.core.metrics import Registry, serve_metrics, write_metrics
+
+
+def test_render_prometheus_text():
+    registry = Registry()
+    documents = registry.counter("lawcite_documents_total", "Documents processed", ["status"])
+    seconds = registry.histogram("lawcite_stage_seconds", "Stage latency", ["stage"], buckets=(0.1, 1.0))
+    documents.inc(status="ok")
+    documents.inc(2, status="ok")
+    documents.inc(status="error")
+    seconds.observe(0.05, stage="parse")
+    seconds.observe(0.5, stage="parse")
+
+    text = registry.render()
+    assert "# TYPE lawcite_documents_total counter" in text
+    assert 'lawcite_documents_total{status="ok"} 3' in text
+    assert 'lawcite_documents_total{status="error"} 1' in text
+    assert 'lawcite_stage_seconds_bucket{stage="parse",le="0.1"} 1' in text
+    assert 'lawcite_stage_seconds_bucket{stage="parse",le="1"} 2' in text
+    assert 'lawcite_stage_seconds_bucket{stage="parse",le="+Inf"} 2' in text
+    assert 'lawcite_stage_seconds_count{stage="parse"} 2' in text
+
+
+def test_write_and_serve_metrics(tmp_path):
+    registry = Registry()
+    registry.counter("lawcite_pages_total", "PDF pages extracted").inc(7)
+
+    path = tmp_path / "lawcite.prom"
+    write_metrics(str(path), registry)
+    assert "lawcite_pages_total 7" in path.read_text(encoding="utf-8")
+
+    server = serve_metrics(0, registry=registry)
+    try:
+        response = requests.get(f"http://127.0.0.1:{server.server_address[1]}/metrics", timeout=5)
+        assert response.status_code == 200
+        assert "lawcite_pages_total 7" in response.text
+    finally:
+        server.shutdown()
+
+
+def test_json_log_formatter_includes_extra_fields():
+    record = logging.getLogger("lawcite.test").makeRecord(
+        "lawcite.test", logging.INFO, __file__, 1, "Loaded PDF content from %s",
+        ("https://example.com",), None, extra={"url": "https://example.com"},
+    )
+    data = json.loads(JsonFormatter().format(record))
+    assert data["message"] == "Loaded PDF content from https://example.com"
+    assert data["url"] == "https://example.com"
+    assert data["level"] == "INFO"
@@ -2,6 +2,8 @@ import pytest
 from unittest.mock import patch, Mock
 from lawcite.cli.main import process_law_pdf, process_general_pdf
 import io
+import json
+import logging
 import yaml
 import os
 
@@ -76,10 +78,11 @@ def mock_general_pdf_reader():
     return MockPdfReader()
 
 
-def test_process_law_pdf(tmp_path, capsys, mock_pdf_content, mock_law_pdf_reader):
+def test_process_law_pdf(tmp_path, caplog, mock_pdf_content, mock_law_pdf_reader):
     input_url = "https://www.retsinformation.dk/api/pdf/244970"
     output_file = tmp_path / "konkurrenceloven.bib"
 
+    caplog.set_level(logging.INFO, logger="lawcite")
     with (
         patch("requests.get") as mock_get,
         patch("lawcite.core.fetch_pdf.PdfReader") as mock_reader,
@@ -94,9 +97,8 @@ def test_process_law_pdf(tmp_path, capsys, mock_pdf_content, mock_law_pdf_reader
 
         process_law_pdf(input_url, output_filename=str(output_file))
 
-    captured = capsys.readouterr()
-    assert f"Loaded PDF content from {input_url}" in captured.out
-    assert f"Written BibTeX output to {output_file}" in captured.out
+    assert f"Loaded PDF content from {input_url}" in caplog.text
+    assert f"Written BibTeX output to {output_file}" in caplog.text
     assert output_file.exists()
 
     with open(output_file, "r", encoding="utf-8") as f:
@@ -106,10 +108,11 @@ def test_process_law_pdf(tmp_path, capsys, mock_pdf_content, mock_law_pdf_reader
     assert "author = {Konkurrenceloven §9 Stk. 2.,}" in bib_content
 
 
-def test_process_law_yaml(tmp_path, capsys, mock_pdf_content, mock_law_pdf_reader):
+def test_process_law_yaml(tmp_path, caplog, mock_pdf_content, mock_law_pdf_reader):
     input_url = "https://www.retsinformation.dk/api/pdf/244970"
     output_file = tmp_path / "konkurrenceloven.yaml"
 
+    caplog.set_level(logging.INFO, logger="lawcite")
     with (
         patch("requests.get") as mock_get,
         patch("lawcite.core.fetch_pdf.PdfReader") as mock_reader,
@@ -124,9 +127,8 @@ def test_process_law_yaml(tmp_path, capsys, mock_pdf_content, mock_law_pdf_reade
 
         process_law_pdf(input_url, output_filename=str(output_file))
 
-    captured = capsys.readouterr()
-    assert f"Loaded PDF content from {input_url}" in captured.out
-    assert f"Written Hayagriva YAML output to {output_file}" in captured.out
+    assert f"Loaded PDF content from {input_url}" in caplog.text
+    assert f"Written Hayagriva YAML output to {output_file}" in caplog.text
     assert output_file.exists()
 
     with open(output_file, "r", encoding="utf-8") as f:
@@ -142,10 +144,11 @@ def test_process_law_yaml(tmp_path, capsys, mock_pdf_content, mock_law_pdf_reade
     assert entry["date"] == "2024-11-03"
 
 
-def test_process_law_md(tmp_path, capsys, mock_pdf_content, mock_law_pdf_reader):
+def test_process_law_md(tmp_path, caplog, mock_pdf_content, mock_law_pdf_reader):
     input_url = "https://www.retsinformation.dk/api/pdf/244970"
     output_file = tmp_path / "konkurrenceloven.md"
 
+    caplog.set_level(logging.INFO, logger="lawcite")
     with (
         patch("requests.get") as mock_get,
         patch("lawcite.core.fetch_pdf.PdfReader") as mock_reader,
@@ -160,9 +163,8 @@ def test_process_law_md(tmp_path, capsys, mock_pdf_content, mock_law_pdf_reader)
 
         process_law_pdf(input_url, output_filename=str(output_file))
 
-    captured = capsys.readouterr()
-    assert f"Loaded PDF content from {input_url}" in captured.out
-    assert f"Written Markdown output to {output_file}" in captured.out
+    assert f"Loaded PDF content from {input_url}" in caplog.text
+    assert f"Written Markdown output to {output_file}" in caplog.text
     assert output_file.exists()
 
     with open(output_file, "r", encoding="utf-8") as f:
@@ -175,10 +177,11 @@ def test_process_law_md(tmp_path, capsys, mock_pdf_content, mock_law_pdf_reader)
     assert "Konkurrence- og Forbrugerstyrelsen" in md_content
 
 
-def test_process_general_yaml(tmp_path, capsys, mock_pdf_content, mock_general_pdf_reader):
+def test_process_general_yaml(tmp_path, caplog, mock_pdf_content, mock_general_pdf_reader):
     input_url = "https://www.retsinformation.dk/api/pdf/233142"
     output_file = tmp_path / "psykolognaevnetsvejledenderetningslinjerforautoriseredepsykologer.yaml"
 
+    caplog.set_level(logging.INFO, logger="lawcite")
     with (
         patch("requests.get") as mock_get,
         patch("lawcite.core.fetch_pdf.PdfReader") as mock_reader,
@@ -193,9 +196,8 @@ def test_process_general_yaml(tmp_path, capsys, mock_pdf_content, mock_general_p
 
         process_general_pdf(input_url, output_filename=str(output_file))
 
-    captured = capsys.readouterr()
-    assert f"Loaded PDF content from {input_url}" in captured.out
-    assert f"Written Hayagriva YAML output to {output_file}" in captured.out
+    assert f"Loaded PDF content from {input_url}" in caplog.text
+    assert f"Written Hayagriva YAML output to {output_file}" in caplog.text
     assert output_file.exists()
 
     with open(output_file, "r", encoding="utf-8") as f:
@@ -211,10 +213,11 @@ def test_process_general_yaml(tmp_path, capsys, mock_pdf_content, mock_general_p
     assert entry["date"] == "2021-06-03"
 
 
-def test_process_general_md(tmp_path, capsys, mock_pdf_content, mock_general_pdf_reader):
+def test_process_general_md(tmp_path, caplog, mock_pdf_content, mock_general_pdf_reader):
     input_url = "https://www.retsinformation.dk/api/pdf/233142"
     output_file = tmp_path / "psykolognaevnetsvejledenderetningslinjerforautoriseredepsykologer.md"
 
+    caplog.set_level(logging.INFO, logger="lawcite")
     with (
         patch("requests.get") as mock_get,
         patch("lawcite.core.fetch_pdf.PdfReader") as mock_reader,
@@ -229,9 +232,8 @@ def test_process_general_md(tmp_path, capsys, mock_pdf_content, mock_general_pdf
 
         process_general_pdf(input_url, output_filename=str(output_file))
 
-    captured = capsys.readouterr()
-    assert f"Loaded PDF content from {input_url}" in captured.out
-    assert f"Written Markdown output to {output_file}" in captured.out
+    assert f"Loaded PDF content from {input_url}" in caplog.text
+    assert f"Written Markdown output to {output_file}" in caplog.text
     assert output_file.exists()
 
     with open(output_file, "r", encoding="utf-8") as f:
@@ -246,7 +248,7 @@ def test_process_general_md(tmp_path, capsys, mock_pdf_content, mock_general_pdf
 
 
 def test_process_general_pdf(
-    tmp_path, capsys, mock_pdf_content, mock_general_pdf_reader
+    tmp_path, caplog, mock_pdf_content, mock_general_pdf_reader
 ):
     input_url = "https://www.retsinformation.dk/api/pdf/233142"
     output_file = (
@@ -254,6 +256,7 @@ def test_process_general_pdf(
         / "psykolognaevnetsvejledenderetningslinjerforautoriseredepsykologer.bib"
     )
 
+    caplog.set_level(logging.INFO, logger="lawcite")
     with (
         patch("requests.get") as mock_get,
         patch("lawcite.core.fetch_pdf.PdfReader") as mock_reader,
@@ -268,9 +271,8 @@ def test_process_general_pdf(
 
         process_general_pdf(input_url, output_filename=str(output_file))
 
-    captured = capsys.readouterr()
-    assert f"Loaded PDF content from {input_url}" in captured.out
-    assert f"Written BibTeX output to {output_file}" in captured.out
+    assert f"Loaded PDF content from {input_url}" in caplog.text
+    assert f"Written BibTeX output to {output_file}" in caplog.text
     assert output_file.exists()
 
     with open(output_file, "r", encoding="utf-8") as f:
@@ -292,3 +294,58 @@ def test_process_general_pdf(
         in bib_content
     )
     assert "author = {Psykolognævnets vejledende retningslinjer for autoriserede psykologer Paragraph para1,}" in bib_content
+
+
+def test_process_law_jsonl(tmp_path, caplog, mock_pdf_content, mock_law_pdf_reader):
+    input_url = "https://www.retsinformation.dk/api/pdf/244970"
+    output_file = tmp_path / "konkurrenceloven.jsonl"
+
+    caplog.set_level(logging.INFO, logger="lawcite")
+    with (
+        patch("requests.get") as mock_get,
+        patch("lawcite.core.fetch_pdf.PdfReader") as mock_reader,
+    ):
+        mock_response = Mock()
+        mock_response.content = mock_pdf_content.read()
+        mock_response.headers = {"Content-Type": "application/pdf"}
+        mock_response.raise_for_status = Mock()
+        mock_get.return_value = mock_response
+
+        mock_reader.return_value = mock_law_pdf_reader
+
+        process_law_pdf(input_url, output_filename=str(output_file))
+
+    assert f"Written JSON Lines output to {output_file}" in caplog.text
+    assert output_file.exists()
+
+    with open(output_file, "r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [r["key"] for r in records] == [
+        "konkurrencelovenp9stk1",
+        "konkurrencelovenp9stk2",
+    ]
+    assert records[0]["law_id"] == "konkurrenceloven"
+    assert records[0]["paragraph"] == "9"
+    assert records[0]["url"] == input_url
+    assert records[0]["date"] == "2024-11-03"
+
+
+def test_partial_merge_keeps_other_chapters(tmp_path, make_pdf):
+    from lawcite.core.fetch_pdf import read_pdf_bytes
+
+    pages = [
+        "Kapitel 1\nIndledning\n§ 1. Første bestemmelse.\n§ 2. Anden bestemmelse.\n",
+        "Kapitel 27\nStraf\n§ 245. Vold.\n",
+    ]
+    master = tmp_path / "master.bib"
+    url = "https://www.retsinformation.dk/api/pdf/244970"
+    with patch(
+        "lawcite.cli.main.fetch_pdf_content",
+        side_effect=lambda *args: read_pdf_bytes(make_pdf(pages), url),
+    ):
+        process_law_pdf(url, merge_into=str(master))
+        process_law_pdf(url, chapters="27", merge_into=str(master))
+
+    content = master.read_text(encoding="utf-8")
+    for key in ("konkurrencelovenp1stk1", "konkurrencelovenp2stk1", "konkurrencelovenp245stk1"):
+        assert f"{{{key}," in content
@@ -0,0 +1,79 @@
+import logging
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from lawcite.core.probe import probe_metadata
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Serve a PDF body, honouring single Range requests if enabled."""
+
+    body = b""
+    support_ranges = True
+    bytes_sent = 0
+
+    def do_GET(self):
+        match = re.match(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        if self.support_ranges and match:
+            start, end = int(match.group(1)), min(int(match.group(2)), len(self.body) - 1)
+            data = self.body[start : end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(self.body)}")
+        else:
+            data = self.body
+            self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        RangeHandler.bytes_sent += len(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def law_pdf_bytes(make_pdf):
+    first_page = (
+        "LBK nr 1150 af 03/11/2024\n"
+        "Bekendtgørelse af konkurrenceloven\n"
+        "Ministerium: Erhvervsministeriet Journalnummer: 2024-123\n"
+        "Kapitel 1\n"
+        "Indledning"
+    )
+    filler = "\n".join(f"§ {n}. Konkurrence- og Forbrugerstyrelsen kan {n}." for n in range(60))
+    return make_pdf([first_page] + [filler] * 60)
+
+
+@pytest.fixture
+def server(law_pdf_bytes):
+    RangeHandler.body = law_pdf_bytes
+    RangeHandler.bytes_sent = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/api/pdf/244970"
+    httpd.shutdown()
+
+
+EXPECTED = ("2024-11-03", "Erhvervsministeriet", "konkurrenceloven")
+
+
+def test_probe_metadata_with_ranges(server, law_pdf_bytes, caplog):
+    caplog.set_level(logging.INFO, logger="lawcite")
+    RangeHandler.support_ranges = True
+    url, date, author, title = probe_metadata(server, block_size=4096)
+
+    assert url == server
+    assert (date, author, title) == EXPECTED
+    assert RangeHandler.bytes_sent < len(law_pdf_bytes) / 4
+    assert f"of {len(law_pdf_bytes)} bytes from {server}" in caplog.text
+
+
+def test_probe_metadata_without_ranges(server, law_pdf_bytes):
+    RangeHandler.support_ranges = False
+    url, date, author, title = probe_metadata(server, block_size=4096)
+
+    assert (date, author, title) == EXPECTED
+    assert RangeHandler.bytes_sent == len(law_pdf_bytes)
@@ -0,0 +1,111 @@
+import json
+from lawcite.core.keys import build_key_table
+from lawcite.core.references import (
+    build_reference_graph,
+    graph_to_dot,
+    graph_to_json,
+    invert_graph,
+    save_graph,
+)
+
+SECTIONS = {
+    ("1", "9", "Stk. 1."): "Ansøgning indgives efter reglerne i stk. 2 og 3.",
+    ("1", "9", "Stk. 2."): "Ansøgningen skal være skriftlig.",
+    ("1", "9", "Stk. 3."): "Fristen følger af § 12, stk. 2, jf. § 15 a.",
+    ("2", "12", "Stk. 1."): "Bestemmelserne i § 9 finder anvendelse.",
+    ("2", "12", "Stk. 2."): "Fristen er 4 uger, jf. § 9, stk. 2, og § 99 i lov om noget.",
+    ("2", "15a", "Stk. 1."): "Ministeren kan fastsætte regler om stk. 1.",
+}
+
+
+def test_build_reference_graph():
+    graph = build_reference_graph(SECTIONS)
+
+    assert graph[("1", "9", "Stk. 1.")] == [("1", "9", "Stk. 2."), ("1", "9", "Stk. 3.")]
+    assert graph[("1", "9", "Stk. 3.")] == [("2", "12", "Stk. 2."), ("2", "15a", "Stk. 1.")]
+    # A whole § resolves to all of its sections
+    assert graph[("2", "12", "Stk. 1.")] == [
+        ("1", "9", "Stk. 1."),
+        ("1", "9", "Stk. 2."),
+        ("1", "9", "Stk. 3."),
+    ]
+    # Unknown paragraphs and self-references are dropped
+    assert graph[("2", "12", "Stk. 2.")] == [("1", "9", "Stk. 2.")]
+    assert ("2", "15a", "Stk. 1.") not in graph
+    assert ("1", "9", "Stk. 2.") not in graph
+
+
+def test_paragraph_lists_and_suffixes():
+    sections = {
+        ("1", "3", "Stk. 1."): "Tredje.",
+        ("1", "4", "Stk. 1."): "Fjerde.",
+        ("1", "4", "Stk. 2."): "Fjerde andet.",
+        ("1", "5", "Stk. 1."): "Femte.",
+        ("1", "9", "Stk. 1."): "Niende.",
+        ("1", "9a", "Stk. 1."): "Niende a.",
+        ("2", "20", "Stk. 1."): "Reglerne i §§ 3-5 gælder.",
+        ("2", "21", "Stk. 1."): "Reglerne i §§ 3 og 4, stk. 2, gælder.",
+        ("2", "22", "Stk. 1."): "Efter § 9 i denne lov og § 9 a, stk. 1.",
+    }
+    graph = build_reference_graph(sections)
+
+    # A range after §§ is expanded
+    assert graph[("2", "20", "Stk. 1.")] == [
+        ("1", "3", "Stk. 1."),
+        ("1", "4", "Stk. 1."),
+        ("1", "4", "Stk. 2."),
+        ("1", "5", "Stk. 1."),
+    ]
+    # So is a list, with a trailing stk. applying to the last paragraph
+    assert graph[("2", "21", "Stk. 1.")] == [("1", "3", "Stk. 1."), ("1", "4", "Stk. 2.")]
+    # "i denne lov" is not a letter suffix, "9 a," is
+    assert graph[("2", "22", "Stk. 1.")] == [("1", "9", "Stk. 1."), ("1", "9a", "Stk. 1.")]
+
+
+def test_references_to_other_laws_are_skipped():
+    sections = {
+        ("1", "2", "Stk. 1."): "Andet.",
+        ("1", "3", "Stk. 1."): "Tredje.",
+        ("1", "5", "Stk. 1."): "Femte.",
+        ("1", "5", "Stk. 2."): "Femte andet.",
+        ("2", "10", "Stk. 1."): "Efter § 2 i lov om finansiel virksomhed, jf. § 5 i straffeloven.",
+        ("2", "11", "Stk. 1."): "Jf. § 5, stk. 2, i straffeloven og §§ 2 og 3 i bekendtgørelse nr. 12.",
+        ("2", "12", "Stk. 1."): "Efter § 3 i loven og § 5, stk. 2, i denne lov.",
+    }
+    graph = build_reference_graph(sections)
+
+    assert ("2", "10", "Stk. 1.") not in graph
+    assert ("2", "11", "Stk. 1.") not in graph
+    # "i loven" and "i denne lov" refer to the document itself
+    assert graph[("2", "12", "Stk. 1.")] == [("1", "3", "Stk. 1."), ("1", "5", "Stk. 2.")]
+
+
+def test_invert_graph():
+    cited_by = invert_graph(build_reference_graph(SECTIONS))
+
+    assert cited_by[("1", "9", "Stk. 2.")] == [
+        ("1", "9", "Stk. 1."),
+        ("2", "12", "Stk. 1."),
+        ("2", "12", "Stk. 2."),
+    ]
+    assert ("2", "12", "Stk. 1.") not in cited_by
+
+
+def test_export_graph(tmp_path):
+    graph = build_reference_graph(SECTIONS)
+    keys = build_key_table(SECTIONS, "lov")
+
+    data = json.loads(graph_to_json(graph, "lov", keys))
+    assert data["law_id"] == "lov"
+    assert ["lovp9stk3", "lovp15astk1"] in data["edges"]
+    assert len(data["nodes"]) == len(set(data["nodes"]))
+
+    dot = graph_to_dot(graph, "lov", keys)
+    assert dot.startswith('digraph "lov" {')
+    assert '"lovp12stk2" -> "lovp9stk2";' in dot
+    assert '"lovp15astk1" [label="§ 15a Stk. 1."];' in dot
+
+    save_graph(graph, "lov", keys, str(tmp_path / "graph.dot"))
+    save_graph(graph, "lov", keys, str(tmp_path / "graph.json"))
+    assert (tmp_path / "graph.dot").read_text(encoding="utf-8") == dot
+    assert json.loads((tmp_path / "graph.json").read_text(encoding="utf-8")) == data
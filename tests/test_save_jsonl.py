@@ -0,0 +1,87 @@
+import gzip
+import json
+from lawcite.core.parse_law import iter_law_paragraphs, parse_law_paragraphs
+from lawcite.core.save_jsonl import save_jsonl
+
+
+class MockPage:
+    def __init__(self, text):
+        self.text = text
+
+    def extract_text(self):
+        return self.text
+
+
+class MockPdfReader:
+    def __init__(self, texts):
+        self.pages = [MockPage(text) for text in texts]
+
+
+def test_iter_law_paragraphs_streams_completed_sections():
+    pdf = MockPdfReader(
+        [
+            "Kapitel 1\nIndledning\n§ 1. Første.\nStk. 2. Andet\n",
+            "fortsat.\n§ 2. Tredje.\n",
+        ]
+    )
+    stream = iter_law_paragraphs(pdf)
+    assert next(stream) == (("1", "1", "Stk. 1."), "Første.")
+    assert list(stream) == [
+        (("1", "1", "Stk. 2."), "Andet fortsat."),
+        (("1", "2", "Stk. 1."), "Tredje."),
+    ]
+    assert list(parse_law_paragraphs(pdf)) == [
+        ("1", "1", "Stk. 1."),
+        ("1", "1", "Stk. 2."),
+        ("1", "2", "Stk. 1."),
+    ]
+
+
+def test_save_jsonl_law(tmp_path):
+    output_filename = tmp_path / "konkurrenceloven.jsonl.gz"
+    sections = iter(
+        [
+            (("1", "9", "Stk. 1."), "Konkurrence- og Forbrugerstyrelsen kan..."),
+            (("1", "9", "Stk. 2."), "Konkurrence- og Forbrugerstyrelsen kan undlade..."),
+        ]
+    )
+
+    count = save_jsonl(
+        sections,
+        "konkurrenceloven",
+        "Erhvervsministeriet",
+        "https://example.com",
+        "2024-11-03",
+        "konkurrenceloven",
+        str(output_filename),
+    )
+
+    assert count == 2
+    with gzip.open(output_filename, "rt", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert records[1]["key"] == "konkurrencelovenp9stk2"
+    assert records[1]["chapter"] == "1"
+    assert records[1]["paragraph"] == "9"
+    assert records[1]["section"] == "Stk. 2."
+    assert records[1]["url"] == "https://example.com"
+    assert records[1]["date"] == "2024-11-03"
+
+
+def test_save_jsonl_general(tmp_path):
+    output_filename = tmp_path / "vejledning.jsonl"
+
+    save_jsonl(
+        [("para1", "Disse retningslinjer fastsætter principper.")],
+        "Vejledning",
+        "Social- og Boligministeriet",
+        "https://example.com",
+        "2021-06-03",
+        "vejledning",
+        str(output_filename),
+    )
+
+    record = json.loads(output_filename.read_text(encoding="utf-8"))
+    assert record["key"] == "vejledning_para1"
+    assert record["chapter"] is None
+    assert record["paragraph"] == "para1"
+    assert record["text"] == "Disse retningslinjer fastsætter principper."
@@ -1,5 +1,7 @@
 import pytest
-from lawcite.core.save_md import save_markdown
+import json
+import os
+from lawcite.core.save_md import estimate_size, render_markdown, save_markdown, save_markdown_chunks
 
 
 def test_save_markdown_law(tmp_path):
@@ -67,3 +69,114 @@ def test_save_markdown_general(tmp_path):
     assert "Disse retningslinjer" in content
     assert "Psykologer skal handle" in content
     assert "Psykologer skal sikre" in content
+
+
+def test_save_markdown_chunks_law(tmp_path):
+    paragraph_content = {
+        ("1", "1", "Stk. 1."): "a" * 60,
+        ("1", "1", "Stk. 2."): "b" * 60,
+        ("2", "2", "Stk. 1."): "c" * 60,
+        ("2", "2", "Stk. 2."): "d" * 300,
+    }
+    output_filename = tmp_path / "law.md"
+
+    files = save_markdown_chunks(
+        paragraph_content,
+        "konkurrenceloven",
+        "Erhvervsministeriet",
+        "https://example.com",
+        "2024-11-03",
+        "konkurrenceloven",
+        str(output_filename),
+        chunk_size=250,
+    )
+
+    assert [os.path.basename(f) for f in files] == ["law.001.md", "law.002.md", "law.003.md"]
+    first = (tmp_path / "law.001.md").read_text(encoding="utf-8")
+    assert first.startswith("# konkurrenceloven\n\n> Kapitel 1 › § 1 › Stk. 1.")
+    assert "Stk. 2.: " + "b" * 60 in first
+    assert len(first) <= 250
+
+    second = (tmp_path / "law.002.md").read_text(encoding="utf-8")
+    assert "> Kapitel 2 › § 2 › Stk. 1." in second
+    assert "## Kapitel 2\n\n### § 2\n\nStk. 1.: " + "c" * 60 in second
+
+    # An oversized Stk. is kept whole in a chunk of its own
+    third = (tmp_path / "law.003.md").read_text(encoding="utf-8")
+    assert "## Kapitel 2\n\n### § 2\n\nStk. 2.: " + "d" * 300 in third
+
+    with open(tmp_path / "law.chunks.json", "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert [c["sections"] for c in manifest["chunks"]] == [2, 1, 1]
+    assert manifest["chunks"][0]["first"] == "konkurrencelovenp1stk1"
+    assert manifest["chunks"][0]["last"] == "konkurrencelovenp1stk2"
+    assert manifest["chunks"][2]["first"] == "konkurrencelovenp2stk2"
+
+
+def test_save_markdown_chunks_split_inside_paragraph(tmp_path):
+    # The headings repeated at the top of a chunk count towards its size
+    paragraph_content = {("1", "1", f"Stk. {i}."): "x" * 25 for i in range(1, 11)}
+    files = save_markdown_chunks(
+        paragraph_content,
+        "lov",
+        "Ministeriet",
+        "https://example.com",
+        "2024-11-03",
+        "lov",
+        str(tmp_path / "lov.md"),
+        chunk_size=150,
+    )
+
+    assert len(files) > 2
+    for filename in files:
+        content = open(filename, encoding="utf-8").read()
+        assert "## Kapitel 1\n\n### § 1\n\n" in content
+        assert len(content) <= 150
+    manifest = json.loads((tmp_path / "lov.chunks.json").read_text(encoding="utf-8"))
+    assert sum(c["sections"] for c in manifest["chunks"]) == 10
+    assert all(c["size"] <= 150 for c in manifest["chunks"])
+
+
+def test_save_markdown_chunks_general_tokens(tmp_path):
+    paragraph_content = {f"para{i}": "word " * 20 for i in range(1, 7)}
+    output_filename = tmp_path / "doc.md"
+
+    files = save_markdown_chunks(
+        paragraph_content,
+        "Vejledning",
+        "Social- og Boligministeriet",
+        "https://example.com",
+        "2021-06-03",
+        "vejledning",
+        str(output_filename),
+        chunk_size=80,
+        chunk_unit="tokens",
+    )
+
+    assert len(files) == 3
+    for filename in files:
+        content = open(filename, encoding="utf-8").read()
+        assert content.startswith("# Vejledning\n\n> Paragraph ")
+        assert estimate_size(content, "tokens") <= 80
+
+
+def test_render_markdown_sorts_numerically():
+    paragraph_content = {
+        ("10", "10", "Stk. 1."): "Tiende kapitel.",
+        ("2", "10", "Stk. 10."): "Tiende stykke.",
+        ("2", "10", "Stk. 2."): "Andet stykke.",
+        ("2", "2", "Stk. 1."): "Anden paragraf.",
+        ("2", "2a", "Stk. 1."): "Paragraf 2 a.",
+    }
+    content = render_markdown(paragraph_content, "lov")
+
+    order = [
+        "Anden paragraf.",
+        "Paragraf 2 a.",
+        "Andet stykke.",
+        "Tiende stykke.",
+        "Tiende kapitel.",
+    ]
+    assert [content.index(text) for text in order] == sorted(
+        content.index(text) for text in order
+    )
@@ -0,0 +1,92 @@
+import pytest
+from lawcite.core.parse_law import parse_law_paragraphs
+from lawcite.core.select_law import (
+    build_page_index,
+    parse_chapters,
+    parse_law_selection,
+    parse_paragraph_range,
+    select_pages,
+)
+
+
+class MockPage:
+    def __init__(self, text):
+        self.text = text
+        self.extracted = 0
+
+    def extract_text(self):
+        self.extracted += 1
+        return self.text
+
+
+class MockPdfReader:
+    def __init__(self, texts):
+        self.pages = [MockPage(text) for text in texts]
+        self.metadata = {"/Title": "Bekendtgørelse af straffeloven"}
+
+
+@pytest.fixture
+def law_pdf():
+    return MockPdfReader(
+        [
+            "Kapitel 1\nIndledning\n§ 1. Første bestemmelse.\nStk. 2. Andet stykke.\n",
+            "§ 2. Anden bestemmelse\nder fortsætter.\n",
+            "fortsat fra forrige side.\nKapitel 2\nStraf\n§ 3. Tredje bestemmelse.\n",
+            "§ 4. Fjerde bestemmelse.\nStk. 2. Fjerde andet stykke\n",
+            "der fortsætter.\nKapitel 3\nAfslutning\n§ 5. Femte bestemmelse.\n",
+        ]
+    )
+
+
+def test_parse_selection_arguments():
+    assert parse_chapters("27") == {"27"}
+    assert parse_chapters("3,5") == {"3", "5"}
+    assert parse_chapters("3-5") == {"3", "4", "5"}
+    assert parse_paragraph_range("245-250") == (245, 250)
+    assert parse_paragraph_range("§ 245–§ 250") == (245, 250)
+    assert parse_paragraph_range("9") == (9, 9)
+    with pytest.raises(ValueError):
+        parse_paragraph_range("abc")
+
+
+def test_build_page_index(law_pdf):
+    index = build_page_index(law_pdf)
+    assert len(index) == 5
+    assert index[0]["paragraphs"] == ["1", "1"]
+    assert index[2]["start"]["paragraph"] == "2"
+    assert index[2]["chapters"] == ["1", "2"]
+    assert index[2]["paragraphs"] == ["2", "3"]
+    assert select_pages(index, chapters={"2"}) == [2, 3, 4]
+    assert select_pages(index, paragraphs=(2, 2)) == [1, 2]
+
+
+def test_selection_matches_full_parse(law_pdf):
+    full = parse_law_paragraphs(law_pdf)
+
+    chapter_two = parse_law_selection(law_pdf, chapters={"2"})
+    assert chapter_two == {k: v for k, v in full.items() if k[0] == "2"}
+    assert chapter_two[("2", "4", "Stk. 2.")] == "Fjerde andet stykke der fortsætter."
+
+    para_two = parse_law_selection(law_pdf, paragraphs=(2, 2))
+    assert para_two == {("1", "2", "Stk. 1."): full[("1", "2", "Stk. 1.")]}
+    assert "fortsat fra forrige side." in para_two[("1", "2", "Stk. 1.")]
+
+
+def test_selection_uses_cached_index(law_pdf, monkeypatch, cache_dir):
+    monkeypatch.setattr(
+        "lawcite.core.select_law.pdf_digest", lambda pdf: "0" * 64
+    )
+    parse_law_selection(law_pdf, chapters={"3"})
+    assert list(cache_dir.glob("*.page_index.json"))
+
+    cached_pdf = MockPdfReader([page.text for page in law_pdf.pages])
+    result = parse_law_selection(cached_pdf, chapters={"3"})
+    assert result == {("3", "5", "Stk. 1."): "Femte bestemmelse."}
+    assert [page.extracted for page in cached_pdf.pages] == [0, 0, 0, 0, 1]
+
+
+def test_index_build_texts_are_reused(law_pdf):
+    result = parse_law_selection(law_pdf, chapters={"3"})
+    assert result == {("3", "5", "Stk. 1."): "Femte bestemmelse."}
+    # Building the index extracts every page once; the selection adds nothing
+    assert [page.extracted for page in law_pdf.pages] == [1] * len(law_pdf.pages)
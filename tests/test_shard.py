@@ -0,0 +1,88 @@
+import json
+import pytest
+import yaml
+from lawcite.core.save_bibtex import save_bibtex
+from lawcite.core.shard import parse_shard_spec, split_sections, write_shard_index
+
+SECTIONS = {
+    ("1", "1", "Stk. 1."): "Første.",
+    ("1", "1", "Stk. 2."): "Andet.",
+    ("2", "2", "Stk. 1."): "Tredje.",
+    ("3", "3", "Stk. 1."): "Fjerde.",
+    ("3", "4", "Stk. 1."): "Femte.",
+}
+
+
+def test_parse_shard_spec():
+    assert parse_shard_spec("chapter") == ("chapter", None)
+    assert parse_shard_spec("size=200") == ("size", 200)
+    for spec in ("size", "size=0", "size=x", "chapters", "chapter=2"):
+        with pytest.raises(ValueError):
+            parse_shard_spec(spec)
+
+
+def test_split_sections():
+    shards = split_sections(SECTIONS, "chapter")
+    assert [name for name, _ in shards] == ["chapter1", "chapter2", "chapter3"]
+    assert list(shards[2][1]) == [("3", "3", "Stk. 1."), ("3", "4", "Stk. 1.")]
+
+    shards = split_sections(SECTIONS, "size=2")
+    assert [(name, len(content)) for name, content in shards] == [
+        ("part001", 2),
+        ("part002", 2),
+        ("part003", 1),
+    ]
+
+    with pytest.raises(ValueError):
+        split_sections({"para1": "Tekst."}, "chapter")
+    assert len(split_sections({"para1": "Tekst."}, "size=5")) == 1
+
+
+def test_write_shard_index(tmp_path):
+    output = str(tmp_path / "lov.bib")
+    index_filename = write_shard_index(output, "lov", "lov", split_sections(SECTIONS, "chapter"))
+
+    with open(index_filename, encoding="utf-8") as f:
+        index = json.load(f)
+    assert index_filename == str(tmp_path / "lov.shards.json")
+    assert index["format"] == "bib"
+    assert index["shards"][0] == {
+        "file": "lov.chapter1.bib",
+        "entries": 2,
+        "first": "lovp1stk1",
+        "last": "lovp1stk2",
+        "chapter": "1",
+    }
+
+
+def test_save_sharded_yaml(tmp_path):
+    output = tmp_path / "lov.yaml"
+    save_bibtex(SECTIONS, "lov", "Ministeriet", "https://example.com", "2024-01-01", str(output), shard="chapter")
+
+    assert not output.exists()
+    with open(tmp_path / "lov.chapter3.yaml", encoding="utf-8") as f:
+        assert sorted(yaml.safe_load(f)) == ["lovp3stk1", "lovp4stk1"]
+    index = json.loads((tmp_path / "lov.shards.json").read_text(encoding="utf-8"))
+    assert [shard["file"] for shard in index["shards"]] == [
+        "lov.chapter1.yaml",
+        "lov.chapter2.yaml",
+        "lov.chapter3.yaml",
+    ]
+
+    with pytest.raises(ValueError):
+        save_bibtex(SECTIONS, "lov", "", "", "", str(tmp_path / "lov.md"), shard="chapter")
+
+
+def test_sharded_crossref_writes_parent_once(tmp_path):
+    output = tmp_path / "lov.bib"
+    save_bibtex(SECTIONS, "lov", "Ministeriet", "https://example.com", "2024-01-01", str(output), shard="chapter", crossref=True)
+
+    parent = (tmp_path / "lov.parent.bib").read_text(encoding="utf-8")
+    assert parent.count("@book{lov,") == 1 and "crossref" not in parent
+    for name in ("chapter1", "chapter2", "chapter3"):
+        text = (tmp_path / f"lov.{name}.bib").read_text(encoding="utf-8")
+        assert "@book" not in text
+        assert "crossref = {lov}" in text
+    index = json.loads((tmp_path / "lov.shards.json").read_text(encoding="utf-8"))
+    assert index["parent"] == "lov.parent.bib"
+    assert len(index["shards"]) == 3
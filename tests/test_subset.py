@@ -0,0 +1,88 @@
+import logging
+from lawcite.core.subset import find_cited_keys, subset_bibliography
+
+LAW_A = """@article{lovap1stk1,
+ title = {Første.}
+}
+
+@article{lovap1stk2,
+ title = {Anden.}
+}
+
+@article{lovap15astk1,
+ title = {Femtende a.}
+}
+"""
+
+LAW_B = """@article{vejledning_para1,
+ title = {Vejledning.}
+}
+
+@article{vejledning_para2,
+ title = {Mere vejledning.}
+}
+"""
+
+
+def test_find_cited_keys(tmp_path):
+    (tmp_path / "main.aux").write_text(
+        "\\relax\n\\citation{lovap1stk2,vejledning_para1}\n\\citation{lovap1stk2}\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "main.bcf").write_text(
+        '<bcf:citekey order="1">lovap15astk1</bcf:citekey>\n', encoding="utf-8"
+    )
+    (tmp_path / "chapter.tex").write_text(
+        "Se \\parencite[12]{lovap1stk1} og \\cite{smith2020}.\n", encoding="utf-8"
+    )
+    (tmp_path / "notes.typ").write_text(
+        "Jf. @vejledning_para2 og #cite(<lovap1stk1>).\n", encoding="utf-8"
+    )
+    (tmp_path / "ignored.bib").write_text("@article{lovap9stk9,\n}\n", encoding="utf-8")
+
+    assert find_cited_keys([str(tmp_path / "main.aux")]) == ["lovap1stk2", "vejledning_para1"]
+    assert sorted(find_cited_keys([str(tmp_path)])) == [
+        "lovap15astk1",
+        "lovap1stk1",
+        "lovap1stk2",
+        "vejledning_para1",
+        "vejledning_para2",
+    ]
+
+
+def test_subset_bibliography(tmp_path):
+    bib_dir = tmp_path / "bib"
+    bib_dir.mkdir()
+    (bib_dir / "lova.bib").write_text(LAW_A, encoding="utf-8")
+    (bib_dir / "vejledning.bib").write_text(LAW_B, encoding="utf-8")
+    output = tmp_path / "refs.bib"
+
+    written, missing = subset_bibliography(
+        ["vejledning_para2", "lovap15astk1", "lovap9stk9"], [str(bib_dir)], str(output)
+    )
+
+    assert written == ["vejledning_para2", "lovap15astk1"]
+    assert missing == ["lovap9stk9"]
+    assert output.read_text(encoding="utf-8") == (
+        "@article{vejledning_para2,\n title = {Mere vejledning.}\n}\n\n"
+        "@article{lovap15astk1,\n title = {Femtende a.}\n}\n\n"
+    )
+
+
+def test_subset_skips_unindexable_bib_files(tmp_path, caplog):
+    bib_dir = tmp_path / "bib"
+    bib_dir.mkdir()
+    (bib_dir / "lova.bib").write_text(LAW_A, encoding="utf-8")
+    (bib_dir / "thesis.bib").write_text(
+        "@book{smith,\n title = {A}\n}\n\n@book{smith,\n title = {B}\n}\n", encoding="utf-8"
+    )
+    output = tmp_path / "refs.bib"
+
+    with caplog.at_level(logging.WARNING, logger="lawcite.core.subset"):
+        written, missing = subset_bibliography(["lovap15astk1"], [str(bib_dir)], str(output))
+
+    assert written == ["lovap15astk1"]
+    assert missing == []
+    assert [r.getMessage().split(":")[0] for r in caplog.records] == [
+        f"Skipping {bib_dir / 'thesis.bib'}"
+    ]
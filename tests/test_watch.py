@@ -0,0 +1,125 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from lawcite.core.watch import load_manifest, load_status, poll_once, watch
+
+
+class PdfHandler(BaseHTTPRequestHandler):
+    """Serve a mutable PDF body with ETag-based conditional GET support."""
+
+    documents = {}
+    requests_seen = []
+
+    def do_GET(self):
+        body = self.documents[self.path]
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        self.requests_seen.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server(make_pdf):
+    PdfHandler.documents = {"/a": make_pdf(["§ 1. A.\n"]), "/b": make_pdf(["§ 1. B.\n"])}
+    PdfHandler.requests_seen = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), PdfHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+@pytest.fixture
+def manifest(tmp_path, server):
+    path = tmp_path / "laws.yml"
+    path.write_text(
+        "laws:\n"
+        f"  - name: a\n    url: {server}/a\n"
+        f"  - name: b\n    url: {server}/b\n    kind: other\n    file: out/b.yaml\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_load_manifest(manifest, tmp_path):
+    entries = load_manifest(str(manifest))
+    assert entries[0]["kind"] == "law"
+    assert entries[0]["file"] == str(tmp_path / "a.bib")
+    assert entries[1]["kind"] == "other"
+    assert entries[1]["file"] == str(tmp_path / "out" / "b.yaml")
+
+
+def test_poll_only_regenerates_changed(manifest, make_pdf):
+    entries = load_manifest(str(manifest))
+    status = {}
+    regenerated = []
+
+    def on_change(entry, content):
+        regenerated.append((entry["name"], content))
+
+    assert poll_once(entries, status, on_change) == ["a", "b"]
+    assert poll_once(entries, status, on_change) == []
+    assert PdfHandler.requests_seen[-1][1] is not None  # conditional GET sent
+
+    PdfHandler.documents["/b"] = make_pdf(["§ 1. B ændret.\n"])
+    assert poll_once(entries, status, on_change) == ["b"]
+    assert regenerated[-1] == ("b", PdfHandler.documents["/b"])
+    assert status["b"]["last_changed"] == status["b"]["last_checked"]
+    assert "last_changed" in status["a"]
+
+
+def test_republished_pdf_with_same_text_is_not_changed(manifest, make_pdf):
+    entries = load_manifest(str(manifest))[:1]
+    status = {}
+    assert poll_once(entries, status, lambda entry, content: None) == ["a"]
+    hash_before = status["a"]["hash"]
+
+    # New creation date and layout, same text
+    PdfHandler.documents["/a"] = make_pdf(
+        ["§ 1. A.\n"], creation_date="D:20250101000000", transform="1 0 0 1 10 -20"
+    )
+    assert poll_once(entries, status, lambda entry, content: None) == []
+    assert status["a"]["hash"] != hash_before
+    assert "last_changed" in status["a"]
+
+
+def test_failed_regeneration_is_retried(manifest):
+    entries = load_manifest(str(manifest))[:1]
+    status = {}
+
+    def failing(entry, content):
+        raise ValueError("No paragraphs extracted from the PDF")
+
+    assert poll_once(entries, status, failing) == []
+    assert status["a"]["error"] == "No paragraphs extracted from the PDF"
+    assert poll_once(entries, status, lambda entry, content: None) == ["a"]
+    assert "error" not in status["a"]
+
+
+def test_watch_writes_status(manifest, tmp_path):
+    status_path = tmp_path / "status.json"
+    sleeps = []
+    watch(
+        str(manifest),
+        str(status_path),
+        lambda entry, content: None,
+        interval=5,
+        iterations=2,
+        sleep=sleeps.append,
+    )
+    status = load_status(str(status_path))
+    assert set(status) == {"a", "b"}
+    assert status["a"]["last_checked"]
+    assert sleeps == [5]